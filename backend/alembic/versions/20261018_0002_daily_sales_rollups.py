@@ -0,0 +1,45 @@
+"""Daily sales rollups and orders.created_at index
+
+Revision ID: 20261018_0002
+Revises: 20251228_0001
+Create Date: 2026-10-18
+
+Backfill existing orders afterwards with ``python -m app.utils.rebuild_rollups``.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0002"
+down_revision = "20251228_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_orders_created_at"), "orders", ["created_at"], unique=False)
+
+    op.create_table(
+        "daily_sales",
+        sa.Column("sales_date", sa.Date(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_amount", sa.Numeric(precision=14, scale=2), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("sales_date"),
+    )
+
+    op.create_table(
+        "daily_product_sales",
+        sa.Column("sales_date", sa.Date(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_amount", sa.Numeric(precision=14, scale=2), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("sales_date", "product_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_product_sales")
+    op.drop_table("daily_sales")
+    op.drop_index(op.f("ix_orders_created_at"), table_name="orders")
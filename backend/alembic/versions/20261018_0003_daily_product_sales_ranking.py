@@ -0,0 +1,28 @@
+"""Ranking index on daily_product_sales
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_daily_product_sales_ranking",
+        "daily_product_sales",
+        ["sales_date", sa.text("quantity DESC"), "product_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_product_sales_ranking", table_name="daily_product_sales")
@@ -0,0 +1,25 @@
+"""Composite (created_at, id) index for keyset pagination of orders
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_orders_created_at_id", "orders", ["created_at", "id"], unique=False)
+    # the composite index serves every query the single-column one did
+    op.drop_index(op.f("ix_orders_created_at"), table_name="orders")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_orders_created_at"), "orders", ["created_at"], unique=False)
+    op.drop_index("ix_orders_created_at_id", table_name="orders")
@@ -0,0 +1,39 @@
+"""Catalog change versions for ETags and delta sync
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("categories", "products", "inventory")
+
+
+def upgrade() -> None:
+    catalog_version = op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(catalog_version, [{"id": 1, "version": 0}])
+
+    for table in VERSIONED_TABLES:
+        op.add_column(table, sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"))
+        op.create_index(op.f(f"ix_{table}_version"), table, ["version"], unique=False)
+
+
+def downgrade() -> None:
+    for table in reversed(VERSIONED_TABLES):
+        op.drop_index(op.f(f"ix_{table}_version"), table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
+    op.drop_table("catalog_version")
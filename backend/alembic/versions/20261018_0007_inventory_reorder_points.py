@@ -0,0 +1,32 @@
+"""Inventory reorder points and a partial index of the products below theirs
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("inventory", sa.Column("reorder_point", sa.Integer(), server_default="0", nullable=False))
+    op.create_index(
+        "ix_inventory_low_stock",
+        "inventory",
+        [sa.text("(reorder_point - quantity)"), "product_id"],
+        unique=False,
+        postgresql_where=sa.text("quantity < reorder_point"),
+        sqlite_where=sa.text("quantity < reorder_point"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_low_stock", table_name="inventory")
+    op.drop_column("inventory", "reorder_point")
@@ -0,0 +1,42 @@
+"""Let sales mark stock rows pending (version NULL) instead of taking a catalog version
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+
+def _set_nullable(nullable: bool) -> None:
+    # SQLite rebuilds the table and its batch mode cannot carry expression indexes across
+    op.drop_index("ix_inventory_low_stock", table_name="inventory")
+    with op.batch_alter_table("inventory") as batch_op:
+        batch_op.alter_column("version", existing_type=sa.BigInteger(), nullable=nullable, existing_server_default="0")
+    op.create_index(
+        "ix_inventory_low_stock",
+        "inventory",
+        [sa.text("(reorder_point - quantity)"), "product_id"],
+        unique=False,
+        postgresql_where=sa.text("quantity < reorder_point"),
+        sqlite_where=sa.text("quantity < reorder_point"),
+    )
+
+
+def upgrade() -> None:
+    _set_nullable(True)
+
+
+def downgrade() -> None:
+    # pending rows count as changed in the latest version
+    op.execute(
+        "UPDATE inventory SET version = (SELECT version FROM catalog_version WHERE id = 1) WHERE version IS NULL"
+    )
+    _set_nullable(False)
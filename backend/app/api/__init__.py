@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api import health, auth, categories, products, inventory, orders, reports
+from app.api import health, auth, categories, products, inventory, orders, reports, catalog, admin, metrics, events
 
 api_router = APIRouter()
 api_router.include_router(health.router)
@@ -12,3 +12,7 @@ api_router.include_router(products.router)
 api_router.include_router(inventory.router)
 api_router.include_router(orders.router)
 api_router.include_router(reports.router)
+api_router.include_router(catalog.router)
+api_router.include_router(admin.router)
+api_router.include_router(metrics.router)
+api_router.include_router(events.router)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.core import deps
+from app.db import session
+from app.db.pool import pool_stats
+from app.schemas.pool import PoolStats
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+admin_required = deps.require_role({"admin"})
+
+
+@router.get("/db/pool", response_model=list[PoolStats], dependencies=[Depends(admin_required)])
+async def db_pool_stats():
+    """Live pool usage plus checkout waits and churn since the worker started (per process)."""
+    return pool_stats(session.pooled_engines)
@@ -1,25 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
 
 from app.core import deps
-from app.core.security import create_access_token
+from app.core.security import create_access_token, verify_password_async
 from app.schemas.auth import LoginRequest, LoginResponse
 from app.schemas.user import UserRead
+from app.services.async_service import AsyncService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(payload: LoginRequest, db: Session = Depends(deps.get_db_session)):
-    service = UserService(db)
-    user = service.authenticate(payload.email, payload.password)
+async def login(payload: LoginRequest, db: deps.DbSession = Depends(deps.get_db_session)):
+    users = AsyncService(UserService, db)
+    user = await users.get_user_by_email(payload.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    # bcrypt is deliberately slow CPU work; it runs in the password hash process pool
+    verified, new_hash = await verify_password_async(payload.password, user.password_hash)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        await users.update_password_hash(user.id, user.password_hash, new_hash)
     token, expires_at = create_access_token(str(user.id))
-    return {"access_token": token, "token_type": "bearer", "expires_at": expires_at, "user": UserRead.model_validate(user)}
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_at": expires_at,
+        "user": UserRead.model_validate(user),
+    }
 
 
 @router.get("/me", response_model=UserRead)
-def me(current_user=Depends(deps.get_current_user)):
+async def me(current_user=Depends(deps.get_current_user)):
     return current_user
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core import deps
+from app.schemas.catalog import CatalogChanges
+from app.services.async_service import AsyncService
+from app.services.catalog_service import CatalogService
+
+router = APIRouter(prefix="/api/catalog", tags=["catalog"])
+viewer_required = deps.require_role({"admin", "cashier"})
+
+
+@router.get("/changes", response_model=CatalogChanges, dependencies=[Depends(viewer_required)])
+async def catalog_changes(since: int = Query(default=0, ge=0), db: deps.DbSession = Depends(deps.get_db_session)):
+    return await AsyncService(CatalogService, db).changes(since)
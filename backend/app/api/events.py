@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.core import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.schemas.auth import EventStreamToken
+from app.services.event_bus import stream_events
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+cashier_or_admin = deps.require_role({"cashier", "admin"})
+stream_cashier_or_admin = deps.require_role({"cashier", "admin"}, deps.get_event_stream_user)
+
+
+@router.get("", dependencies=[Depends(stream_cashier_or_admin)], response_class=StreamingResponse)
+async def events():
+    """Server-sent events: ``order.created`` for each new order and ``stock.changed`` with the new
+    quantities, as they are committed in this worker. A client that falls too far behind is
+    disconnected and should refetch what it shows when it reconnects.
+
+    Authenticated by a bearer token, or by ``?token=`` from ``POST /api/events/token`` for
+    browsers' EventSource."""
+    return StreamingResponse(
+        stream_events(settings.event_keepalive_seconds),
+        media_type="text/event-stream",
+        # no caching, and no buffering by nginx-style proxies
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/token", response_model=EventStreamToken)
+async def event_stream_token(user=Depends(cashier_or_admin)):
+    """A short-lived token that opens the event stream as ``?token=`` and nothing else, so the
+    access token itself never goes into a URL (and from there into access logs)."""
+    token, expires_at = create_access_token(
+        str(user.id),
+        {"scope": deps.EVENTS_SCOPE},
+        expires_delta=timedelta(seconds=settings.event_token_expires_seconds),
+    )
+    return {"token": token, "expires_at": expires_at}
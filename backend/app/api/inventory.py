@@ -1,21 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.core import deps
-from app.schemas.inventory import InventoryRead, InventoryUpdate
+from app.schemas.inventory import InventoryAdjustmentBatch, InventoryRead, InventoryUpdate, LowStockItem
+from app.services.async_service import AsyncService
 from app.services.inventory_service import InventoryService
+from app.utils.pagination import decode_int_cursor, encode_int_cursor
 
 router = APIRouter(prefix="/api/inventory", tags=["inventory"])
 admin_required = deps.require_role({"admin"})
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("", response_model=list[InventoryRead], dependencies=[Depends(admin_required)])
-def list_inventory(db: Session = Depends(deps.get_db_session)):
-    return InventoryService(db).list()
+async def list_inventory(db: deps.DbSession = Depends(deps.get_db_session)):
+    # projected rows: InventoryRead needs no more than these columns
+    return await AsyncService(InventoryService, db).list_levels()
+
+
+@router.get("/low-stock", response_model=list[LowStockItem], dependencies=[Depends(admin_required)])
+async def list_low_stock(
+    response: Response,
+    db: deps.DbSession = Depends(deps.get_db_session),
+    sort: Literal["-shortfall", "shortfall"] = Query(default="-shortfall"),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+):
+    """Products below their reorder point with the shortfall to restock, largest first by default.
+
+    Pages are keyset-paginated: pass the ``X-Next-Cursor`` of a page as ``cursor`` for the next one.
+    """
+    try:
+        position = decode_int_cursor(cursor, 2) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+    # fetch one extra row to learn whether another page exists
+    rows = await AsyncService(InventoryService, db).list_low_stock(
+        limit=limit + 1, cursor=position, descending=sort == "-shortfall"
+    )
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_int_cursor(rows[-1].shortfall, rows[-1].product_id)
+    return rows
 
 
 @router.patch("/{product_id}", response_model=InventoryRead, dependencies=[Depends(admin_required)])
-def update_inventory(product_id: int, payload: InventoryUpdate, db: Session = Depends(deps.get_db_session)):
+async def update_inventory(
+    product_id: int, payload: InventoryUpdate, db: deps.DbSession = Depends(deps.get_db_session)
+):
     if payload.quantity < 0:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Quantity must be non-negative")
-    return InventoryService(db).upsert_quantity(product_id, payload)
+    if payload.reorder_point is not None and payload.reorder_point < 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Reorder point must be non-negative"
+        )
+    return await AsyncService(InventoryService, db).upsert_quantity(product_id, payload)
+
+
+@router.post("/adjustments", response_model=list[InventoryRead], dependencies=[Depends(admin_required)])
+async def adjust_inventory(payload: InventoryAdjustmentBatch, db: deps.DbSession = Depends(deps.get_db_session)):
+    """Apply signed stock deltas to many products at once; nothing is applied if any would go negative."""
+    deltas = defaultdict(int)
+    # several lines for the same product add up
+    for item in payload.items:
+        deltas[item.product_id] += item.delta
+    return await AsyncService(InventoryService, db).adjust(dict(deltas))
@@ -1,46 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from datetime import datetime
+from typing import Literal
+
 from fastapi import Query
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.core import deps
-from app.schemas.order import OrderCreate, OrderRead
+from app.core.config import settings
+from app.core.responses import fast_json_response
+from app.schemas.order import OrderBatchCreate, OrderBatchResponse, OrderCreate, OrderRead
+from app.services.async_service import AsyncService
+from app.services.idempotency_service import request_hash, run_once
+from app.services.order_export import EXPORT_MEDIA_TYPES, accepts_gzip, stream_orders
 from app.services.order_service import OrderService
+from app.utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 cashier_or_admin = deps.require_role({"cashier", "admin"})
 admin_required = deps.require_role({"admin"})
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
 
 @router.post("", response_model=OrderRead, status_code=status.HTTP_201_CREATED)
-def create_order(payload: OrderCreate, current_user=Depends(cashier_or_admin), db: Session = Depends(deps.get_db_session)):
-    order = OrderService(db).create_order(created_by=current_user.id, payload=payload)
-    return order
+async def create_order(
+    payload: OrderCreate,
+    current_user=Depends(cashier_or_admin),
+    db: deps.DbSession = Depends(deps.get_db_session),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+):
+    """With an ``Idempotency-Key`` header, a retry of the same request gets the stored response
+    (marked ``Idempotent-Replayed: true``) instead of creating a second order."""
+    orders = AsyncService(OrderService, db)
+    if idempotency_key is None:
+        return await orders.create_order(created_by=current_user.id, payload=payload)
+    status_code, body, replayed = await run_once(
+        db,
+        current_user.id,
+        idempotency_key,
+        request_hash(payload.model_dump_json()),
+        lambda claimed_at: orders.create_order_once(current_user.id, payload, idempotency_key, claimed_at),
+        success_status=status.HTTP_201_CREATED,
+    )
+    return JSONResponse(body, status_code=status_code, headers={REPLAYED_HEADER: "true"} if replayed else None)
+
+
+@router.post("/batch", response_model=OrderBatchResponse)
+async def create_orders_batch(
+    payload: OrderBatchCreate, current_user=Depends(cashier_or_admin), db: deps.DbSession = Depends(deps.get_db_session)
+):
+    results = await AsyncService(OrderService, db).create_orders_batch(
+        created_by=current_user.id, orders=payload.orders
+    )
+    created = sum(1 for result in results if result["status_code"] == status.HTTP_201_CREATED)
+    return {"created": created, "rejected": len(results) - created, "results": results}
+
+
+@router.get("/export", dependencies=[Depends(admin_required)], response_class=StreamingResponse)
+async def export_orders(
+    request: Request,
+    db: deps.DbSession = Depends(deps.get_db_session),
+    from_date: datetime | None = Query(default=None, alias="from"),
+    to_date: datetime | None = Query(default=None, alias="to"),
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+):
+    """Orders created in ``[from, to)`` with their items, oldest first, streamed in constant memory.
+
+    Compressed with gzip on the fly when the client's ``Accept-Encoding`` allows it.
+    """
+    gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"Content-Disposition": f'attachment; filename="orders.{format}"', "Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_orders(db, format, from_date=from_date, to_date=to_date, gzip=gzip),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
 
 
 @router.get("/{order_id}", response_model=OrderRead)
-def get_order(order_id: int, current_user=Depends(cashier_or_admin), db: Session = Depends(deps.get_db_session)):
-    order = OrderService(db).get(order_id)
+async def get_order(
+    order_id: int, current_user=Depends(cashier_or_admin), db: deps.DbSession = Depends(deps.get_db_session)
+):
+    order = await AsyncService(OrderService, db).get(order_id)
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return order
 
 
 @router.get("", response_model=list[OrderRead])
-def list_orders(
+async def list_orders(
+    response: Response,
     current_user=Depends(cashier_or_admin),
-    db: Session = Depends(deps.get_db_session),
+    db: deps.DbSession = Depends(deps.get_db_session),
     from_date: datetime | None = Query(default=None),
     to_date: datetime | None = Query(default=None),
-    limit: int = Query(default=20, le=100),
+    limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
 ):
-    return OrderService(db).list(from_date=from_date, to_date=to_date, limit=limit, offset=offset)
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
+    fast = settings.fast_list_responses
+    orders_service = AsyncService(OrderService, db)
+    fetch = orders_service.list_rows if fast else orders_service.list
+    # fetch one extra row to learn whether another page exists
+    orders = await fetch(from_date=from_date, to_date=to_date, limit=limit + 1, offset=offset, cursor=position)
+    if len(orders) > limit:
+        orders = orders[:limit]
+        last = orders[-1]
+        position = (last["created_at"], last["id"]) if fast else (last.created_at, last.id)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*position)
+    if fast:
+        return fast_json_response(orders, response)
+    return orders
 
 
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admin_required)])
-def delete_order(order_id: int, db: Session = Depends(deps.get_db_session)):
-    ok = OrderService(db).delete(order_id)
+async def delete_order(order_id: int, db: deps.DbSession = Depends(deps.get_db_session)):
+    ok = await AsyncService(OrderService, db).delete(order_id)
     if not ok:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return None
@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 
 from app.core import deps
-from app.schemas.product import ProductCreate, ProductRead, ProductUpdate
+from app.core.config import settings
+from app.core.responses import fast_json_response
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportResult,
+    ProductRead,
+    ProductSearchPage,
+    ProductSummaryRead,
+    ProductUpdate,
+)
+from app.services.async_service import AsyncService
+from app.services.product_import import ProductImportService
 from app.services.product_service import ProductService
 
 router = APIRouter(prefix="/api/products", tags=["products"])
@@ -10,39 +22,93 @@ admin_required = deps.require_role({"admin"})
 viewer_required = deps.require_role({"admin", "cashier"})
 
 
-@router.get("", response_model=list[ProductRead], dependencies=[Depends(viewer_required)])
-def list_products(
+@router.get(
+    "",
+    response_model=list[ProductRead],
+    dependencies=[Depends(viewer_required), Depends(deps.catalog_etag)],
+)
+async def list_products(
+    response: Response,
     query: str | None = Query(default=None),
     category_id: int | None = Query(default=None),
-    db: Session = Depends(deps.get_db_session),
+    db: deps.DbSession = Depends(deps.get_db_session),
+):
+    products = AsyncService(ProductService, db)
+    if settings.fast_list_responses:
+        return fast_json_response(await products.list_rows(query=query, category_id=category_id), response)
+    return await products.list(query=query, category_id=category_id)
+
+
+@router.get(
+    "/summary",
+    response_model=list[ProductSummaryRead],
+    dependencies=[Depends(viewer_required), Depends(deps.catalog_etag)],
+)
+async def list_product_summaries(
+    query: str | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    db: deps.DbSession = Depends(deps.get_db_session),
+):
+    """The active catalog as id, sku, name and price only: what a till loads, at a fraction of the cost."""
+    return await AsyncService(ProductService, db).list_summaries(query=query, category_id=category_id)
+
+
+@router.get("/search", response_model=ProductSearchPage, dependencies=[Depends(viewer_required)])
+async def search_products(
+    q: str = Query(min_length=1, max_length=100),
+    category_id: int | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=10000),
+    db: deps.DbSession = Depends(deps.get_db_session),
 ):
-    return ProductService(db).list(query=query, category_id=category_id)
+    products = AsyncService(ProductService, db)
+    total, items = await products.search(q, category_id=category_id, limit=limit, offset=offset)
+    return {"total": total, "items": items}
 
 
 @router.get("/{product_id}", response_model=ProductRead, dependencies=[Depends(viewer_required)])
-def get_product(product_id: int, db: Session = Depends(deps.get_db_session)):
-    product = ProductService(db).get(product_id)
+async def get_product(product_id: int, db: deps.DbSession = Depends(deps.get_db_session)):
+    product = await AsyncService(ProductService, db).get(product_id)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
 
 
 @router.post("", response_model=ProductRead, dependencies=[Depends(admin_required)])
-def create_product(payload: ProductCreate, db: Session = Depends(deps.get_db_session)):
-    return ProductService(db).create(payload)
+async def create_product(payload: ProductCreate, db: deps.DbSession = Depends(deps.get_db_session)):
+    return await AsyncService(ProductService, db).create(payload)
+
+
+@router.post("/import", response_model=ProductImportResult, dependencies=[Depends(admin_required)])
+async def import_products(
+    file: UploadFile = File(...),
+    create_categories: bool = Query(default=False),
+    db: deps.DbSession = Depends(deps.get_db_session),
+):
+    """Upsert products and stock by SKU from a CSV upload (sku,name,category,price[,quantity][,is_active])."""
+    # the upload is spooled to a temporary file; rows are decoded and parsed as they are read,
+    # in the threadpool, as reading and parsing a large file takes seconds
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        imports = AsyncService(ProductImportService, db, blocking=True)
+        return await imports.import_csv(lines, create_categories=create_categories)
+    finally:
+        lines.detach()
 
 
 @router.patch("/{product_id}", response_model=ProductRead, dependencies=[Depends(admin_required)])
-def update_product(product_id: int, payload: ProductUpdate, db: Session = Depends(deps.get_db_session)):
-    product = ProductService(db).update(product_id, payload)
+async def update_product(
+    product_id: int, payload: ProductUpdate, db: deps.DbSession = Depends(deps.get_db_session)
+):
+    product = await AsyncService(ProductService, db).update(product_id, payload)
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return product
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admin_required)])
-def delete_product(product_id: int, db: Session = Depends(deps.get_db_session)):
-    ok = ProductService(db).soft_delete(product_id)
+async def delete_product(product_id: int, db: deps.DbSession = Depends(deps.get_db_session)):
+    ok = await AsyncService(ProductService, db).soft_delete(product_id)
     if not ok:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     return None
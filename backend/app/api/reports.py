@@ -1,20 +1,47 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core import deps
-from app.schemas.report import DailyReport
-from app.services.report_service import ReportService
+from app.schemas.report import BucketUnit, DailyReport, RangeReport, TopSellersReport, TopSellersWindow
+from app.services.async_service import AsyncService
+from app.services.report_service import MAX_HOURLY_RANGE_DAYS, TOP_PRODUCTS_LIMIT, ReportService
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 admin_required = deps.require_role({"admin"})
 
 
 @router.get("/daily", response_model=DailyReport, dependencies=[Depends(admin_required)])
-def daily_report(
+async def daily_report(
     report_date: date | None = Query(default=None, alias="date"),
-    db: Session = Depends(deps.get_db_session),
+    db: deps.DbSession = Depends(deps.get_db_session),
 ):
     target_date = report_date or date.today()
-    return ReportService(db).daily(target_date)
+    return await AsyncService(ReportService, db).daily(target_date)
+
+
+@router.get("/range", response_model=RangeReport, dependencies=[Depends(admin_required)])
+async def range_report(
+    from_date: date = Query(alias="from"),
+    to_date: date = Query(alias="to"),
+    bucket: BucketUnit = Query(default="day"),
+    db: deps.DbSession = Depends(deps.get_db_session),
+):
+    if to_date < from_date:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="'to' must not be before 'from'")
+    if bucket == "hour" and (to_date - from_date).days >= MAX_HOURLY_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Hourly buckets are limited to {MAX_HOURLY_RANGE_DAYS} days",
+        )
+    return await AsyncService(ReportService, db).range_report(from_date, to_date, bucket)
+
+
+@router.get("/top-sellers", response_model=TopSellersReport, dependencies=[Depends(admin_required)])
+async def top_sellers(
+    window: TopSellersWindow = Query(default="1h"),
+    limit: int = Query(default=TOP_PRODUCTS_LIMIT, ge=1, le=50),
+    db: deps.DbSession = Depends(deps.get_db_session),
+):
+    """Rolling leaderboard by quantity sold: ``15m``, ``1h`` or ``1d`` back from now."""
+    return await AsyncService(ReportService, db).top_sellers(window, limit)
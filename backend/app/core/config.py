@@ -1,3 +1,4 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -6,10 +7,70 @@ class Settings(BaseSettings):
     debug: bool = True
 
     database_url: str = "postgresql+psycopg2://codex:codex@db:5432/codex_pos"
+    # request handlers use an AsyncSession (asyncpg/aiosqlite); false runs them on a sync
+    # Session in the threadpool instead
+    db_async: bool = True
+    # defaults to database_url with its driver swapped for the asyncio one
+    async_database_url: str | None = None
+
+    # per-engine connection pool, per worker process; size/overflow/timeout only apply to
+    # queue pools (not SQLite in-memory or aiosqlite). recycle -1 keeps connections forever.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    # test connections on checkout so a Postgres failover costs a reconnect, not an error
+    db_pool_pre_ping: bool = True
+    # read replicas (a JSON list of URLs, each with its async driver derived like the primary's)
+    # for read-only service methods: reports and order lists. A replica that fails is skipped
+    # until a health check, run this often, finds it answering again.
+    database_replica_urls: list[str] = []
+    db_replica_health_check_seconds: float = 10.0
     jwt_secret: str = "change-me"
     jwt_expires_minutes: int = 60
     jwt_algorithm: str = "HS256"
 
+    # bcrypt cost for new hashes; existing hashes of another cost are rehashed at the next login
+    bcrypt_rounds: int = 12
+    # processes (per worker) that run bcrypt for logins, so hashing neither holds threadpool
+    # slots nor the GIL; unset uses one per CPU, 0 hashes in the threadpool instead
+    password_hash_workers: int | None = None
+
+    # per-process cache of verified tokens and active users; 0 entries disables it
+    auth_cache_max_entries: int = 10000
+    auth_cache_ttl_seconds: float = 30.0
+
+    # POST /api/orders with an Idempotency-Key: how long the response is replayed for
+    # retries, how long a request in progress holds its key (after a crash, say), and how
+    # long a concurrent duplicate waits for the first one to finish
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_lock_seconds: float = 30.0
+    idempotency_wait_seconds: float = 10.0
+
+    # GET /api/orders and GET /api/products select plain columns and encode dicts with orjson
+    # instead of validating ORM objects through the response model; the JSON is the same
+    fast_list_responses: bool = False
+
+    # build the in-memory product search index when the app starts instead of on first search
+    search_index_warm_on_startup: bool = True
+    # same for the rolling top-sellers leaderboard; capacity is the most products each window
+    # and each time slice counts exactly before the least-sold ones start being replaced
+    top_sellers_warm_on_startup: bool = True
+    top_sellers_capacity: int = 10000
+
+    # GET /api/events: order and stock events a subscriber may fall behind by before it is
+    # dropped, and the seconds of silence after which a keepalive comment is sent
+    event_queue_size: int = 256
+    event_keepalive_seconds: float = 15.0
+    # lifetime of the tokens POST /api/events/token hands out for opening the stream
+    event_token_expires_seconds: int = 60
+
+    @field_validator("password_hash_workers", mode="before")
+    @classmethod
+    def _empty_is_unset(cls, value):
+        # PASSWORD_HASH_WORKERS= (as in .env.example) means one per CPU, like leaving it out
+        return None if value == "" else value
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,38 +1,159 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+import anyio
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import decode_token
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models.user import User
+from app.schemas.user import UserRead
+from app.services.async_service import RELEASE_AFTER_CALL, AsyncService
+from app.services.catalog_service import CatalogService
 from app.services.user_service import UserService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# ``scope`` claim of the short-lived tokens that only open the event stream
+EVENTS_SCOPE = "events"
+
+# AsyncSession unless settings.db_async is off; hand it to services through AsyncService
+DbSession = AsyncSession | Session
+
+# token -> user id, and user id -> UserRead snapshot of an active user. Entries live at
+# most auth_cache_ttl_seconds, which also bounds staleness across worker processes.
+token_cache = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+user_cache = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+
+
+def configure_auth_cache(max_entries: int, ttl_seconds: float) -> None:
+    global token_cache, user_cache
+    token_cache = TTLCache(max_entries, ttl_seconds)
+    user_cache = TTLCache(max_entries, ttl_seconds)
+
 
+def clear_auth_cache() -> None:
+    token_cache.clear()
+    user_cache.clear()
 
-def get_db_session() -> Session:
-    yield from get_db()
 
+def auth_cache_stats() -> dict:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db_session)
-):
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
+    # drop it again once the change is visible, in case a request re-cached the old row meanwhile
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+async def get_db_session() -> DbSession:
+    if settings.db_async:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    # results are serialised after the session has been closed, like on the async path
+    db = SessionLocal(expire_on_commit=False)
+    db.info[RELEASE_AFTER_CALL] = True
+    try:
+        yield db
+    finally:
+        # normally a no-op, as every service call already released the connection, so it
+        # holds none while it waits for a thread of the shared threadpool
+        await anyio.to_thread.run_sync(db.close)
+
+
+def _token_payload(token: str, scope: str | None) -> dict:
     try:
         payload = decode_token(token)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub") or payload.get("scope") != scope:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = UserService(db).get_user_by_id(int(user_id))
-    if not user or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
+    return payload
+
+
+def _user_id_from_token(token: str) -> int:
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    # scoped tokens only open their own route; they are never cached here
+    payload = _token_payload(token, scope=None)
+    user_id = int(payload["sub"])
+    # never serve a token from cache past its own expiry
+    token_cache.set(token, user_id, ttl=payload["exp"] - time.time() if "exp" in payload else None)
+    return user_id
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: DbSession = Depends(get_db_session)
+) -> UserRead:
+    return await _active_user(_user_id_from_token(token), db)
+
+
+async def get_event_stream_user(
+    token: str | None = Query(default=None, description="token from POST /api/events/token"),
+    bearer: str | None = Depends(optional_oauth2_scheme),
+    db: DbSession = Depends(get_db_session),
+) -> UserRead:
+    """The user of a bearer token, or of an events-scoped ``?token=``: browsers' EventSource
+    cannot send an Authorization header."""
+    if token is not None:
+        return await _active_user(int(_token_payload(token, scope=EVENTS_SCOPE)["sub"]), db)
+    if bearer is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_user(bearer, db)
+
+
+async def _active_user(user_id: int, db: DbSession) -> UserRead:
+    user = user_cache.get(user_id)
+    if user is None:
+        record = await AsyncService(UserService, db).get_user_by_id(user_id)
+        if not record or not record.is_active:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
+        user = UserRead.model_validate(record)
+        user_cache.set(user_id, user)
     return user
 
 
-def require_role(required_roles: set[str]):
-    def role_checker(user=Depends(get_current_user)):
+def require_role(required_roles: set[str], current_user=get_current_user):
+    async def role_checker(user=Depends(current_user)):
         if user.role not in required_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return user
 
     return role_checker
+
+
+async def catalog_etag(
+    request: Request, response: Response, db: DbSession = Depends(get_db_session)
+) -> int:
+    """Tag catalog reads with the version of their newest product or category change and
+    answer 304 when the client is current; sales only change stock, so they keep the tag."""
+    version = await AsyncService(CatalogService, db).listing_version()
+    etag = f'W/"catalog-{version}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")}:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return version
@@ -0,0 +1,158 @@
+"""Per-route request metrics in Prometheus text format.
+
+``MetricsMiddleware`` is a plain ASGI middleware: Starlette's ``BaseHTTPMiddleware``
+costs more per request than this whole module is allowed to. Each request gets a
+``RequestCost`` in a context variable; the SQLAlchemy cursor hooks add to it from
+whichever thread or greenlet runs the query, since both inherit the request's context.
+
+Metrics are per worker process, and routes are labelled by their path template
+(``/api/orders/{order_id}``) so label cardinality stays bounded.
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# seconds, as in the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestCost:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "queries", "db_seconds", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statuses: Dict[int, int] = defaultdict(int)
+
+
+request_cost: ContextVar[RequestCost | None] = ContextVar("request_cost", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+
+    def clear(self) -> None:
+        self.routes = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, cost: RequestCost) -> None:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.count += 1
+        stats.seconds += seconds
+        stats.queries += cost.queries
+        stats.db_seconds += cost.db_seconds
+        stats.statuses[status] += 1
+
+    def render(self) -> str:
+        lines: List[str] = [
+            "# HELP http_request_duration_seconds Request latency by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        routes = sorted(self.routes.items())
+        for (method, route), stats in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+        lines += ["# HELP http_responses_total Responses by route and status.", "# TYPE http_responses_total counter"]
+        for (method, route), stats in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'http_responses_total{{{labels},status="{status}"}} {count}')
+        lines += [
+            "# HELP http_request_db_queries_total SQL statements executed while serving the route.",
+            "# TYPE http_request_db_queries_total counter",
+        ]
+        for (method, route), stats in routes:
+            lines.append(f'http_request_db_queries_total{{method="{method}",route="{_escape(route)}"}} {stats.queries}')
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent in SQL statements while serving the route.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route), stats in routes:
+            lines.append(
+                f'http_request_db_seconds_total{{method="{method}",route="{_escape(route)}"}} {stats.db_seconds:.6f}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cost = RequestCost()
+        token = request_cost.set(cost)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_cost.reset(token)
+            # the router stores the matched route in the scope; label by its template
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], path, status, elapsed, cost)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    cost = request_cost.get()
+    if cost is not None and context is not None:
+        cost.queries += 1
+        cost.db_seconds += time.perf_counter() - context.metrics_started
+
+
+def instrument_sql() -> None:
+    """Attribute statements on every engine (sync, async and test engines alike) to the current request."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
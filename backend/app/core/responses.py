@@ -0,0 +1,35 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        # same as Pydantic: Decimal fields are serialized as strings
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded JSON for plain dicts and lists, formatted exactly like a Pydantic response.
+
+    Returning it from a handler skips ``response_model`` validation and serialization, so
+    the content must already have the response model's shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # UTC as "Z", like Pydantic; naive datetimes are written as they are
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    """A ``FastJSONResponse`` that keeps the headers set on the handler's injected ``response``.
+
+    FastAPI drops those (an ETag from a dependency, say) once a handler returns its own response.
+    """
+    fast = FastJSONResponse(content)
+    fast.raw_headers.extend((name, value) for name, value in response.raw_headers if name != b"content-length")
+    return fast
@@ -1,25 +1,86 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 from jose import JWTError, jwt
 import bcrypt
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+def hash_password(password: str, rounds: int | None = None) -> str:
+    salt = bcrypt.gensalt(rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
-def create_access_token(subject: str, extra_claims: Dict[str, Any] | None = None) -> tuple[str, datetime]:
+def hash_rounds(hashed: str) -> int:
+    # $2b$<cost>$<salt><hash>
+    return int(hashed.split("$")[2])
+
+
+def verify_and_rehash(password: str, hashed: str, rounds: int) -> tuple[bool, str | None]:
+    """Check ``password``; if it matches a hash of another cost, also return a new hash at ``rounds``."""
+    if not verify_password(password, hashed):
+        return False, None
+    if hash_rounds(hashed) != rounds:
+        return True, hash_password(password, rounds)
+    return True, None
+
+
+def _password_hash_pool() -> ProcessPoolExecutor | None:
+    global _hash_pool
+    workers = settings.password_hash_workers
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        return None
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # spawn, not fork: the parent has the event loop and threadpool threads running
+            _hash_pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        return _hash_pool
+
+
+def shutdown_password_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
+
+
+async def _run_hashing(func: Callable, *args):
+    pool = _password_hash_pool()
+    if pool is None:
+        return await run_in_threadpool(func, *args)
+    # awaiting the pool holds no threadpool slot, so checkouts keep their threads during a login storm
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+async def verify_password_async(password: str, hashed: str) -> tuple[bool, str | None]:
+    """``verify_and_rehash`` at the configured cost, off the event loop and the threadpool."""
+    return await _run_hashing(verify_and_rehash, password, hashed, settings.bcrypt_rounds)
+
+
+def create_access_token(
+    subject: str, extra_claims: Dict[str, Any] | None = None, expires_delta: timedelta | None = None
+) -> tuple[str, datetime]:
     to_encode: Dict[str, Any] = {"sub": subject}
     if extra_claims:
         to_encode.update(extra_claims)
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expires_minutes)
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.jwt_expires_minutes))
     to_encode.update({"exp": expire})
     token = jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
     return token, expire
@@ -0,0 +1,146 @@
+"""Connection pool configuration and instrumentation.
+
+SQLAlchemy has no event before a checkout starts, so checkout wait is timed by a pool
+subclass around ``Pool.connect``. Everything else comes from pool events. The subclass
+carries its ``PoolMetrics`` as a class attribute so it survives ``Engine.dispose()``,
+which recreates the pool from its class.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.config import Settings
+
+# checkout waits kept for the percentile; older ones only count towards the totals
+RECENT_WAITS = 1024
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.recent_waits: deque = deque(maxlen=RECENT_WAITS)
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.opened = 0
+            self.closed = 0
+            self.invalidated = 0
+
+    def record_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.recent_waits.append(seconds)
+
+    def _checked_out(self, *args) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _checked_in(self, *args) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def _opened(self, *args) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def _closed(self, *args) -> None:
+        with self._lock:
+            self.closed += 1
+
+    def _invalidated(self, *args) -> None:
+        with self._lock:
+            self.invalidated += 1
+
+    def stats(self, pool: Pool) -> Dict[str, Any]:
+        size = pool.size() if isinstance(pool, QueuePool) else None
+        with self._lock:
+            waits = sorted(self.recent_waits)
+            p99 = waits[min(len(waits) - 1, round(0.99 * (len(waits) - 1)))] if waits else 0.0
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "size": size,
+                "in_use": self.in_use,
+                "overflow": max(0, self.in_use - size) if size is not None else None,
+                "idle": pool.checkedin() if size is not None else None,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_ms_avg": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                "checkout_wait_ms_p99": p99 * 1000,
+                "checkout_wait_ms_max": self.wait_max * 1000,
+                "connections_opened": self.opened,
+                "connections_closed": self.closed,
+                "connections_invalidated": self.invalidated,
+            }
+
+
+class _TimedCheckout:
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+def pool_options(url: str, settings: Settings, metrics: PoolMetrics) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for the configured, instrumented pool.
+
+    The pool class stays the dialect's default; sizing options only apply to queue pools
+    (SQLite in-memory and aiosqlite use single-connection or unpooled classes).
+    """
+    parsed = make_url(url)
+    pool_cls: Type[Pool] = parsed.get_dialect().get_pool_class(parsed)
+    options: Dict[str, Any] = {
+        "poolclass": type(pool_cls.__name__, (_TimedCheckout, pool_cls), {"metrics": metrics}),
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if issubclass(pool_cls, QueuePool):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+        )
+    return options
+
+
+def watch_pool(engine: Engine) -> None:
+    """Feed checkouts, check-ins and connection churn of a ``pool_options`` engine into its metrics."""
+    metrics = engine.pool.metrics
+    event.listen(engine, "checkout", metrics._checked_out)
+    event.listen(engine, "checkin", metrics._checked_in)
+    event.listen(engine, "connect", metrics._opened)
+    event.listen(engine, "close", metrics._closed)
+    event.listen(engine, "close_detached", metrics._closed)
+    event.listen(engine, "invalidate", metrics._invalidated)
+
+
+def pool_stats(engines: List[Engine]) -> List[Dict[str, Any]]:
+    return [engine.pool.metrics.stats(engine.pool) for engine in engines]
@@ -0,0 +1,169 @@
+"""Read-replica routing.
+
+Service methods decorated with ``read_only`` run their statements on a healthy replica
+when the session is a ``RoutingSession`` with replicas configured; everything else,
+including every read in a session that has already written (read-your-writes), stays
+on the primary bind. A replica whose connection fails is skipped for
+``db_replica_health_check_seconds`` and the call is retried on the primary; the health
+check started with the app brings it back once it answers again.
+"""
+import asyncio
+import functools
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Session.info keys: the replica the current read_only call runs on, and whether the
+# session has written anything (its later reads must see those writes)
+REPLICA = "replica"
+WROTE = "wrote"
+
+
+class Replica:
+    def __init__(self, engine: Engine | AsyncEngine, retry_seconds: float):
+        self.engine = engine
+        # what Session.get_bind hands out; an AsyncSession runs on the sync engine underneath
+        self.bind = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= time.monotonic()
+
+    def mark_down(self) -> None:
+        self.down_until = time.monotonic() + self.retry_seconds
+
+    def mark_up(self) -> None:
+        self.down_until = 0.0
+
+
+class ReplicaSet:
+    """Round-robin over the replicas that are currently healthy."""
+
+    def __init__(self, engines: List[Engine | AsyncEngine], retry_seconds: float):
+        self.replicas = [Replica(engine, retry_seconds) for engine in engines]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            return healthy[next(self._next) % len(healthy)]
+
+    async def check(self) -> None:
+        """Probe every replica with ``SELECT 1`` and mark it up or down."""
+        for replica in self.replicas:
+            try:
+                if isinstance(replica.engine, AsyncEngine):
+                    async with replica.engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                else:
+                    await run_in_threadpool(_ping, replica.engine)
+            except Exception:
+                if replica.healthy:
+                    logger.warning("Read replica %s failed its health check", replica.bind.url, exc_info=True)
+                replica.mark_down()
+            else:
+                replica.mark_up()
+
+    async def monitor(self, interval: float) -> None:
+        """Run ``check`` every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+
+def _ping(engine: Engine) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+class RoutingSession(Session):
+    """A Session that binds the statements of ``read_only`` service calls to a replica."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        replica = self.info.get(REPLICA)
+        if replica is not None:
+            return replica.bind
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _wrote_by_flush(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _wrote_by_statement(orm_execute_state):
+    # bulk insert/update/delete statements never flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[WROTE] = True
+
+
+def _routing_session(db: AsyncSession | Session) -> Optional[RoutingSession]:
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    if isinstance(session, RoutingSession) and session.replicas and not session.info.get(WROTE):
+        return session
+    return None
+
+
+def _replica_unavailable(exc: DBAPIError) -> bool:
+    return exc.connection_invalidated or isinstance(exc, (OperationalError, InterfaceError))
+
+
+def read_only(method: Callable[..., T]) -> Callable[..., T]:
+    """Run a service method that only reads on a replica, falling back to the primary."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        session = _routing_session(self.db)
+        if session is None or REPLICA in session.info:
+            return method(self, *args, **kwargs)
+        replica = session.replicas.pick()
+        if replica is None:
+            return method(self, *args, **kwargs)
+        session.info[REPLICA] = replica
+        try:
+            return method(self, *args, **kwargs)
+        except DBAPIError as exc:
+            if not _replica_unavailable(exc):
+                raise
+            logger.warning("Read replica %s unavailable, reading from the primary", replica.bind.url, exc_info=True)
+            replica.mark_down()
+        finally:
+            session.info.pop(REPLICA, None)
+        # nothing was written, so rolling back only drops the failed replica connection
+        session.rollback()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def replica_engine(db: AsyncSession | Session) -> Engine | AsyncEngine | None:
+    """A healthy replica engine for a read that opens its own session next to ``db``."""
+    session = _routing_session(db)
+    replica = session.replicas.pick() if session is not None else None
+    return replica.engine if replica is not None else None
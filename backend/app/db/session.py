@@ -1,10 +1,62 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import PoolMetrics, pool_options, watch_pool
+from app.db.routing import ReplicaSet, RoutingSession
 
-engine = create_engine(settings.database_url, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver of ``url`` for its asyncio counterpart (asyncpg, aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+engine = create_engine(
+    settings.database_url, future=True, **pool_options(settings.database_url, settings, PoolMetrics("sync"))
+)
+watch_pool(engine)
+replica_engines = []
+for number, url in enumerate(settings.database_replica_urls, 1):
+    replica_engines.append(
+        create_engine(url, future=True, **pool_options(url, settings, PoolMetrics(f"replica-{number}-sync")))
+    )
+    watch_pool(replica_engines[-1])
+replicas = ReplicaSet(replica_engines, settings.db_replica_health_check_seconds)
+SessionLocal = sessionmaker(
+    bind=engine, class_=RoutingSession, replicas=replicas, autoflush=False, autocommit=False, future=True
+)
+
+_async_url = settings.async_database_url or async_database_url(settings.database_url)
+async_engine = create_async_engine(_async_url, **pool_options(_async_url, settings, PoolMetrics("async")))
+watch_pool(async_engine.sync_engine)
+async_replica_engines = []
+for number, url in enumerate(settings.database_replica_urls, 1):
+    url = async_database_url(url)
+    async_replica_engines.append(
+        create_async_engine(url, **pool_options(url, settings, PoolMetrics(f"replica-{number}-async")))
+    )
+    watch_pool(async_replica_engines[-1].sync_engine)
+async_replicas = ReplicaSet(async_replica_engines, settings.db_replica_health_check_seconds)
+# engines whose pools are reported on /api/admin/db/pool
+pooled_engines = [engine, async_engine.sync_engine]
+pooled_engines += replica_engines + [replica.sync_engine for replica in async_replica_engines]
+# objects returned by services are serialised after the session's greenlet has returned,
+# where expired attributes can no longer be lazy-loaded
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    replicas=async_replicas,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 def get_db():
@@ -0,0 +1,63 @@
+"""Dialect-aware SQL helpers for the backends we run on (PostgreSQL, SQLite in tests)."""
+from sqlalchemy import Date, DateTime, Integer, cast, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, func
+
+
+# rendered inline rather than bound, so GROUP BY matches the SELECT expression on PostgreSQL
+_UTC = literal_column("'UTC'")
+
+
+def dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def dialect_insert(db: Session):
+    """Return the ``insert`` construct that supports ``on_conflict_do_update`` for this backend."""
+    name = dialect_name(db)
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upserts are not supported on {name}")
+
+
+def utc_date(db: Session, column) -> ColumnElement:
+    """Calendar date (UTC) of a timezone-aware timestamp column."""
+    if dialect_name(db) == "postgresql":
+        return func.date(func.timezone(_UTC, column))
+    # SQLite stores timestamps as naive UTC strings
+    return func.date(column)
+
+
+BUCKET_UNITS = ("hour", "day", "week", "month")
+
+_SQLITE_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H:00:00",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m-01",
+}
+
+
+def time_bucket(db: Session, column, unit: str) -> ColumnElement:
+    """Start of the UTC ``unit`` bucket (weeks start on Monday) for a timestamp or date column.
+
+    PostgreSQL returns a timestamp, SQLite an ISO-8601 string; a date column bucketed
+    by day is returned as is.
+    """
+    if unit not in BUCKET_UNITS:
+        raise ValueError(f"Unknown bucket unit {unit!r}")
+    if unit == "day" and isinstance(column.type, Date):
+        # a date is its own day bucket; grouping on the bare column can use its index
+        return column
+    if dialect_name(db) == "postgresql":
+        if isinstance(column.type, DateTime):
+            column = func.timezone(_UTC, column)
+        # inline the unit so the expression compiles identically in SELECT and GROUP BY
+        return func.date_trunc(literal_column(f"'{unit}'"), column)
+    if unit == "week":
+        # strftime('%w') is 0 for Sunday; step back to the Monday of the same week
+        weekday = cast(func.strftime("%w", column), Integer)
+        return func.date(column, func.printf("-%d days", (weekday + 6) % 7))
+    return func.strftime(_SQLITE_BUCKET_FORMATS[unit], column)
@@ -1,10 +1,37 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, instrument_sql
+from app.core.security import shutdown_password_hash_pool
 from app.api import api_router
+from app.db import session
+from app.db.session import SessionLocal
+from app.services.product_search import warm_product_search_index
+from app.services.top_sellers import warm_top_sellers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.search_index_warm_on_startup:
+        await run_in_threadpool(warm_product_search_index, SessionLocal)
+    if settings.top_sellers_warm_on_startup:
+        await run_in_threadpool(warm_top_sellers, SessionLocal)
+    replicas = session.async_replicas if settings.db_async else session.replicas
+    health_checks = None
+    if replicas:
+        health_checks = asyncio.create_task(replicas.monitor(settings.db_replica_health_check_seconds))
+    yield
+    if health_checks:
+        health_checks.cancel()
+    await run_in_threadpool(shutdown_password_hash_pool)
+
 
-app = FastAPI(title="Codex POS API", version="0.1.0", debug=settings.debug)
+app = FastAPI(title="Codex POS API", version="0.1.0", debug=settings.debug, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,6 +39,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+# outermost, so latency includes CORS handling and every response status is seen
+app.add_middleware(MetricsMiddleware)
+instrument_sql()
 
 app.include_router(api_router)
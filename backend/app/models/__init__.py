@@ -6,3 +6,7 @@ from app.models.product import Product  # noqa: F401
 from app.models.inventory import Inventory  # noqa: F401
 from app.models.order import Order  # noqa: F401
 from app.models.order_item import OrderItem  # noqa: F401
+from app.models.daily_sales import DailySales  # noqa: F401
+from app.models.daily_product_sales import DailyProductSales  # noqa: F401
+from app.models.catalog_version import CatalogVersion  # noqa: F401
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Column, Integer
+
+from app.db.base import Base
+
+
+class CatalogVersion(Base):
+    """Single-row counter; every catalog write stamps the rows it touches with the next value."""
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
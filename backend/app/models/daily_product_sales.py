@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric
+
+from app.db.base import Base
+
+
+class DailyProductSales(Base):
+    """Per-day, per-product quantities and revenue, maintained alongside order writes."""
+
+    __tablename__ = "daily_product_sales"
+
+    sales_date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        # serves "top products of a day" straight from the index, for daily and range reports
+        Index("ix_daily_product_sales_ranking", "sales_date", quantity.desc(), "product_id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Date, Integer, Numeric
+
+from app.db.base import Base
+
+
+class DailySales(Base):
+    """Per-day order totals, maintained alongside order writes."""
+
+    __tablename__ = "daily_sales"
+
+    sales_date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
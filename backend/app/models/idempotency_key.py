@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """A client's ``Idempotency-Key`` and the response it got, replayed for retries until ``expires_at``.
+
+    ``status_code`` is null while the first request is still being processed; until then
+    ``expires_at`` is a short lock timeout after which the key can be claimed again.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -11,6 +11,22 @@ class Inventory(Base):
 
     product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
     quantity = Column(Integer, nullable=False, default=0)
+    # restock once quantity falls below this; 0 never reports the product as low
+    reorder_point = Column(Integer, nullable=False, default=0, server_default="0")
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    # catalog version of the last change; NULL once a sale changed it, until the next delta sync
+    version = Column(BigInteger, nullable=True, default=0, index=True)
 
     product = relationship("Product", back_populates="inventory")
+
+    __table_args__ = (
+        # partial: only rows below their reorder point, ordered by shortfall, so the low-stock
+        # list reads a few index entries however large the catalog is
+        Index(
+            "ix_inventory_low_stock",
+            reorder_point - quantity,
+            "product_id",
+            postgresql_where=quantity < reorder_point,
+            sqlite_where=quantity < reorder_point,
+        ),
+    )
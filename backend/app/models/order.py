@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -15,4 +15,10 @@ class Order(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     created_by_user = relationship("User", back_populates="orders")
-    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    # OrderRead always includes the items, and async handlers cannot lazy-load them later
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="selectin")
+
+    __table_args__ = (
+        # newest-first listing and keyset pagination on (created_at, id)
+        Index("ix_orders_created_at_id", "created_at", "id"),
+    )
@@ -3,7 +3,16 @@
 from app.schemas.user import UserRead, UserCreate  # noqa: F401
 from app.schemas.auth import LoginRequest, LoginResponse  # noqa: F401
 from app.schemas.category import CategoryRead, CategoryCreate, CategoryUpdate  # noqa: F401
-from app.schemas.product import ProductRead, ProductCreate, ProductUpdate  # noqa: F401
-from app.schemas.inventory import InventoryRead, InventoryUpdate  # noqa: F401
+from app.schemas.product import (  # noqa: F401
+    ProductRead,
+    ProductCreate,
+    ProductUpdate,
+    ProductSearchPage,
+    ProductSummaryRead,
+    ProductImportResult,
+)
+from app.schemas.inventory import InventoryRead, InventoryUpdate, InventoryAdjustmentBatch, LowStockItem  # noqa: F401
 from app.schemas.order import OrderRead, OrderCreate  # noqa: F401
-from app.schemas.report import DailyReport  # noqa: F401
+from app.schemas.report import DailyReport, TopSellersReport  # noqa: F401
+from app.schemas.catalog import CatalogChanges  # noqa: F401
+from app.schemas.pool import PoolStats  # noqa: F401
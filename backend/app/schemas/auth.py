@@ -18,3 +18,8 @@ class Token(BaseModel):
 
 class LoginResponse(Token):
     user: UserRead
+
+
+class EventStreamToken(BaseModel):
+    token: str
+    expires_at: datetime
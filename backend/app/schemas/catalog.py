@@ -0,0 +1,14 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.category import CategoryRead
+from app.schemas.inventory import InventoryRead
+from app.schemas.product import ProductRead
+
+
+class CatalogChanges(BaseModel):
+    version: int
+    products: List[ProductRead]
+    categories: List[CategoryRead]
+    inventory: List[InventoryRead]
@@ -1,11 +1,12 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 
 
 class InventoryRead(BaseModel):
     product_id: int
     quantity: int
+    reorder_point: int
     updated_at: datetime
 
     class Config:
@@ -14,3 +15,28 @@ class InventoryRead(BaseModel):
 
 class InventoryUpdate(BaseModel):
     quantity: int
+    # left unchanged when omitted
+    reorder_point: int | None = None
+
+
+class LowStockItem(BaseModel):
+    product_id: int
+    sku: str
+    name: str
+    quantity: int
+    reorder_point: int
+    # reorder_point - quantity, always positive
+    shortfall: int
+
+    class Config:
+        from_attributes = True
+
+
+class InventoryAdjustment(BaseModel):
+    product_id: int
+    # signed change, e.g. +24 for a delivery line or -2 for breakage
+    delta: int
+
+
+class InventoryAdjustmentBatch(BaseModel):
+    items: conlist(InventoryAdjustment, min_length=1, max_length=5000)
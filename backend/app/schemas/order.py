@@ -1,8 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import Any, List
 
-from pydantic import BaseModel, conint
+from pydantic import BaseModel, conint, conlist
 
 from app.schemas.product import ProductRead
 from app.schemas.user import UserRead
@@ -37,3 +37,25 @@ class OrderRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class OrderBatchItem(OrderCreate):
+    created_at: datetime | None = None
+
+
+class OrderBatchCreate(BaseModel):
+    orders: conlist(OrderBatchItem, min_length=1, max_length=5000)
+
+
+class OrderBatchResult(BaseModel):
+    index: int
+    status_code: int
+    order_id: int | None = None
+    total_amount: Decimal | None = None
+    detail: Any = None
+
+
+class OrderBatchResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[OrderBatchResult]
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: str
+    # size, overflow and idle are only reported for queue pools
+    size: int | None
+    in_use: int
+    overflow: int | None
+    idle: int | None
+    peak_in_use: int
+    checkouts: int
+    checkout_timeouts: int
+    checkout_wait_ms_avg: float
+    checkout_wait_ms_p99: float
+    checkout_wait_ms_max: float
+    connections_opened: int
+    connections_closed: int
+    connections_invalidated: int
@@ -30,3 +30,35 @@ class ProductRead(ProductBase):
 
     class Config:
         from_attributes = True
+
+
+class ProductSummaryRead(BaseModel):
+    id: int
+    sku: str
+    name: str
+    price: Decimal
+
+    class Config:
+        from_attributes = True
+
+
+class ProductSearchPage(BaseModel):
+    total: int
+    items: list[ProductRead]
+
+
+class ProductImportError(BaseModel):
+    line: int
+    sku: str | None = None
+    message: str
+
+
+class ProductImportResult(BaseModel):
+    rows: int
+    created: int
+    updated: int
+    failed: int
+    # the first errors only (IMPORT_MAX_REPORTED_ERRORS); ``failed`` counts them all
+    errors: list[ProductImportError]
+    seconds: float
+    rows_per_second: float
@@ -1,5 +1,6 @@
+from datetime import date, datetime
 from decimal import Decimal
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel
 
@@ -16,3 +17,34 @@ class DailyReport(BaseModel):
     order_count: int
     total_amount: Decimal
     top_products: List[TopProduct]
+
+
+BucketUnit = Literal["hour", "day", "week", "month"]
+
+
+class ReportBucket(BaseModel):
+    start: datetime
+    order_count: int
+    total_amount: Decimal
+    top_products: List[TopProduct]
+
+
+class RangeReport(BaseModel):
+    from_date: date
+    to_date: date
+    bucket: BucketUnit
+    buckets: List[ReportBucket]
+
+
+TopSellersWindow = Literal["15m", "1h", "1d"]
+
+
+class TopSeller(BaseModel):
+    product_id: int
+    name: str
+    quantity: int
+
+
+class TopSellersReport(BaseModel):
+    window: TopSellersWindow
+    products: List[TopSeller]
@@ -6,3 +6,6 @@ from app.services.product_service import ProductService  # noqa: F401
 from app.services.inventory_service import InventoryService  # noqa: F401
 from app.services.order_service import OrderService  # noqa: F401
 from app.services.report_service import ReportService  # noqa: F401
+from app.services.sales_rollup_service import SalesRollupService  # noqa: F401
+from app.services.catalog_service import CatalogService  # noqa: F401
+from app.services.async_service import AsyncService  # noqa: F401
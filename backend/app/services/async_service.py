@@ -0,0 +1,80 @@
+"""Awaitable access to the services from async request handlers.
+
+The services are written once, against a sync ``Session``. On an ``AsyncSession`` a
+call goes through ``AsyncSession.run_sync``: the service code runs in a greenlet and
+every statement it issues is awaited on the asyncio driver, so a request waiting on
+the database holds no threadpool slot. On a sync ``Session`` (``DB_ASYNC=false``)
+the call runs in the threadpool, as the old sync handlers did.
+
+``run_sync`` keeps the Python side of the call on the event-loop thread, which suits
+short ORM calls. Calls that compute for long (a CSV import parsing thousands of rows)
+are made with ``AsyncService(..., blocking=True)``: they run in the threadpool on a
+sync session of their own, so the worker keeps serving other requests meanwhile.
+"""
+from typing import Callable, Generic, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db import session as db_session
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+# Session.info flag: close the sync session after every threadpool call. A request that
+# kept its connection while queueing for the next thread could otherwise hold the pool
+# while every thread waits on the pool.
+RELEASE_AFTER_CALL = "release_after_call"
+
+
+async def run_in_session(db: AsyncSession | Session, fn: Callable[[Session], T]) -> T:
+    """Run ``fn(session)`` without blocking the event loop, whichever session kind ``db`` is."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    if not db.info.get(RELEASE_AFTER_CALL):
+        return await run_in_threadpool(fn, db)
+
+    def call_and_release(session: Session) -> T:
+        try:
+            return fn(session)
+        finally:
+            session.close()
+
+    return await run_in_threadpool(call_and_release, db)
+
+
+async def run_in_threadpool_session(db: AsyncSession | Session, fn: Callable[[Session], T]) -> T:
+    """``run_in_session`` for long calls: never on the event-loop thread, even when ``db`` is async.
+
+    An AsyncSession's connection cannot be used from another thread, so the call gets a
+    sync session on the primary engine instead, and commits through it.
+    """
+    if not isinstance(db, AsyncSession):
+        return await run_in_session(db, fn)
+
+    def call() -> T:
+        with db_session.SessionLocal() as session:
+            return fn(session)
+
+    return await run_in_threadpool(call)
+
+
+class AsyncService(Generic[S]):
+    """``await AsyncService(OrderService, db).get(order_id)`` calls ``OrderService(session).get``.
+
+    With ``blocking=True`` calls go through ``run_in_threadpool_session``.
+    """
+
+    def __init__(self, service_cls: Type[S], db: AsyncSession | Session, blocking: bool = False):
+        self._service_cls = service_cls
+        self._db = db
+        self._run = run_in_threadpool_session if blocking else run_in_session
+
+    def __getattr__(self, name: str):
+        method = getattr(self._service_cls, name)
+
+        async def call(*args, **kwargs):
+            return await self._run(self._db, lambda session: method(self._service_cls(session), *args, **kwargs))
+
+        return call
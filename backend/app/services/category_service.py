@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.catalog_service import CatalogService
 
 
 class CategoryService:
@@ -13,6 +14,7 @@ class CategoryService:
 
     def create(self, payload: CategoryCreate) -> Category:
         category = Category(name=payload.name, is_active=payload.is_active)
+        category.version = CatalogService(self.db).next_version()
         self.db.add(category)
         self.db.commit()
         self.db.refresh(category)
@@ -25,6 +27,8 @@ class CategoryService:
         category = self.get(category_id)
         if not category:
             return None
+        # the counter before the row: a change made first would be flushed, and locked, by next_version
+        category.version = CatalogService(self.db).next_version()
         for field, value in payload.dict(exclude_unset=True).items():
             setattr(category, field, value)
         self.db.commit()
@@ -35,6 +39,7 @@ class CategoryService:
         category = self.get(category_id)
         if not category:
             return False
+        category.version = CatalogService(self.db).next_version()
         category.is_active = False
         self.db.commit()
         return True
@@ -0,0 +1,118 @@
+"""In-process publish/subscribe of committed changes, streamed to clients as server-sent events.
+
+Services publish after their commit, from whichever thread runs them (the event loop's,
+through ``AsyncSession.run_sync``, or a threadpool thread). An event is encoded once as
+an SSE frame and handed to each subscriber's event loop with one ``call_soon_threadsafe``
+per loop, however many subscribers wait on it. Every subscriber has a bounded queue; a
+subscriber that lets it fill up is dropped rather than slowing the publisher or growing
+memory: its queue is emptied and its stream ends, and the client reconnects and
+refetches what it shows.
+
+Events only reach subscribers of the worker process that committed the change.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from typing import AsyncIterator, Dict, FrozenSet, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = "order.created"
+STOCK_CHANGED = "stock.changed"
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        # SSE frames; None once the subscriber has been dropped
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def _deliver(self, frame: str) -> None:
+        # runs on self.loop
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            logger.info("Dropped an event subscriber that fell %d events behind", self.queue.maxsize)
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # copied on (un)subscribe, so publishing never copies the subscribers of a loop
+        self._subscribers: Dict[asyncio.AbstractEventLoop, FrozenSet[Subscription]] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, maxsize: int | None = None) -> Subscription:
+        """Register a subscriber on the running event loop; ``unsubscribe`` it when done."""
+        subscription = Subscription(asyncio.get_running_loop(), maxsize or settings.event_queue_size)
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.loop, frozenset())
+            self._subscribers[subscription.loop] = subscribers | {subscription}
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.loop, frozenset()) - {subscription}
+            if subscribers:
+                self._subscribers[subscription.loop] = subscribers
+            else:
+                self._subscribers.pop(subscription.loop, None)
+
+    def publish(self, event: str, data) -> None:
+        """Send ``data`` (JSON-serialisable) as an ``event`` to every subscriber; never blocks."""
+        with self._lock:
+            if not self._subscribers:
+                return
+            frame = f"id: {next(self._ids)}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+            targets = list(self._subscribers.items())
+        for loop, subscribers in targets:
+            try:
+                loop.call_soon_threadsafe(_deliver_all, subscribers, frame)
+            except RuntimeError:
+                # the loop has closed without its subscribers unsubscribing
+                with self._lock:
+                    self._subscribers.pop(loop, None)
+
+
+def _deliver_all(subscribers: FrozenSet[Subscription], frame: str) -> None:
+    for subscription in subscribers:
+        subscription._deliver(frame)
+
+
+event_bus = EventBus()
+
+
+async def stream_events(keepalive_seconds: float) -> AsyncIterator[str]:
+    """SSE frames of a new subscription until it is dropped, with a comment line every
+    ``keepalive_seconds`` of silence so proxies keep the connection open."""
+    # subscribed once the response starts, so a request that never streams leaves nothing behind
+    subscription = event_bus.subscribe()
+    try:
+        # reconnect soon after a drop or a restart
+        yield "retry: 1000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                return
+            yield frame
+    finally:
+        event_bus.unsubscribe(subscription)
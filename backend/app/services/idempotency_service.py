@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.sql import dialect_insert
+from app.models.idempotency_key import IdempotencyKey
+from app.services.async_service import AsyncService
+
+# (request_hash, status_code, response_body) of a key someone else holds
+KeyState = Tuple[str, int | None, str | None]
+# (claimed_at, None) when the key was taken, (None, state) when someone else holds it
+Claim = Tuple[Optional[datetime], Optional[KeyState]]
+
+
+def request_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+class IdempotencyService:
+    """Claims ``Idempotency-Key`` values and stores the response they produced.
+
+    ``claim`` commits straight away so that concurrent duplicates, in any worker, see the
+    key as taken. ``complete`` never commits: it is called inside the write transaction of
+    the request itself, so the stored response and the order it describes are committed
+    together, and a retry can never create a second order.
+
+    A claim is identified by its ``created_at``: a request that outlives its lock may see
+    a retry take the key over, and then ``complete`` and ``release`` no longer touch it.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, user_id: int, key: str, request_hash: str) -> Claim:
+        """Take ``key`` for a new request, or return the state of whoever holds it."""
+        now = datetime.now(timezone.utc)
+        values = {
+            "request_hash": request_hash,
+            "status_code": None,
+            "response_body": None,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=settings.idempotency_lock_seconds),
+        }
+        stmt = dialect_insert(self.db)(IdempotencyKey).values(user_id=user_id, key=key, **values)
+        # an expired key, or one abandoned mid-request, is free to take over
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_=values,
+            where=IdempotencyKey.expires_at < now,
+        ).returning(IdempotencyKey.key)
+        claimed = self.db.execute(stmt).first() is not None
+        if claimed:
+            self.db.commit()
+            return now, None
+        state = self.db.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response_body).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+            )
+        ).first()
+        self.db.commit()
+        # released between the two statements: report it as held, the caller polls again
+        return None, tuple(state) if state else (request_hash, None, None)
+
+    def complete(self, user_id: int, key: str, claimed_at: datetime, status_code: int, body: dict) -> bool:
+        """Store the response under the key claimed at ``claimed_at``; False if the claim was lost
+        to a retry after its lock ran out, in which case the caller must roll back."""
+        result = self.db.execute(
+            update(IdempotencyKey)
+            .where(self._claimed(user_id, key, claimed_at))
+            .values(
+                status_code=status_code,
+                response_body=json.dumps(body),
+                expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.idempotency_ttl_seconds),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def release(self, user_id: int, key: str, claimed_at: datetime) -> None:
+        """Give up a claimed key whose request failed, so the client can retry with it."""
+        self.db.execute(delete(IdempotencyKey).where(self._claimed(user_id, key, claimed_at)))
+        self.db.commit()
+
+    @staticmethod
+    def _claimed(user_id: int, key: str, claimed_at: datetime):
+        # still in progress, and not claimed again since
+        return (
+            (IdempotencyKey.user_id == user_id)
+            & (IdempotencyKey.key == key)
+            & (IdempotencyKey.created_at == claimed_at)
+            & IdempotencyKey.status_code.is_(None)
+        )
+
+    def purge_expired(self) -> int:
+        result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.now(timezone.utc)))
+        self.db.commit()
+        return result.rowcount
+
+
+async def run_once(
+    db: AsyncSession | Session,
+    user_id: int,
+    key: str,
+    request_hash: str,
+    execute: Callable[[datetime], Awaitable[dict]],
+    success_status: int,
+) -> Tuple[int, dict, bool]:
+    """Run ``execute`` for the first request with ``key``; replay its stored response for repeats.
+
+    ``execute`` is called with the time the key was claimed at; it must store its response
+    with ``IdempotencyService.complete`` in its own transaction and return the same body.
+    A duplicate that arrives while the first request is in progress waits for it, polling
+    the database so duplicates on other workers are seen too. Returns (status code, body, replayed).
+    """
+    service = AsyncService(IdempotencyService, db)
+    deadline = time.monotonic() + settings.idempotency_wait_seconds
+    delay = 0.01
+    while True:
+        claimed_at, state = await service.claim(user_id, key, request_hash)
+        if state is None:
+            try:
+                return success_status, await execute(claimed_at), False
+            except Exception:
+                # failed requests are not stored; the order was rolled back, so retrying is safe
+                await service.release(user_id, key, claimed_at)
+                raise
+        stored_hash, status_code, body = state
+        if stored_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if status_code is not None:
+            return status_code, json.loads(body), True
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.25)
@@ -1,7 +1,47 @@
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, select, tuple_, update
 from sqlalchemy.orm import Session
 
+from app.db.sql import dialect_insert
 from app.models.inventory import Inventory
+from app.models.product import Product
 from app.schemas.inventory import InventoryUpdate
+from app.services.catalog_service import CatalogService
+from app.services.event_bus import STOCK_CHANGED, event_bus
+
+
+class InventoryLevel(NamedTuple):
+    """An ``InventoryRead`` row as a plain tuple, kept out of the session's identity map."""
+
+    product_id: int
+    quantity: int
+    reorder_point: int
+    updated_at: datetime
+
+
+LEVEL_COLUMNS = [getattr(Inventory, field) for field in InventoryLevel._fields]
+
+
+class LowStockLevel(NamedTuple):
+    """A ``LowStockItem`` row: a stock level below its reorder point, with its product."""
+
+    product_id: int
+    sku: str
+    name: str
+    quantity: int
+    reorder_point: int
+    shortfall: int
+
+
+def publish_stock_levels(levels: Dict[int, int]) -> None:
+    """Announce committed stock levels (product_id -> quantity) on the event bus."""
+    if levels:
+        event_bus.publish(
+            STOCK_CHANGED, [{"product_id": product_id, "quantity": levels[product_id]} for product_id in sorted(levels)]
+        )
 
 
 class InventoryService:
@@ -11,16 +51,191 @@ class InventoryService:
     def list(self):
         return self.db.query(Inventory).all()
 
+    def list_levels(self) -> List[InventoryLevel]:
+        """``list`` projected onto the ``InventoryRead`` columns, without ORM entities."""
+        return [InventoryLevel._make(row) for row in self.db.query(*LEVEL_COLUMNS).order_by(Inventory.product_id)]
+
+    def list_low_stock(
+        self, limit: int = 50, cursor: Optional[Tuple[int, int]] = None, descending: bool = True
+    ) -> List[LowStockLevel]:
+        """Active products whose stock is below their reorder point, by shortfall (largest first
+        unless not ``descending``), then product id. ``cursor`` is the (shortfall, product_id) of
+        the last row already seen.
+
+        The filter and ordering are those of the partial index ix_inventory_low_stock, so a page
+        is an index range scan joined to products, however many SKUs are stocked.
+        """
+        shortfall = Inventory.reorder_point - Inventory.quantity
+        key = tuple_(shortfall, Inventory.product_id)
+        query = (
+            self.db.query(
+                Inventory.product_id,
+                Product.sku,
+                Product.name,
+                Inventory.quantity,
+                Inventory.reorder_point,
+                shortfall.label("shortfall"),
+            )
+            .join(Product, Product.id == Inventory.product_id)
+            .filter(Inventory.quantity < Inventory.reorder_point, Product.is_active.is_(True))
+        )
+        if descending:
+            query = query.order_by(shortfall.desc(), Inventory.product_id.desc())
+            if cursor:
+                query = query.filter(key < tuple_(*cursor))
+        else:
+            query = query.order_by(shortfall, Inventory.product_id)
+            if cursor:
+                query = query.filter(key > tuple_(*cursor))
+        return [LowStockLevel._make(row) for row in query.limit(limit)]
+
     def get(self, product_id: int) -> Inventory | None:
         return self.db.query(Inventory).filter(Inventory.product_id == product_id).first()
 
     def upsert_quantity(self, product_id: int, payload: InventoryUpdate) -> Inventory:
+        # the counter before the row: a change made first would be flushed, and locked, by next_version
+        version = CatalogService(self.db).next_version()
         record = self.get(product_id)
         if not record:
             record = Inventory(product_id=product_id, quantity=payload.quantity)
             self.db.add(record)
         else:
             record.quantity = payload.quantity
+        if payload.reorder_point is not None:
+            record.reorder_point = payload.reorder_point
+        record.version = version
         self.db.commit()
         self.db.refresh(record)
+        publish_stock_levels({record.product_id: record.quantity})
         return record
+
+    def reserve(self, quantities: Dict[int, int], levels: Optional[Dict[int, int]] = None) -> List[dict]:
+        """Decrement stock for each product with one conditional UPDATE per product.
+
+        Rows are touched in ascending product_id order so overlapping baskets lock
+        inventory in the same order and cannot deadlock. Returns the products that
+        could not be reserved; the caller owns the transaction and must roll back
+        when the list is non-empty. Reserved rows are marked pending for delta sync
+        (version NULL) rather than taking a catalog version, see ``CatalogService``.
+        ``levels``, if given, gets the new quantity of each product reserved.
+        """
+        now = datetime.now(timezone.utc)
+        shortages: List[dict] = []
+        for product_id in sorted(quantities):
+            requested = quantities[product_id]
+            quantity = self.db.execute(
+                update(Inventory)
+                .where(Inventory.product_id == product_id, Inventory.quantity >= requested)
+                .values(quantity=Inventory.quantity - requested, updated_at=now, version=None)
+                .returning(Inventory.quantity)
+            ).scalar_one_or_none()
+            if quantity is None:
+                shortages.append({"product_id": product_id, "requested": requested})
+            elif levels is not None:
+                levels[product_id] = quantity
+
+        if shortages:
+            available = dict(
+                self.db.query(Inventory.product_id, Inventory.quantity)
+                .filter(Inventory.product_id.in_([s["product_id"] for s in shortages]))
+                .all()
+            )
+            for shortage in shortages:
+                shortage["available"] = available.get(shortage["product_id"], 0)
+        return shortages
+
+    def adjust(self, deltas: Dict[int, int]) -> List[dict]:
+        """Add signed ``deltas`` (product_id -> change) to stock in one transaction, all or nothing.
+
+        The catalog version is taken first, then the stock rows are locked in ascending
+        product_id order like ``reserve`` (the lock order of ``CatalogService``), and changed
+        by one set-based UPDATE guarded by ``quantity + delta >= 0``; products without a
+        stock row count as 0 and get one. Raises 404 for unknown products and 409, listing them,
+        if any product would go negative. Returns the new quantities.
+        """
+        product_ids = sorted(deltas)
+        # counter before rows, like every catalog writer
+        version = CatalogService(self.db).next_version()
+        current = dict(
+            self.db.execute(
+                select(Inventory.product_id, Inventory.quantity)
+                .where(Inventory.product_id.in_(product_ids))
+                .order_by(Inventory.product_id)
+                .with_for_update()
+            ).all()
+        )
+        missing = [product_id for product_id in product_ids if product_id not in current]
+        if missing:
+            known = set(self.db.scalars(select(Product.id).where(Product.id.in_(missing))))
+            unknown = [product_id for product_id in missing if product_id not in known]
+            if unknown:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail={"message": "Products not found", "product_ids": unknown},
+                )
+        self._reject_negative(deltas, current, product_ids)
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        existing = [product_id for product_id in product_ids if product_id in current]
+        if existing:
+            delta = case({product_id: deltas[product_id] for product_id in existing}, value=Inventory.product_id)
+            rows += self.db.execute(
+                update(Inventory)
+                .where(Inventory.product_id.in_(existing), Inventory.quantity + delta >= 0)
+                .values(quantity=Inventory.quantity + delta, updated_at=now, version=version)
+                .returning(*LEVEL_COLUMNS)
+                .execution_options(synchronize_session=False)
+            ).all()
+            if len(rows) != len(existing):
+                # stock changed since it was read (SQLite takes no row locks for the SELECT)
+                updated = {row.product_id for row in rows}
+                self.db.rollback()
+                latest = dict(
+                    self.db.query(Inventory.product_id, Inventory.quantity).filter(Inventory.product_id.in_(existing))
+                )
+                self._reject(
+                    [
+                        {"product_id": product_id, "delta": deltas[product_id], "available": latest.get(product_id, 0)}
+                        for product_id in existing
+                        if product_id not in updated
+                    ]
+                )
+        if missing:
+            stmt = dialect_insert(self.db)(Inventory).values(
+                [
+                    {"product_id": product_id, "quantity": deltas[product_id], "updated_at": now, "version": version}
+                    for product_id in missing
+                ]
+            )
+            # a concurrent first write of the same stock row adds up instead of failing
+            rows += self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[Inventory.product_id],
+                    set_={
+                        "quantity": Inventory.quantity + stmt.excluded.quantity,
+                        "updated_at": now,
+                        "version": version,
+                    },
+                ).returning(*LEVEL_COLUMNS)
+            ).all()
+        self.db.commit()
+        publish_stock_levels({row.product_id: row.quantity for row in rows})
+        return sorted((row._asdict() for row in rows), key=lambda row: row["product_id"])
+
+    def _reject_negative(self, deltas: Dict[int, int], quantities: Dict[int, int], product_ids: List[int]) -> None:
+        rejected = [
+            {"product_id": product_id, "delta": deltas[product_id], "available": quantities.get(product_id, 0)}
+            for product_id in product_ids
+            if quantities.get(product_id, 0) + deltas[product_id] < 0
+        ]
+        if rejected:
+            self._reject(rejected)
+
+    def _reject(self, items: List[dict]) -> None:
+        self.db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Adjustment would make stock negative", "items": items},
+        )
@@ -0,0 +1,163 @@
+"""Streaming export of orders and their items, for reconciliation over long date ranges.
+
+One query joins orders to their items in (created_at, id) order and is read
+``EXPORT_BATCH_SIZE`` rows at a time (``yield_per``: a server-side cursor on
+PostgreSQL), so memory stays flat however many orders the range holds. Each batch
+is encoded and, if asked for, gzip-compressed before the next one is fetched.
+
+The export runs on its own session, bound like the request's: the response body
+is produced after the request's dependencies have been torn down.
+"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+
+from pydantic_core import to_json
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.routing import replica_engine
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+ORDER_COLUMNS = ("id", "created_by", "total_amount", "created_at")
+ITEM_COLUMNS = ("id", "product_id", "unit_price", "quantity", "line_total")
+CSV_HEADER = ["order_id", "created_by", "total_amount", "created_at"] + [f"item_{c}" for c in ITEM_COLUMNS]
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows gzip: listed (or ``*``, when gzip is not)
+    with a non-zero q-value, so ``gzip;q=0`` refuses it."""
+    qualities = {}
+    for item in accept_encoding.lower().split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+
+def export_statement(from_date: Optional[datetime] = None, to_date: Optional[datetime] = None) -> Select:
+    """Orders created in ``[from_date, to_date)``, one row per item, oldest first."""
+    stmt = (
+        select(*(Order.__table__.c[c] for c in ORDER_COLUMNS), *(OrderItem.__table__.c[c] for c in ITEM_COLUMNS))
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.created_at, Order.id, OrderItem.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if from_date:
+        stmt = stmt.where(Order.created_at >= from_date)
+    if to_date:
+        stmt = stmt.where(Order.created_at < to_date)
+    return stmt
+
+
+class CsvEncoder:
+    """One line per order item, the order's columns repeated; item columns empty for an order without items."""
+
+    def __init__(self):
+        self._header_sent = False
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self._header_sent:
+            writer.writerow(CSV_HEADER)
+            self._header_sent = True
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+
+    def finish(self) -> bytes:
+        return b"" if self._header_sent else self.encode(())
+
+
+class NdjsonEncoder:
+    """One JSON object per order, shaped like ``OrderRead``.
+
+    An order's items can straddle two batches, so the last order of each batch is held
+    back until the next batch (or ``finish``) shows it is complete.
+    """
+
+    def __init__(self):
+        self._pending: Optional[dict] = None
+
+    def encode(self, rows: Sequence[Row]) -> bytes:
+        lines: List[bytes] = []
+        order = self._pending
+        for row in rows:
+            if order is None or order["id"] != row[0]:
+                if order is not None:
+                    lines.append(to_json(order))
+                order = dict(zip(ORDER_COLUMNS, row[:4]))
+                order["items"] = []
+            if row[4] is not None:
+                order["items"].append(dict(zip(ITEM_COLUMNS, row[4:])))
+        self._pending = order
+        return b"".join(line + b"\n" for line in lines)
+
+    def finish(self) -> bytes:
+        if self._pending is None:
+            return b""
+        line, self._pending = to_json(self._pending), None
+        return line + b"\n"
+
+
+ENCODERS = {"csv": CsvEncoder, "ndjson": NdjsonEncoder}
+
+
+async def _batches(db: AsyncSession | Session, stmt: Select) -> AsyncIterator[Sequence[Row]]:
+    # a long read of its own: the whole export comes from one replica when there is one
+    bind = replica_engine(db)
+    if isinstance(db, AsyncSession):
+        async with AsyncSession(bind=bind or db.bind) as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                yield rows
+        return
+    session = Session(bind=bind or db.get_bind())
+    try:
+        result = await run_in_threadpool(session.execute, stmt)
+        partitions = result.partitions()
+        while rows := await run_in_threadpool(next, partitions, None):
+            yield rows
+    finally:
+        await run_in_threadpool(session.close)
+
+
+async def stream_orders(
+    db: AsyncSession | Session,
+    fmt: str,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """Body chunks of an export in ``fmt`` (a key of ``EXPORT_MEDIA_TYPES``)."""
+    encoder = ENCODERS[fmt]()
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31: gzip container
+    async for rows in _batches(db, export_statement(from_date, to_date)):
+        chunk = encoder.encode(rows)
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+    tail = encoder.finish()
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
@@ -1,15 +1,26 @@
+from collections import defaultdict
 from decimal import Decimal
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
+from sqlalchemy import insert, tuple_
 from sqlalchemy.orm import Session
 
+from app.db.routing import read_only
 from app.models.inventory import Inventory
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.product import Product
-from app.schemas.order import OrderCreate
+from app.schemas.order import OrderBatchItem, OrderCreate, OrderRead
+from app.services.event_bus import ORDER_CREATED, event_bus
+from app.services.idempotency_service import IdempotencyService
+from app.services.inventory_service import InventoryService, publish_stock_levels
+from app.services.sales_rollup_service import SalesRollupService
+from app.services.top_sellers import top_sellers
+
+BATCH_CHUNK_SIZE = 200
+BATCH_RESERVE_ATTEMPTS = 5
 
 
 class OrderService:
@@ -17,62 +28,220 @@ class OrderService:
         self.db = db
 
     def create_order(self, created_by: int, payload: OrderCreate) -> Order:
-        if not payload.items:
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No items provided")
+        levels: Dict[int, int] = {}
+        order = self._add_order(created_by, payload, levels)
+        self.db.commit()
+        self.db.refresh(order)
+        sales = self._sales(order)
+        top_sellers.record(*sales)
+        self._publish(created_by, order.total_amount, sales, levels)
+        return order
 
+    def create_order_once(
+        self, created_by: int, payload: OrderCreate, idempotency_key: str, claimed_at: datetime
+    ) -> dict:
+        """``create_order`` for an ``Idempotency-Key`` claimed at ``claimed_at``: the response body
+        is stored under the key in the order's own transaction, and returned. Raises 409, creating
+        nothing, if a retry took the key over after its lock ran out."""
+        levels: Dict[int, int] = {}
+        order = self._add_order(created_by, payload, levels)
+        self.db.flush()
+        body = OrderRead.model_validate(order).model_dump(mode="json")
+        if not IdempotencyService(self.db).complete(
+            created_by, idempotency_key, claimed_at, status.HTTP_201_CREATED, body
+        ):
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Idempotency-Key was taken over by a retry while this request was in progress",
+            )
+        sales = self._sales(order)
+        self.db.commit()
+        top_sellers.record(*sales)
+        self._publish(created_by, order.total_amount, sales, levels)
+        return body
+
+    @staticmethod
+    def _sales(order: Order) -> tuple:
+        """What the top-sellers leaderboard records of an order: (id, created_at, lines)."""
+        return order.id, order.created_at, [(item.product_id, item.quantity) for item in order.items]
+
+    @staticmethod
+    def _publish(created_by: int, total_amount: Decimal, sales: tuple, levels: Dict[int, int]) -> None:
+        """Announce a committed order, from its ``_sales``, and the stock levels it left."""
+        order_id, created_at, lines = sales
+        event_bus.publish(
+            ORDER_CREATED,
+            {
+                "id": order_id,
+                "created_by": created_by,
+                "total_amount": str(total_amount),
+                "created_at": created_at.isoformat(),
+                "items": [{"product_id": product_id, "quantity": quantity} for product_id, quantity in lines],
+            },
+        )
+        publish_stock_levels(levels)
+
+    def _add_order(self, created_by: int, payload: OrderCreate, levels: Optional[Dict[int, int]] = None) -> Order:
+        """Reserve stock and add the order and its rollups, without committing."""
         product_ids = [item.product_id for item in payload.items]
         products = {p.id: p for p in self.db.query(Product).filter(Product.id.in_(product_ids)).all()}
-        inventories = {
-            inv.product_id: inv for inv in self.db.query(Inventory).filter(Inventory.product_id.in_(product_ids)).all()
+        lines, requested, total_amount = self._price_items(payload.items, products)
+
+        shortages = InventoryService(self.db).reserve(requested, levels)
+        if shortages:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Insufficient stock", "items": shortages},
+            )
+
+        created_at = datetime.now(timezone.utc)
+        order = Order(
+            created_by=created_by,
+            total_amount=total_amount,
+            created_at=created_at,
+            items=[OrderItem(**line) for line in lines],
+        )
+        self.db.add(order)
+        SalesRollupService(self.db).apply([(created_at, total_amount, lines)])
+        return order
+
+    def create_orders_batch(
+        self, created_by: int, orders: Sequence[OrderBatchItem], chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> List[dict]:
+        """Validate and insert many orders, committing one transaction per chunk.
+
+        Products and stock are loaded once for the whole batch; each chunk then
+        reserves its combined stock and inserts its orders and items with
+        multi-row INSERTs. Returns one result dict per input order, in order.
+        """
+        product_ids = {item.product_id for order in orders for item in order.items}
+        products = {
+            row.id: row
+            for row in self.db.query(Product.id, Product.price, Product.is_active).filter(Product.id.in_(product_ids))
         }
+        stock = dict(
+            self.db.query(Inventory.product_id, Inventory.quantity).filter(Inventory.product_id.in_(product_ids))
+        )
 
-        order_items: List[OrderItem] = []
-        total_amount = Decimal("0.00")
+        results: List[dict] = []
+        for start in range(0, len(orders), chunk_size):
+            chunk = list(enumerate(orders[start : start + chunk_size], start))
+            results.extend(self._create_batch_chunk(created_by, chunk, products, stock))
+        return results
+
+    def _create_batch_chunk(self, created_by: int, chunk: list, products: dict, stock: Dict[int, int]) -> List[dict]:
+        for _ in range(BATCH_RESERVE_ATTEMPTS):
+            planned_stock = dict(stock)
+            accepted, results = [], {}
+            for index, payload in chunk:
+                try:
+                    lines, requested, total_amount = self._price_items(payload.items, products)
+                except HTTPException as exc:
+                    results[index] = {"index": index, "status_code": exc.status_code, "detail": exc.detail}
+                    continue
+                shortages = [
+                    {"product_id": pid, "requested": qty, "available": planned_stock.get(pid, 0)}
+                    for pid, qty in sorted(requested.items())
+                    if qty > planned_stock.get(pid, 0)
+                ]
+                if shortages:
+                    results[index] = {
+                        "index": index,
+                        "status_code": status.HTTP_409_CONFLICT,
+                        "detail": {"message": "Insufficient stock", "items": shortages},
+                    }
+                    continue
+                for pid, qty in requested.items():
+                    planned_stock[pid] -= qty
+                accepted.append((index, payload, lines, total_amount))
+
+            requested_total: Dict[int, int] = defaultdict(int)
+            for _, _, lines, _ in accepted:
+                for line in lines:
+                    requested_total[line["product_id"]] += line["quantity"]
+            levels: Dict[int, int] = {}
+            shortages = InventoryService(self.db).reserve(requested_total, levels)
+            if shortages:
+                # stock moved under us since it was loaded; replan the chunk against fresh numbers
+                self.db.rollback()
+                for shortage in shortages:
+                    stock[shortage["product_id"]] = shortage["available"]
+                continue
+
+            if accepted:
+                now = datetime.now(timezone.utc)
+                order_rows = [
+                    {"created_by": created_by, "total_amount": total_amount, "created_at": payload.created_at or now}
+                    for _, payload, _, total_amount in accepted
+                ]
+                order_ids = self.db.scalars(
+                    insert(Order).returning(Order.id, sort_by_parameter_order=True), order_rows
+                ).all()
+                self.db.execute(
+                    insert(OrderItem),
+                    [
+                        {**line, "order_id": order_id}
+                        for order_id, (_, _, lines, _) in zip(order_ids, accepted)
+                        for line in lines
+                    ],
+                )
+                SalesRollupService(self.db).apply(
+                    (row["created_at"], row["total_amount"], lines)
+                    for row, (_, _, lines, _) in zip(order_rows, accepted)
+                )
+                self.db.commit()
+                for order_id, row, (_, _, lines, _) in zip(order_ids, order_rows, accepted):
+                    sales = (order_id, row["created_at"], [(line["product_id"], line["quantity"]) for line in lines])
+                    top_sellers.record(*sales)
+                    self._publish(created_by, row["total_amount"], sales, {})
+                publish_stock_levels(levels)
+                for order_id, (index, _, _, total_amount) in zip(order_ids, accepted):
+                    results[index] = {
+                        "index": index,
+                        "status_code": status.HTTP_201_CREATED,
+                        "order_id": order_id,
+                        "total_amount": total_amount,
+                    }
+            stock.update(planned_stock)
+            return [results[index] for index, _ in chunk]
+
+        return [
+            {
+                "index": index,
+                "status_code": status.HTTP_409_CONFLICT,
+                "detail": "Stock changed concurrently; retry this order",
+            }
+            for index, _ in chunk
+        ]
+
+    @staticmethod
+    def _price_items(items, products: dict) -> Tuple[List[dict], Dict[int, int], Decimal]:
+        """Price order lines against a product lookup and total the stock they need."""
+        if not items:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No items provided")
 
-        for item in payload.items:
+        lines: List[dict] = []
+        requested: Dict[int, int] = defaultdict(int)
+        total_amount = Decimal("0.00")
+        for item in items:
             product = products.get(item.product_id)
             if not product or not product.is_active:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product {item.product_id} not found")
-            inventory = inventories.get(item.product_id)
-            available_qty = inventory.quantity if inventory else 0
-            if item.quantity > available_qty:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Insufficient stock for product {item.product_id}",
-                )
 
+            requested[item.product_id] += item.quantity
             line_total = Decimal(product.price) * item.quantity
             total_amount += line_total
-            order_items.append(
-                OrderItem(
-                    product_id=item.product_id,
-                    unit_price=product.price,
-                    quantity=item.quantity,
-                    line_total=line_total,
-                )
+            lines.append(
+                {
+                    "product_id": item.product_id,
+                    "unit_price": product.price,
+                    "quantity": item.quantity,
+                    "line_total": line_total,
+                }
             )
-
-        order = Order(created_by=created_by, total_amount=total_amount, items=[])
-        self.db.add(order)
-        self.db.flush()
-
-        for order_item in order_items:
-            order_item.order_id = order.id
-            self.db.add(order_item)
-            order.items.append(order_item)
-            inv = inventories.get(order_item.product_id)
-            if inv:
-                inv.quantity -= order_item.quantity
-            else:
-                # inventory record missing; treat as zero stock
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Inventory missing for product {order_item.product_id}",
-                )
-
-        self.db.commit()
-        self.db.refresh(order)
-        return order
+        return lines, requested, total_amount
 
     def get(self, order_id: int) -> Order | None:
         from sqlalchemy.orm import selectinload
@@ -84,26 +253,87 @@ class OrderService:
             .first()
         )
 
+    @read_only
     def list(
         self,
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
     ) -> List[Order]:
+        """Newest orders first. ``cursor`` is the (created_at, id) of the last order already
+        seen; paging by cursor walks ix_orders_created_at_id instead of skipping ``offset`` rows."""
         from sqlalchemy.orm import selectinload
 
-        query = self.db.query(Order).options(selectinload(Order.items)).order_by(Order.created_at.desc())
+        query = self.db.query(Order).options(selectinload(Order.items))
+        return self._page(query, from_date, to_date, limit, offset, cursor).all()
+
+    @read_only
+    def list_rows(
+        self,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[dict]:
+        """``list`` as plain dicts shaped like ``OrderRead``, read as column tuples without ORM objects."""
+        query = self.db.query(Order.id, Order.created_by, Order.total_amount, Order.created_at)
+        orders = [
+            {"id": order_id, "created_by": created_by, "total_amount": total, "created_at": created_at, "items": []}
+            for order_id, created_by, total, created_at in self._page(query, from_date, to_date, limit, offset, cursor)
+        ]
+        if not orders:
+            return orders
+        items_by_order = {order["id"]: order["items"] for order in orders}
+        items = (
+            self.db.query(
+                OrderItem.order_id,
+                OrderItem.id,
+                OrderItem.product_id,
+                OrderItem.unit_price,
+                OrderItem.quantity,
+                OrderItem.line_total,
+            )
+            .filter(OrderItem.order_id.in_(list(items_by_order)))
+            .order_by(OrderItem.id)
+        )
+        for order_id, item_id, product_id, unit_price, quantity, line_total in items:
+            items_by_order[order_id].append(
+                {
+                    "id": item_id,
+                    "product_id": product_id,
+                    "unit_price": unit_price,
+                    "quantity": quantity,
+                    "line_total": line_total,
+                }
+            )
+        return orders
+
+    @staticmethod
+    def _page(query, from_date, to_date, limit: int, offset: int, cursor):
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
         if from_date:
             query = query.filter(Order.created_at >= from_date)
         if to_date:
             query = query.filter(Order.created_at <= to_date)
-        return query.offset(offset).limit(limit).all()
+        if cursor:
+            query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(*cursor))
+        else:
+            query = query.offset(offset)
+        return query.limit(limit)
 
     def delete(self, order_id: int) -> bool:
         order = self.db.query(Order).filter(Order.id == order_id).first()
         if not order:
             return False
+        lines = [
+            {"product_id": item.product_id, "quantity": item.quantity, "line_total": item.line_total}
+            for item in order.items
+        ]
+        SalesRollupService(self.db).apply([(order.created_at, order.total_amount, lines)], sign=-1)
         self.db.delete(order)
         self.db.commit()
+        top_sellers.discard(order.created_at, [(line["product_id"], line["quantity"]) for line in lines])
         return True
@@ -0,0 +1,218 @@
+import csv
+import time
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.sql import dialect_insert
+from app.models.category import Category
+from app.models.inventory import Inventory
+from app.models.product import Product
+from app.services.catalog_service import CatalogService
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+IMPORT_REQUIRED_COLUMNS = ("sku", "name", "category", "price")
+
+MAX_PRICE = Decimal("99999999.99")  # Numeric(10, 2)
+MAX_QUANTITY = 2**31 - 1
+TRUE_VALUES = {"1", "true", "yes", "y"}
+FALSE_VALUES = {"0", "false", "no", "n"}
+
+
+class ProductImportService:
+    """Bulk product and stock import from CSV, for onboarding a whole catalog at once.
+
+    Columns: ``sku``, ``name``, ``category`` (by name), ``price`` and optionally
+    ``quantity`` (absolute stock) and ``is_active``. Rows are read as a stream and
+    upserted by SKU ``IMPORT_CHUNK_SIZE`` at a time with ``INSERT ... ON CONFLICT``, one
+    transaction and one catalog version per chunk, so a failure loses at most a chunk.
+    Invalid rows are skipped and reported by line number; the rest are imported.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def import_csv(self, lines: Iterable[str], create_categories: bool = False) -> dict:
+        started = time.perf_counter()
+        reader = csv.DictReader(lines)
+        report = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+        try:
+            columns = {name.strip().lower() for name in reader.fieldnames or ()}
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unreadable CSV: {exc}")
+        missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in columns]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Missing CSV columns: {', '.join(missing)}",
+            )
+
+        self._categories = {name.lower(): id_ for name, id_ in self.db.query(Category.name, Category.id)}
+        self._create_categories = create_categories
+        self._seen: Dict[str, int] = {}  # sku -> line it was taken from
+        chunk: List[Tuple[int, dict]] = []
+        try:
+            for record in reader:
+                report["rows"] += 1
+                # line in the file, the header being line 1
+                line = reader.line_num
+                record = {(key or "").strip().lower(): value for key, value in record.items()}
+                row, error = self._parse(record)
+                if error:
+                    self._fail(report, line, (record.get("sku") or "").strip() or None, error)
+                    continue
+                self._seen[row["sku"]] = line
+                chunk.append((line, row))
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    self._write(chunk, report)
+                    chunk = []
+        except (UnicodeDecodeError, csv.Error) as exc:
+            # rows read so far are still imported; the rest of the file is not
+            self._fail(report, reader.line_num + 1, None, f"Unreadable CSV, import stopped: {exc}")
+        if chunk:
+            self._write(chunk, report)
+
+        elapsed = time.perf_counter() - started
+        report["seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows"] / elapsed, 1) if elapsed > 0 else 0.0
+        return report
+
+    def _parse(self, record: dict) -> Tuple[dict | None, str | None]:
+        sku = (record.get("sku") or "").strip()
+        name = (record.get("name") or "").strip()
+        category = (record.get("category") or "").strip()
+        if not sku or len(sku) > 100:
+            return None, "sku is required (at most 100 characters)"
+        if not name or len(name) > 255:
+            return None, "name is required (at most 255 characters)"
+        if sku in self._seen:
+            return None, f"duplicate sku, already on line {self._seen[sku]}"
+        try:
+            price = Decimal((record.get("price") or "").strip())
+        except InvalidOperation:
+            return None, "price must be a number"
+        if not price.is_finite() or price < 0 or price > MAX_PRICE or price != price.quantize(Decimal("0.01")):
+            return None, "price must be between 0 and 99999999.99 with at most 2 decimals"
+        quantity = None
+        raw_quantity = (record.get("quantity") or "").strip()
+        if raw_quantity:
+            if not (raw_quantity.isascii() and raw_quantity.isdigit()) or int(raw_quantity) > MAX_QUANTITY:
+                return None, "quantity must be a whole number between 0 and 2147483647"
+            quantity = int(raw_quantity)
+        is_active = (record.get("is_active") or "").strip().lower()
+        if is_active and is_active not in TRUE_VALUES | FALSE_VALUES:
+            return None, "is_active must be true or false"
+        category_id = self._categories.get(category.lower())
+        if category_id is None:
+            if not category:
+                return None, "category is required"
+            if not self._create_categories:
+                return None, f"unknown category {category!r}"
+        return {
+            "sku": sku,
+            "name": name,
+            "category": category,
+            "price": price,
+            "is_active": is_active not in FALSE_VALUES,
+            "quantity": quantity,
+        }, None
+
+    def _write(self, chunk: List[Tuple[int, dict]], report: dict) -> None:
+        insert = dialect_insert(self.db)
+        categories = dict(self._categories)
+        try:
+            self._resolve_new_categories(chunk)
+            skus = [row["sku"] for _, row in chunk]
+            existing = set(self.db.scalars(select(Product.sku).where(Product.sku.in_(skus))))
+            version = CatalogService(self.db).next_version()
+            # one statement with a list of parameter sets: compiled once and cached, sent as
+            # multi-row VALUES batches by the driver layer (insertmanyvalues)
+            stmt = insert(Product.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.sku],
+                set_={
+                    "name": stmt.excluded.name,
+                    "category_id": stmt.excluded.category_id,
+                    "price": stmt.excluded.price,
+                    "is_active": stmt.excluded.is_active,
+                    "version": stmt.excluded.version,
+                },
+            ).returning(Product.sku, Product.id)
+            now = datetime.now(timezone.utc)
+            params = [
+                {
+                    "sku": row["sku"],
+                    "name": row["name"],
+                    "category_id": self._categories[row["category"].lower()],
+                    "price": row["price"],
+                    "is_active": row["is_active"],
+                    "created_at": now,
+                    "version": version,
+                }
+                for _, row in chunk
+            ]
+            ids = dict(self.db.execute(stmt, params).all())
+
+            # sorted so concurrent imports and checkouts lock stock rows in the same order
+            stock = sorted((ids[row["sku"]], row["quantity"]) for _, row in chunk if row["quantity"] is not None)
+            if stock:
+                stmt = insert(Inventory.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Inventory.product_id],
+                    set_={
+                        "quantity": stmt.excluded.quantity,
+                        "updated_at": stmt.excluded.updated_at,
+                        "version": stmt.excluded.version,
+                    },
+                )
+                self.db.execute(
+                    stmt,
+                    [
+                        {"product_id": product_id, "quantity": quantity, "updated_at": now, "version": version}
+                        for product_id, quantity in stock
+                    ],
+                )
+            self.db.commit()
+        except DBAPIError as exc:
+            self.db.rollback()
+            # categories created in the rolled back transaction are gone again
+            self._categories = categories
+            message = f"chunk rejected by the database: {exc.orig}"
+            for line, row in chunk:
+                del self._seen[row["sku"]]
+                self._fail(report, line, row["sku"], message)
+            return
+        report["updated"] += len(existing)
+        report["created"] += len(chunk) - len(existing)
+
+    def _resolve_new_categories(self, chunk: List[Tuple[int, dict]]) -> None:
+        names = {}
+        for _, row in chunk:
+            names.setdefault(row["category"].lower(), row["category"])
+        new = [name for key, name in names.items() if key not in self._categories]
+        if not new:
+            return
+        version = CatalogService(self.db).next_version()
+        stmt = dialect_insert(self.db)(Category).values([{"name": name, "version": version} for name in new])
+        created = self.db.execute(
+            stmt.on_conflict_do_nothing(index_elements=[Category.name]).returning(Category.name, Category.id)
+        ).all()
+        self._categories.update((name.lower(), category_id) for name, category_id in created)
+        # created meanwhile by someone else
+        missing = [name for name in new if name.lower() not in self._categories]
+        if missing:
+            self._categories.update(
+                (name.lower(), category_id)
+                for name, category_id in self.db.query(Category.name, Category.id).filter(Category.name.in_(missing))
+            )
+
+    def _fail(self, report: dict, line: int, sku: str | None, message: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < IMPORT_MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "sku": sku, "message": message})
@@ -0,0 +1,204 @@
+"""In-process product search over name and SKU.
+
+An inverted index maps character trigrams (and 1-2 character word prefixes) to
+product ids. A query looks up its rarest gram, then verifies each candidate against
+the product's normalised text, so postings only ever need to be a superset of the
+true matches. That lets updates go to a small overlay of sets while the bulk of the
+index stays in compact sorted arrays, rebuilt in memory once the overlay grows.
+
+The index follows the catalog version (see ``CatalogService``): every search first
+applies the products changed since the version it last saw, so writes made by any
+worker process show up on the next search.
+"""
+import heapq
+import logging
+import re
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.services.catalog_service import CatalogService
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# overlay postings are folded into the arrays once they reach this share of the catalog
+_COMPACT_RATIO = 0.1
+_COMPACT_MIN = 1000
+
+
+def normalize(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _grams(text: str) -> Set[str]:
+    grams: Set[str] = set()
+    for word in text.split():
+        grams.add("^" + word[:1])
+        if len(word) > 1:
+            grams.add("^" + word[:2])
+        grams.update(word[i : i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def _query_grams(token: str) -> Set[str]:
+    if len(token) < 3:
+        return {"^" + token}
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+class _Doc:
+    __slots__ = ("name", "sku", "category_id", "text")
+
+    def __init__(self, name: str, sku: str, category_id: int):
+        self.name = name
+        self.sku = normalize(sku).replace(" ", "")
+        self.category_id = category_id
+        # leading space so " " + token finds word prefixes with a plain substring test
+        self.text = " " + normalize(name) + " | " + normalize(sku)
+
+
+class ProductSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs: Dict[int, _Doc] = {}
+            self._postings: Dict[str, array] = {}
+            self._overlay: Dict[str, Set[int]] = defaultdict(set)
+            self._overlay_size = 0
+            self._version: Optional[int] = None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def sync(self, db: Session) -> None:
+        """Bring the index up to the database's current catalog version."""
+        version = CatalogService(db).current_version()
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            columns = (Product.id, Product.sku, Product.name, Product.category_id, Product.is_active)
+            if self._version is None or version < self._version:
+                rows = db.query(*columns).filter(Product.is_active.is_(True), Product.version <= version)
+                self._build(rows)
+            else:
+                rows = db.query(*columns).filter(Product.version > self._version, Product.version <= version)
+                for row in rows:
+                    if row.is_active:
+                        self._upsert(row.id, row.name, row.sku, row.category_id)
+                    else:
+                        self._docs.pop(row.id, None)
+                if self._overlay_size > max(_COMPACT_MIN, _COMPACT_RATIO * len(self._docs)):
+                    self._compact()
+            self._version = version
+
+    def search(
+        self, query: str, category_id: int | None = None, limit: int = 20, offset: int = 0
+    ) -> Tuple[int, List[int]]:
+        """Rank products whose name or SKU contains every query word.
+
+        Words shorter than three characters must start a word. Returns the total
+        number of matches and one page of product ids, best match first.
+        """
+        tokens = normalize(query).split()
+        if not tokens:
+            return 0, []
+        terms = [(" " + token, token if len(token) >= 3 else None) for token in tokens]
+        leading = " " + " ".join(tokens)
+        compact_query = "".join(tokens)
+        with self._lock:
+            docs = self._docs
+            scored = []
+            for product_id in self._candidates(tokens):
+                doc = docs.get(product_id)
+                if doc is None or (category_id and doc.category_id != category_id):
+                    continue
+                score = self._score(doc, terms, leading, compact_query)
+                if score:
+                    scored.append((-score, len(doc.name), product_id))
+        page = heapq.nsmallest(offset + limit, scored)[offset:]
+        return len(scored), [product_id for _, _, product_id in page]
+
+    def _candidates(self, tokens: List[str]) -> Iterable[int]:
+        best: Optional[Tuple[int, str]] = None
+        for token in tokens:
+            for gram in _query_grams(token):
+                size = len(self._postings.get(gram, ())) + len(self._overlay.get(gram, ()))
+                if size == 0:
+                    return ()
+                if best is None or size < best[0]:
+                    best = (size, gram)
+        gram = best[1]
+        overlay = self._overlay.get(gram)
+        if not overlay:
+            return self._postings.get(gram, ())
+        return set(self._postings.get(gram, ())) | overlay
+
+    @staticmethod
+    def _score(doc: _Doc, terms: List[Tuple[str, Optional[str]]], leading: str, compact_query: str) -> int:
+        """Word-prefix hits beat inner substrings; exact and leading SKU or name matches get a boost."""
+        score = 0
+        text = doc.text
+        for word_start, substring in terms:
+            if word_start in text:
+                score += 10
+            elif substring and substring in text:
+                score += 3
+            else:
+                return 0
+        if doc.sku == compact_query:
+            score += 100
+        elif doc.sku.startswith(compact_query):
+            score += 40
+        if text.startswith(leading):
+            score += 30
+        return score
+
+    def _upsert(self, product_id: int, name: str, sku: str, category_id: int) -> None:
+        doc = _Doc(name, sku, category_id)
+        self._docs[product_id] = doc
+        for gram in _grams(doc.text):
+            self._overlay[gram].add(product_id)
+            self._overlay_size += 1
+
+    def _build(self, rows) -> None:
+        self._docs = {}
+        for row in rows:
+            self._docs[row.id] = _Doc(row.name, row.sku, row.category_id)
+        self._compact()
+        logger.info("Product search index built with %d products", len(self._docs))
+
+    def _compact(self) -> None:
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for product_id in sorted(self._docs):
+            for gram in _grams(self._docs[product_id].text):
+                postings[gram].append(product_id)
+        self._postings = {gram: array("i", ids) for gram, ids in postings.items()}
+        self._overlay = defaultdict(set)
+        self._overlay_size = 0
+
+
+product_search_index = ProductSearchIndex()
+
+
+def warm_product_search_index(session_factory) -> None:
+    """Build the index at startup; on failure it is built by the first search instead."""
+    try:
+        with session_factory() as db:
+            product_search_index.sync(db)
+    except SQLAlchemyError:
+        logger.warning("Product search index not built at startup; will build on first search", exc_info=True)
@@ -1,8 +1,22 @@
+from decimal import Decimal
+from typing import List, NamedTuple
+
 from sqlalchemy.orm import Session
 
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 from app.models.inventory import Inventory
+from app.services.catalog_service import CatalogService
+from app.services.product_search import product_search_index
+
+
+class ProductSummary(NamedTuple):
+    """The product columns a till needs, as a plain tuple kept out of the session's identity map."""
+
+    id: int
+    sku: str
+    name: str
+    price: Decimal
 
 
 class ProductService:
@@ -10,13 +24,46 @@ class ProductService:
         self.db = db
 
     def list(self, query: str | None = None, category_id: int | None = None):
-        q = self.db.query(Product).filter(Product.is_active.is_(True))
+        return self._filter_listing(self.db.query(Product), query, category_id).all()
+
+    def list_rows(self, query: str | None = None, category_id: int | None = None) -> List[dict]:
+        """``list`` as plain dicts shaped like ``ProductRead``, read as column tuples without ORM objects."""
+        columns = (
+            Product.sku,
+            Product.name,
+            Product.category_id,
+            Product.price,
+            Product.is_active,
+            Product.id,
+            Product.created_at,
+        )
+        keys = [column.key for column in columns]
+        return [dict(zip(keys, row)) for row in self._filter_listing(self.db.query(*columns), query, category_id)]
+
+    def list_summaries(self, query: str | None = None, category_id: int | None = None) -> List[ProductSummary]:
+        """``list`` projected onto ``ProductSummary``: four columns per row and no ORM entities."""
+        columns = [getattr(Product, field) for field in ProductSummary._fields]
+        rows = self._filter_listing(self.db.query(*columns), query, category_id)
+        return [ProductSummary._make(row) for row in rows]
+
+    @staticmethod
+    def _filter_listing(q, query: str | None, category_id: int | None):
+        q = q.filter(Product.is_active.is_(True))
         if query:
             like = f"%{query}%"
             q = q.filter(Product.name.ilike(like))
         if category_id:
             q = q.filter(Product.category_id == category_id)
-        return q.order_by(Product.id).all()
+        return q.order_by(Product.id)
+
+    def search(self, query: str, category_id: int | None = None, limit: int = 20, offset: int = 0):
+        """Relevance-ranked match on name and SKU served by the in-memory index."""
+        product_search_index.sync(self.db)
+        total, ids = product_search_index.search(query, category_id=category_id, limit=limit, offset=offset)
+        if not ids:
+            return total, []
+        by_id = {p.id: p for p in self.db.query(Product).filter(Product.id.in_(ids))}
+        return total, [by_id[pid] for pid in ids if pid in by_id]
 
     def get(self, product_id: int) -> Product | None:
         return self.db.query(Product).filter(Product.id == product_id).first()
@@ -29,6 +76,7 @@ class ProductService:
             price=payload.price,
             is_active=payload.is_active,
         )
+        product.version = CatalogService(self.db).next_version()
         self.db.add(product)
         self.db.commit()
         self.db.refresh(product)
@@ -38,6 +86,8 @@ class ProductService:
         product = self.get(product_id)
         if not product:
             return None
+        # the counter before the row: a change made first would be flushed, and locked, by next_version
+        product.version = CatalogService(self.db).next_version()
         for field, value in payload.dict(exclude_unset=True).items():
             setattr(product, field, value)
         self.db.commit()
@@ -48,6 +98,7 @@ class ProductService:
         product = self.get(product_id)
         if not product:
             return False
+        product.version = CatalogService(self.db).next_version()
         product.is_active = False
         inv = self.db.query(Inventory).filter(Inventory.product_id == product_id).first()
         if inv:
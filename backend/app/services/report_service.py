@@ -1,46 +1,49 @@
-from datetime import date, datetime
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
-from typing import List
+from typing import Dict, List
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
 
+from app.db.routing import read_only
+from app.db.sql import time_bucket
+from app.models.daily_product_sales import DailyProductSales
+from app.models.daily_sales import DailySales
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.product import Product
-from app.schemas.report import DailyReport, TopProduct
+from app.schemas.report import DailyReport, RangeReport, ReportBucket, TopProduct, TopSeller, TopSellersReport
+from app.services.top_sellers import top_sellers
+
+TOP_PRODUCTS_LIMIT = 5
+# hourly buckets scan raw orders, so keep their ranges short
+MAX_HOURLY_RANGE_DAYS = 31
 
 
 class ReportService:
     def __init__(self, db: Session):
         self.db = db
 
+    @read_only
     def daily(self, target_date: date) -> DailyReport:
-        start = datetime.combine(target_date, datetime.min.time())
-        end = datetime.combine(target_date, datetime.max.time())
-
         order_stats = (
-            self.db.query(
-                func.count(Order.id).label("order_count"),
-                func.coalesce(func.sum(Order.total_amount), 0).label("total_amount"),
-            )
-            .filter(Order.created_at >= start, Order.created_at <= end)
-            .one()
+            self.db.query(DailySales.order_count, DailySales.total_amount)
+            .filter(DailySales.sales_date == target_date)
+            .first()
         )
 
         top_products_rows = (
             self.db.query(
-                OrderItem.product_id,
+                DailyProductSales.product_id,
                 Product.name,
-                func.coalesce(func.sum(OrderItem.quantity), 0).label("quantity"),
-                func.coalesce(func.sum(OrderItem.line_total), 0).label("total"),
+                DailyProductSales.quantity,
+                DailyProductSales.total_amount.label("total"),
             )
-            .join(Product, Product.id == OrderItem.product_id)
-            .join(Order, Order.id == OrderItem.order_id)
-            .filter(Order.created_at >= start, Order.created_at <= end)
-            .group_by(OrderItem.product_id, Product.name)
-            .order_by(func.sum(OrderItem.quantity).desc())
-            .limit(5)
+            .join(Product, Product.id == DailyProductSales.product_id)
+            .filter(DailyProductSales.sales_date == target_date, DailyProductSales.quantity > 0)
+            .order_by(DailyProductSales.quantity.desc(), DailyProductSales.product_id)
+            .limit(TOP_PRODUCTS_LIMIT)
             .all()
         )
 
@@ -56,7 +59,183 @@ class ReportService:
 
         return DailyReport(
             date=target_date.isoformat(),
-            order_count=order_stats.order_count or 0,
-            total_amount=Decimal(order_stats.total_amount or 0),
+            order_count=order_stats.order_count if order_stats else 0,
+            total_amount=Decimal(order_stats.total_amount if order_stats else 0),
             top_products=top_products,
         )
+
+    def top_sellers(self, window: str, limit: int = TOP_PRODUCTS_LIMIT) -> TopSellersReport:
+        """Best sellers by quantity over the last 15 minutes, hour or day, from the in-process leaderboard."""
+        # on the primary: a lagging replica would move the leaderboard's watermark past unseen orders
+        top_sellers.sync(self.db)
+        ranked = top_sellers.top(window, limit)
+        names = dict(self.db.query(Product.id, Product.name).filter(Product.id.in_([pid for pid, _ in ranked])))
+        return TopSellersReport(
+            window=window,
+            products=[
+                TopSeller(product_id=product_id, name=names.get(product_id, ""), quantity=quantity)
+                for product_id, quantity in ranked
+            ],
+        )
+
+    @read_only
+    def range_report(self, from_date: date, to_date: date, bucket: str = "day") -> RangeReport:
+        """Order count, revenue and top products for every ``bucket`` between two dates (inclusive).
+
+        Day, week and month buckets are read from the daily rollups; hourly buckets
+        group the raw orders. Either way it is one query for the totals and one for
+        the top products, however many buckets the range spans.
+        """
+        if bucket == "hour":
+            totals_rows, top_rows = self._hourly_rows(from_date, to_date)
+        elif bucket == "day":
+            totals_rows, top_rows = self._daily_rows(from_date, to_date)
+        else:
+            totals_rows, top_rows = self._calendar_rows(from_date, to_date, bucket)
+
+        totals = {_bucket_start(key): (count or 0, Decimal(amount or 0)) for key, count, amount in totals_rows}
+        top_products: Dict[datetime, List[TopProduct]] = defaultdict(list)
+        for row in top_rows:
+            ranked = top_products[_bucket_start(row.bucket)]
+            if len(ranked) < TOP_PRODUCTS_LIMIT:
+                ranked.append(
+                    TopProduct(product_id=row.product_id, name=row.name, quantity=row.quantity, total=Decimal(row.total))
+                )
+
+        buckets = []
+        for start in _bucket_starts(from_date, to_date, bucket):
+            order_count, total_amount = totals.get(start, (0, Decimal("0")))
+            buckets.append(
+                ReportBucket(
+                    start=start,
+                    order_count=order_count,
+                    total_amount=total_amount,
+                    top_products=top_products.get(start, []),
+                )
+            )
+        return RangeReport(from_date=from_date, to_date=to_date, bucket=bucket, buckets=buckets)
+
+    def _daily_rows(self, from_date: date, to_date: date):
+        in_range = DailySales.sales_date.between(from_date, to_date)
+        totals = self.db.execute(
+            select(DailySales.sales_date, DailySales.order_count, DailySales.total_amount).where(in_range)
+        ).all()
+
+        # Rank within each day by walking ix_daily_product_sales_ranking: find the day's
+        # TOP_PRODUCTS_LIMIT-th quantity, then read only the rows at or above it.
+        # Ties at the threshold can return a few extra rows; range_report trims them.
+        ranked = aliased(DailyProductSales)
+        threshold = (
+            select(ranked.quantity)
+            .where(ranked.sales_date == DailySales.sales_date, ranked.quantity > 0)
+            .order_by(ranked.quantity.desc(), ranked.product_id)
+            .offset(TOP_PRODUCTS_LIMIT - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        top = self.db.execute(
+            select(
+                DailySales.sales_date.label("bucket"),
+                DailyProductSales.product_id,
+                Product.name,
+                DailyProductSales.quantity,
+                DailyProductSales.total_amount.label("total"),
+            )
+            .join(DailyProductSales, DailyProductSales.sales_date == DailySales.sales_date)
+            .join(Product, Product.id == DailyProductSales.product_id)
+            .where(in_range, DailyProductSales.quantity >= func.coalesce(threshold, 1))
+            .order_by(DailySales.sales_date, DailyProductSales.quantity.desc(), DailyProductSales.product_id)
+        ).all()
+        return totals, top
+
+    def _calendar_rows(self, from_date: date, to_date: date, bucket: str):
+        totals_key = time_bucket(self.db, DailySales.sales_date, bucket)
+        totals = self.db.execute(
+            select(totals_key, func.sum(DailySales.order_count), func.sum(DailySales.total_amount))
+            .where(DailySales.sales_date.between(from_date, to_date))
+            .group_by(totals_key)
+        ).all()
+
+        products_key = time_bucket(self.db, DailyProductSales.sales_date, bucket)
+        quantity = func.sum(DailyProductSales.quantity)
+        product_sales = (
+            select(
+                products_key.label("bucket"),
+                DailyProductSales.product_id.label("product_id"),
+                quantity.label("quantity"),
+                func.sum(DailyProductSales.total_amount).label("total"),
+            )
+            .where(DailyProductSales.sales_date.between(from_date, to_date))
+            .group_by(products_key, DailyProductSales.product_id)
+            .having(quantity > 0)
+        )
+        return totals, self._top_ranked(product_sales, products_key, quantity, DailyProductSales.product_id)
+
+    def _hourly_rows(self, from_date: date, to_date: date):
+        start = datetime.combine(from_date, time.min, timezone.utc)
+        end = datetime.combine(to_date + timedelta(days=1), time.min, timezone.utc)
+        in_range = (Order.created_at >= start, Order.created_at < end)
+
+        totals_key = time_bucket(self.db, Order.created_at, "hour")
+        totals = self.db.execute(
+            select(totals_key, func.count(Order.id), func.sum(Order.total_amount)).where(*in_range).group_by(totals_key)
+        ).all()
+
+        products_key = time_bucket(self.db, Order.created_at, "hour")
+        quantity = func.sum(OrderItem.quantity)
+        product_sales = (
+            select(
+                products_key.label("bucket"),
+                OrderItem.product_id.label("product_id"),
+                quantity.label("quantity"),
+                func.sum(OrderItem.line_total).label("total"),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(*in_range)
+            .group_by(products_key, OrderItem.product_id)
+        )
+        return totals, self._top_ranked(product_sales, products_key, quantity, OrderItem.product_id)
+
+    def _top_ranked(self, product_sales, bucket_key, quantity, product_id):
+        """Keep the TOP_PRODUCTS_LIMIT best sellers of each bucket of a grouped product query."""
+        ranked = product_sales.add_columns(
+            func.row_number().over(partition_by=bucket_key, order_by=(quantity.desc(), product_id)).label("rank")
+        ).subquery()
+        return self.db.execute(
+            select(ranked.c.bucket, ranked.c.product_id, Product.name, ranked.c.quantity, ranked.c.total)
+            .join(Product, Product.id == ranked.c.product_id)
+            .where(ranked.c.rank <= TOP_PRODUCTS_LIMIT)
+            .order_by(ranked.c.bucket, ranked.c.rank)
+        ).all()
+
+
+def _bucket_start(value) -> datetime:
+    """Normalise a bucket key from either backend to an aware UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _bucket_starts(from_date: date, to_date: date, bucket: str) -> List[datetime]:
+    """Every bucket start touching the range, so empty buckets are reported as zeros."""
+    if bucket == "hour":
+        current = datetime.combine(from_date, time.min, timezone.utc)
+        end = datetime.combine(to_date + timedelta(days=1), time.min, timezone.utc)
+        return [current + timedelta(hours=h) for h in range(int((end - current).total_seconds() // 3600))]
+
+    if bucket == "week":
+        day = from_date - timedelta(days=from_date.weekday())
+    elif bucket == "month":
+        day = from_date.replace(day=1)
+    else:
+        day = from_date
+    starts = []
+    while day <= to_date:
+        starts.append(datetime.combine(day, time.min, timezone.utc))
+        if bucket == "month":
+            day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            day += timedelta(days=7 if bucket == "week" else 1)
+    return starts
@@ -0,0 +1,115 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.sql import dialect_insert, utc_date
+from app.models.daily_product_sales import DailyProductSales
+from app.models.daily_sales import DailySales
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+# (created_at, total_amount, [{"product_id", "quantity", "line_total"}, ...])
+OrderSales = Tuple[datetime, Decimal, Sequence[dict]]
+
+
+def sales_date(created_at: datetime) -> date:
+    """UTC calendar day an order is reported under (naive timestamps are taken as UTC)."""
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+class SalesRollupService:
+    """Maintains the ``daily_sales`` / ``daily_product_sales`` rollups.
+
+    ``apply`` never commits: it is called inside the order write transaction so the
+    rollups and the orders they summarise always change together.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, orders: Iterable[OrderSales], sign: int = 1) -> None:
+        days: Dict[date, list] = defaultdict(lambda: [0, Decimal("0")])
+        products: Dict[Tuple[date, int], list] = defaultdict(lambda: [0, Decimal("0")])
+        for created_at, total_amount, lines in orders:
+            day = sales_date(created_at)
+            days[day][0] += sign
+            days[day][1] += sign * Decimal(total_amount)
+            for line in lines:
+                key = (day, line["product_id"])
+                products[key][0] += sign * line["quantity"]
+                products[key][1] += sign * Decimal(line["line_total"])
+        if not days:
+            return
+
+        insert_stmt = dialect_insert(self.db)
+        # fixed (day, product_id) order keeps row locks ordered across concurrent checkouts
+        stmt = insert_stmt(DailySales).values(
+            [
+                {"sales_date": day, "order_count": count, "total_amount": amount}
+                for day, (count, amount) in sorted(days.items())
+            ]
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[DailySales.sales_date],
+                set_={
+                    "order_count": DailySales.order_count + stmt.excluded.order_count,
+                    "total_amount": DailySales.total_amount + stmt.excluded.total_amount,
+                },
+            )
+        )
+        if products:
+            stmt = insert_stmt(DailyProductSales).values(
+                [
+                    {"sales_date": day, "product_id": product_id, "quantity": quantity, "total_amount": amount}
+                    for (day, product_id), (quantity, amount) in sorted(products.items())
+                ]
+            )
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[DailyProductSales.sales_date, DailyProductSales.product_id],
+                    set_={
+                        "quantity": DailyProductSales.quantity + stmt.excluded.quantity,
+                        "total_amount": DailyProductSales.total_amount + stmt.excluded.total_amount,
+                    },
+                )
+            )
+
+    def rebuild(self, from_date: date | None = None, to_date: date | None = None) -> None:
+        """Recompute the rollups from ``orders``/``order_items`` for a date range (default: everything)."""
+        order_filters, day_filters, product_day_filters = [], [], []
+        if from_date:
+            order_filters.append(Order.created_at >= datetime.combine(from_date, time.min, timezone.utc))
+            day_filters.append(DailySales.sales_date >= from_date)
+            product_day_filters.append(DailyProductSales.sales_date >= from_date)
+        if to_date:
+            order_filters.append(Order.created_at < datetime.combine(to_date + timedelta(days=1), time.min, timezone.utc))
+            day_filters.append(DailySales.sales_date <= to_date)
+            product_day_filters.append(DailyProductSales.sales_date <= to_date)
+
+        self.db.execute(delete(DailyProductSales).where(*product_day_filters))
+        self.db.execute(delete(DailySales).where(*day_filters))
+
+        day = utc_date(self.db, Order.created_at)
+        self.db.execute(
+            insert(DailySales).from_select(
+                ["sales_date", "order_count", "total_amount"],
+                select(day, func.count(Order.id), func.sum(Order.total_amount)).where(*order_filters).group_by(day),
+            )
+        )
+        self.db.execute(
+            insert(DailyProductSales).from_select(
+                ["sales_date", "product_id", "quantity", "total_amount"],
+                select(day, OrderItem.product_id, func.sum(OrderItem.quantity), func.sum(OrderItem.line_total))
+                .join(Order, Order.id == OrderItem.order_id)
+                .where(*order_filters)
+                .group_by(day, OrderItem.product_id),
+            )
+        )
+        self.db.commit()
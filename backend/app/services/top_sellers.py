@@ -0,0 +1,265 @@
+"""Rolling best-seller leaderboards for the last 15 minutes, hour and day, kept in process.
+
+Sales are counted in slices: one-minute slices for the 15-minute and hour windows, hourly
+ones for the day, which therefore moves an hour at a time. Each window adds the quantities
+of new sales and subtracts whole slices as they fall out of it, and keeps its products in
+a stream summary: products grouped by quantity, with the distinct quantities sorted, so
+top-k walks the k best sellers instead of sorting. A window tracks at most ``capacity``
+products; past that the least-sold one is replaced as in (weighted) Space-Saving, the
+newcomer inheriting its count. Heavy hitters are kept, at the price of over-counting the
+products that replaced another.
+
+A slice also holds at most ``capacity`` products. One that fills up has already sold more
+products than its windows can track; a product new to it still counts in the windows but
+is never subtracted, so it stays over-counted until Space-Saving replaces it. Memory is
+bounded by the capacity: 84 slices (60 minutes and 24 hours) and 3 windows of at most
+``capacity`` products each.
+
+Like the search index, the leaderboard follows the database: ``sync`` reads the orders
+committed since the last ones it saw, by any worker process, and the first ``sync``
+builds it from the last day of order_items. Order ids do not commit in order (a batch
+chunk or a slow checkout commits after higher ids), so every id below the newest seen
+that has not been read yet is a gap, re-read by each ``sync`` until it shows up or has
+been missing for ``SYNC_GAP_SECONDS`` (rolled back, deleted, or older than a day).
+Orders created in this process are also recorded straight after their commit, so they
+count before the next ``sync``; either way ``_counted`` keeps an order from counting twice.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import Order
+from app.models.order_item import OrderItem
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = {"15m": 15 * 60, "1h": 60 * 60, "1d": 24 * 60 * 60}
+SLICE_SECONDS = {"15m": 60, "1h": 60, "1d": 60 * 60}
+# how long an unread id below the newest seen is re-read before it is given up on
+SYNC_GAP_SECONDS = 300
+# at the first build, unread ids this far below the newest are gaps too (a batch chunk)
+SYNC_BUILD_GAPS = 200
+
+# (product_id, quantity) of one order line
+Line = Tuple[int, int]
+
+
+def _seconds_of(created_at: datetime) -> int:
+    if created_at.tzinfo is None:
+        # SQLite hands back naive UTC timestamps
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return int(created_at.timestamp())
+
+
+class _Window:
+    def __init__(self, slice_seconds: int, slices: int, capacity: int):
+        self.slice_seconds = slice_seconds
+        self.slices = slices
+        self.capacity = capacity
+        # first slice still inside the window
+        self.start = 0
+        self.counts: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._levels: List[int] = []
+
+    def add(self, product_id: int, quantity: int) -> None:
+        count = self.counts.get(product_id)
+        if count is not None:
+            self._unlink(product_id, count)
+        elif len(self.counts) >= self.capacity:
+            count = self._levels[0]
+            evicted = min(self._members[count])
+            self._unlink(evicted, count)
+            del self.counts[evicted]
+        else:
+            count = 0
+        self._link(product_id, count + quantity)
+
+    def subtract(self, product_id: int, quantity: int) -> None:
+        count = self.counts.get(product_id)
+        if count is None:
+            return
+        self._unlink(product_id, count)
+        if count > quantity:
+            self._link(product_id, count - quantity)
+        else:
+            del self.counts[product_id]
+
+    def top(self, k: int) -> List[Line]:
+        ranked: List[Line] = []
+        for count in reversed(self._levels):
+            # ties by product id, like the SQL reports
+            for product_id in sorted(self._members[count]):
+                if len(ranked) == k:
+                    return ranked
+                ranked.append((product_id, count))
+        return ranked
+
+    def _link(self, product_id: int, count: int) -> None:
+        self.counts[product_id] = count
+        members = self._members.get(count)
+        if members is None:
+            members = self._members[count] = set()
+            insort(self._levels, count)
+        members.add(product_id)
+
+    def _unlink(self, product_id: int, count: int) -> None:
+        members = self._members[count]
+        members.discard(product_id)
+        if not members:
+            del self._members[count]
+            del self._levels[bisect_left(self._levels, count)]
+
+
+class TopSellers:
+    def __init__(self, capacity: int, clock: Callable[[], float] = time.time):
+        self._capacity = capacity
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows = {
+                name: _Window(SLICE_SECONDS[name], seconds // SLICE_SECONDS[name], self._capacity)
+                for name, seconds in WINDOWS.items()
+            }
+            # slice length -> slice -> product -> quantity; each length is kept for as many
+            # slices as its longest window covers
+            self._slices: Dict[int, Dict[int, Dict[int, int]]] = {}
+            self._spans: Dict[int, int] = {}
+            for window in self._windows.values():
+                self._slices[window.slice_seconds] = {}
+                self._spans[window.slice_seconds] = max(self._spans.get(window.slice_seconds, 0), window.slices)
+            # first slice kept, per length
+            self._oldest: Dict[int, int] = {}
+            self._now: Optional[int] = None
+            # newest order id read by ``sync``, None until the first one
+            self._seen: Optional[int] = None
+            # unread ids below ``_seen`` -> clock time they were first missed
+            self._gaps: Dict[int, float] = {}
+            # order id -> clock time counted, by ``sync`` or ``record``
+            self._counted: Dict[int, float] = {}
+            # bumped by every sync, so a slower concurrent one drops its stale read
+            self._syncs = 0
+
+    def record(self, order_id: int, created_at: datetime, lines: Iterable[Line]) -> None:
+        """Count a committed order now, rather than at the next ``sync``."""
+        with self._lock:
+            if self._seen is None or order_id in self._counted:
+                return
+            self._counted[order_id] = self._clock()
+            self._gaps.pop(order_id, None)
+            self._apply(_seconds_of(created_at), lines, 1)
+
+    def discard(self, created_at: datetime, lines: Iterable[Line]) -> None:
+        """Take a deleted order back out (in this process only)."""
+        with self._lock:
+            if self._seen is not None:
+                self._apply(_seconds_of(created_at), lines, -1)
+
+    def sync(self, db: Session) -> None:
+        """Count the orders committed since the last sync; builds the leaderboard the first time."""
+        with self._lock:
+            syncs, seen, gaps = self._syncs, self._seen, list(self._gaps)
+        since = datetime.fromtimestamp(self._clock(), timezone.utc) - timedelta(seconds=max(WINDOWS.values()))
+        query = (
+            db.query(Order.id, Order.created_at, OrderItem.product_id, OrderItem.quantity)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .filter(Order.created_at >= since)
+        )
+        if seen is not None:
+            query = query.filter(or_(Order.id > seen, Order.id.in_(gaps)) if gaps else Order.id > seen)
+        orders: Dict[int, Tuple[datetime, List[Line]]] = {}
+        for order_id, created_at, product_id, quantity in query:
+            orders.setdefault(order_id, (created_at, []))[1].append((product_id, quantity))
+        with self._lock:
+            if self._syncs != syncs:
+                # another sync got there first; it saw at least these orders
+                return
+            self._syncs += 1
+            now = self._clock()
+            for order_id, (created_at, lines) in orders.items():
+                self._gaps.pop(order_id, None)
+                if order_id not in self._counted:
+                    self._counted[order_id] = now
+                    self._apply(_seconds_of(created_at), lines, 1)
+            newest = max(orders, default=seen or 0)
+            if seen is None:
+                seen = max(0, newest - SYNC_BUILD_GAPS)
+            for order_id in range(seen + 1, newest):
+                if order_id not in orders and order_id not in self._counted:
+                    self._gaps[order_id] = now
+            self._seen = max(seen, newest)
+            expired = now - SYNC_GAP_SECONDS
+            self._gaps = {order_id: missed for order_id, missed in self._gaps.items() if missed > expired}
+            # read by sync long enough ago that a late ``record`` of it cannot come any more
+            self._counted = {
+                order_id: counted
+                for order_id, counted in self._counted.items()
+                if counted > expired or order_id > self._seen
+            }
+
+    def top(self, window: str, k: int) -> List[Line]:
+        """The ``k`` best-selling (product_id, quantity) pairs of ``window``, a key of ``WINDOWS``."""
+        with self._lock:
+            self._advance()
+            return self._windows[window].top(k)
+
+    def _advance(self) -> None:
+        now = int(self._clock())
+        tick = now // min(self._slices)
+        if tick == self._now:
+            return
+        self._now = tick
+        for window in self._windows.values():
+            slices = self._slices[window.slice_seconds]
+            start = now // window.slice_seconds - window.slices + 1
+            for slice_ in sorted(s for s in slices if window.start <= s < start):
+                for product_id, quantity in slices[slice_].items():
+                    if quantity > 0:
+                        window.subtract(product_id, quantity)
+            window.start = max(window.start, start)
+        for length, slices in self._slices.items():
+            oldest = self._oldest[length] = now // length - self._spans[length] + 1
+            for slice_ in [s for s in slices if s < oldest]:
+                del slices[slice_]
+
+    def _apply(self, seconds: int, lines: Iterable[Line], sign: int) -> None:
+        self._advance()
+        lines = list(lines)
+        for length, slices in self._slices.items():
+            slice_ = seconds // length
+            if slice_ < self._oldest[length]:
+                continue
+            counts = slices.setdefault(slice_, {})
+            for product_id, quantity in lines:
+                if product_id in counts or len(counts) < self._capacity:
+                    counts[product_id] = counts.get(product_id, 0) + sign * quantity
+        for window in self._windows.values():
+            if seconds // window.slice_seconds >= window.start:
+                for product_id, quantity in lines:
+                    if sign > 0:
+                        window.add(product_id, quantity)
+                    else:
+                        window.subtract(product_id, quantity)
+
+
+top_sellers = TopSellers(settings.top_sellers_capacity)
+
+
+def warm_top_sellers(session_factory: Callable[[], Session]) -> None:
+    """Build the leaderboard at startup; on failure the first request builds it instead."""
+    try:
+        with session_factory() as db:
+            top_sellers.sync(db)
+    except SQLAlchemyError:
+        logger.warning("Top sellers not built at startup; will build on first request", exc_info=True)
@@ -1,6 +1,7 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password
 from app.models.user import User
 from app.schemas.user import UserCreate
 
@@ -27,8 +28,12 @@ class UserService:
         self.db.refresh(user)
         return user
 
-    def authenticate(self, email: str, password: str) -> User | None:
-        user = self.get_user_by_email(email)
-        if not user or not verify_password(password, user.password_hash):
-            return None
-        return user
+    def update_password_hash(self, user_id: int, old_hash: str, new_hash: str) -> None:
+        """Store a rehashed password, unless the password changed since ``old_hash`` was read."""
+        self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
@@ -0,0 +1,43 @@
+"""Opaque keyset cursors for paginated listings."""
+import base64
+import json
+from datetime import datetime, timezone
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    if created_at.tzinfo is None:
+        # SQLite hands back naive UTC timestamps
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_int_cursor(*key: int) -> str:
+    """A cursor for listings ordered by integer columns, e.g. (shortfall, product_id)."""
+    return _encode(list(key))
+
+
+def decode_int_cursor(cursor: str, size: int) -> tuple[int, ...]:
+    try:
+        key = _decode(cursor)
+        if not isinstance(key, list) or len(key) != size:
+            raise ValueError("Invalid cursor")
+        return tuple(int(value) for value in key)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _encode(key: list) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str):
+    return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
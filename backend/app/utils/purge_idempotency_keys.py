@@ -0,0 +1,18 @@
+"""
+Delete expired Idempotency-Key records (run from cron; expired keys are ignored anyway).
+
+Usage:
+    python -m app.utils.purge_idempotency_keys
+"""
+from app.db.session import SessionLocal
+from app.services.idempotency_service import IdempotencyService
+
+
+def main():
+    with SessionLocal() as session:
+        deleted = IdempotencyService(session).purge_expired()
+    print(f"Deleted {deleted} expired idempotency keys.")
+
+
+if __name__ == "__main__":
+    main()
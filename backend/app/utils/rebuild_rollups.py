@@ -0,0 +1,26 @@
+"""
+Rebuild the daily sales rollups from orders (backfill or repair).
+
+Usage:
+    python -m app.utils.rebuild_rollups [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+import argparse
+from datetime import date
+
+from app.db.session import SessionLocal
+from app.services.sales_rollup_service import SalesRollupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily_sales and daily_product_sales")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        SalesRollupService(session).rebuild(args.from_date, args.to_date)
+    print("Sales rollups rebuilt.")
+
+
+if __name__ == "__main__":
+    main()
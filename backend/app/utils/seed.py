@@ -1,20 +1,62 @@
 """
-Seed initial data for local development.
+Seed initial data for local development, optionally with a large synthetic sales history.
 
 Usage:
     python -m app.utils.seed
+    python -m app.utils.seed --products 50000 --orders 3000000 --days 365 [--seed 1] [--end YYYY-MM-DD]
+
+The synthetic data is appended to whatever is already there and is identical for the
+same ``--seed`` and ``--end`` on an empty database: product popularity is Zipfian,
+orders cluster around lunch and evening peaks and weekends, and the rows go in with
+COPY on PostgreSQL or multi-row INSERTs elsewhere. Rollups are rebuilt at the end.
 """
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from itertools import accumulate
+from typing import Dict, Iterator, List, Sequence, Tuple
 
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.core.security import hash_password
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, engine as default_engine
 from app.models.category import Category
 from app.models.inventory import Inventory
+from app.models.order import Order
+from app.models.order_item import OrderItem
 from app.models.product import Product
 from app.models.user import User
+from app.services.catalog_service import CatalogService
+from app.services.sales_rollup_service import SalesRollupService
+
+# share of orders by UTC hour of day: quiet nights, a lunch peak and a longer evening one
+HOURLY_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 7, 9, 8, 8, 12, 16, 14, 9, 8, 10, 14, 16, 13, 9, 6, 3, 2)
+# Monday .. Sunday
+WEEKDAY_WEIGHTS = (10, 10, 10, 11, 13, 15, 12)
+# order lines 1..8 (mean about 2.9) and units per line
+BASKET_WEIGHTS = (30, 22, 16, 11, 8, 6, 4, 3)
+QUANTITY_WEIGHTS = (70, 20, 7, 3)
+ZIPF_EXPONENT = 1.1
+# the random stream is drawn a chunk at a time, so the chunk size is part of the seed
+CHUNK_ORDERS = 20_000
+
+CATALOG = {
+    "Beverages": ("Cola", "Sparkling Water", "Iced Tea", "Orange Juice", "Cold Brew", "Lemonade"),
+    "Snacks": ("Potato Chips", "Pretzels", "Trail Mix", "Granola Bar", "Popcorn", "Crackers"),
+    "Essentials": ("Milk", "Bread", "Eggs", "Butter", "Rice", "Pasta"),
+    "Produce": ("Bananas", "Apples", "Tomatoes", "Avocados", "Spinach", "Onions"),
+    "Frozen": ("Pizza", "Ice Cream", "Peas", "Dumplings", "Waffles", "Berries"),
+    "Household": ("Dish Soap", "Paper Towels", "Trash Bags", "Sponges", "Detergent", "Foil"),
+    "Personal Care": ("Toothpaste", "Shampoo", "Soap Bar", "Deodorant", "Razors", "Lotion"),
+}
+BRANDS = ("Acme", "Northwind", "Bluebird", "Harvest", "Summit", "Cedar", "Golden", "Riverside")
+SIZES = ("Small", "Regular", "Large", "Family Size", "Twin Pack", "Value Pack")
 
 
 def seed(db: Session):
@@ -81,6 +123,208 @@ def seed(db: Session):
     print("Seed data applied.")
 
 
-if __name__ == "__main__":
+def _zipf_cum_weights(count: int, exponent: float) -> List[float]:
+    return list(accumulate(1.0 / rank**exponent for rank in range(1, count + 1)))
+
+
+def _hour_slots(start: datetime, days: int) -> List[float]:
+    """Cumulative weights of every hour from ``start``, for ``random.choices``."""
+    weights = []
+    for day in range(days):
+        weekday = WEEKDAY_WEIGHTS[(start + timedelta(days=day)).weekday()]
+        weights.extend(weekday * hour for hour in HOURLY_WEIGHTS)
+    return list(accumulate(weights))
+
+
+def _write(conn: Connection, table: Table, columns: Sequence[str], rows: List[tuple]) -> None:
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _categories(db: Session) -> Dict[str, int]:
+    ids = dict(db.query(Category.name, Category.id).filter(Category.name.in_(list(CATALOG))).all())
+    for name in CATALOG:
+        if name not in ids:
+            category = Category(name=name, is_active=True)
+            db.add(category)
+            db.flush()
+            ids[name] = category.id
+    return ids
+
+
+def _orders(
+    rng: random.Random,
+    products: Sequence[Tuple[int, Decimal]],
+    orders: int,
+    start: datetime,
+    days: int,
+    created_by: int,
+    next_order_id: int,
+    next_item_id: int,
+) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+    """Yield (order rows, item rows) a chunk at a time."""
+    # popularity rank is independent of product id
+    by_popularity = list(products)
+    rng.shuffle(by_popularity)
+    product_weights = _zipf_cum_weights(len(by_popularity), ZIPF_EXPONENT)
+    slot_weights = _hour_slots(start, days)
+    slots = range(len(slot_weights))
+    basket_weights = list(accumulate(BASKET_WEIGHTS))
+    quantity_weights = list(accumulate(QUANTITY_WEIGHTS))
+    baskets = range(1, len(BASKET_WEIGHTS) + 1)
+    quantities = range(1, len(QUANTITY_WEIGHTS) + 1)
+
+    order_id, item_id = next_order_id, next_item_id
+    for offset in range(0, orders, CHUNK_ORDERS):
+        count = min(CHUNK_ORDERS, orders - offset)
+        sizes = rng.choices(baskets, cum_weights=basket_weights, k=count)
+        hours = rng.choices(slots, cum_weights=slot_weights, k=count)
+        seconds = [rng.randrange(3600) for _ in range(count)]
+        lines = sum(sizes)
+        picks = iter(rng.choices(by_popularity, cum_weights=product_weights, k=lines))
+        units = iter(rng.choices(quantities, cum_weights=quantity_weights, k=lines))
+
+        order_rows, item_rows = [], []
+        for size, hour, second in zip(sizes, hours, seconds):
+            basket: Dict[int, list] = {}
+            for _ in range(size):
+                product_id, price = next(picks)
+                quantity = next(units)
+                if product_id in basket:
+                    basket[product_id][1] += quantity
+                else:
+                    basket[product_id] = [price, quantity]
+            total = Decimal("0")
+            for product_id, (price, quantity) in basket.items():
+                line_total = price * quantity
+                total += line_total
+                item_rows.append((item_id, order_id, product_id, price, quantity, line_total))
+                item_id += 1
+            created_at = start + timedelta(seconds=hour * 3600 + second)
+            order_rows.append((order_id, created_by, total, created_at))
+            order_id += 1
+        yield order_rows, item_rows
+
+
+def generate(
+    engine: Engine,
+    products: int,
+    orders: int,
+    days: int,
+    seed: int = 1,
+    end: date | None = None,
+) -> Dict[str, int]:
+    """Append ``products`` stocked products and ``orders`` orders over the ``days`` days before ``end``.
+
+    Orders are attributed to the first cashier (run ``seed`` first). Returns row counts.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now(timezone.utc).date()
+    start = datetime.combine(end - timedelta(days=days), datetime.min.time(), tzinfo=timezone.utc)
+
+    with Session(engine) as db:
+        created_by = (
+            db.query(User.id).filter(User.role == "cashier").order_by(User.id).limit(1).scalar()
+            or db.query(User.id).order_by(User.id).limit(1).scalar()
+        )
+        if created_by is None:
+            raise RuntimeError("No users to attribute orders to; run the plain seed first")
+        category_ids = _categories(db)
+        # one catalog version for the whole batch, so terminals pick it up in a single delta
+        version = CatalogService(db).next_version()
+        db.commit()
+
+    catalog: List[Tuple[int, Decimal]] = []
+    if products:
+        with engine.begin() as conn:
+            next_product_id = _next_id(conn, Product.id)
+            product_rows, inventory_rows = [], []
+            names = list(CATALOG.items())
+            for i in range(products):
+                product_id = next_product_id + i
+                category, nouns = names[i % len(names)]
+                name = f"{rng.choice(BRANDS)} {rng.choice(nouns)} {rng.choice(SIZES)}"
+                price = Decimal(rng.randrange(49, 5000)) / 100
+                product_rows.append(
+                    (product_id, f"GEN-{product_id:07d}", name, category_ids[category], price, True, start, version)
+                )
+                inventory_rows.append((product_id, rng.randrange(0, 500), start, version))
+                catalog.append((product_id, price))
+            _write(
+                conn,
+                Product.__table__,
+                ("id", "sku", "name", "category_id", "price", "is_active", "created_at", "version"),
+                product_rows,
+            )
+            _write(conn, Inventory.__table__, ("product_id", "quantity", "updated_at", "version"), inventory_rows)
+    else:
+        with engine.connect() as conn:
+            catalog = [tuple(row) for row in conn.execute(select(Product.id, Product.price).order_by(Product.id))]
+    if orders and not catalog:
+        raise RuntimeError("No products to sell; pass --products")
+
+    items = 0
+    with engine.connect() as conn:
+        next_order_id, next_item_id = _next_id(conn, Order.id), _next_id(conn, OrderItem.id)
+    chunks = _orders(rng, catalog, orders, start, days, created_by, next_order_id, next_item_id)
+    for order_rows, item_rows in chunks:
+        with engine.begin() as conn:
+            _write(conn, Order.__table__, ("id", "created_by", "total_amount", "created_at"), order_rows)
+            _write(
+                conn,
+                OrderItem.__table__,
+                ("id", "order_id", "product_id", "unit_price", "quantity", "line_total"),
+                item_rows,
+            )
+        items += len(item_rows)
+
+    if engine.dialect.name == "postgresql":
+        # COPY with explicit ids leaves the serial sequences behind
+        with engine.begin() as conn:
+            for table in ("products", "orders", "order_items"):
+                conn.execute(
+                    text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+                )
+    with Session(engine) as db:
+        SalesRollupService(db).rebuild()
+    return {"products": products, "orders": orders, "order_items": items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed dev data, optionally with synthetic sales history")
+    parser.add_argument("--products", type=int, default=0, help="synthetic products to add")
+    parser.add_argument("--orders", type=int, default=0, help="synthetic orders to add")
+    parser.add_argument("--days", type=int, default=90, help="days of history the orders span")
+    parser.add_argument("--seed", type=int, default=1, help="random seed; same seed, same data")
+    parser.add_argument(
+        "--end", type=date.fromisoformat, default=None, help="day after the last order (default: today, UTC)"
+    )
+    args = parser.parse_args()
+
     with SessionLocal() as session:
         seed(session)
+    if args.products or args.orders:
+        started = time.perf_counter()
+        counts = generate(default_engine, args.products, args.orders, args.days, seed=args.seed, end=args.end)
+        elapsed = time.perf_counter() - started
+        print(
+            f"Generated {counts['products']} products, {counts['orders']} orders and "
+            f"{counts['order_items']} order items in {elapsed:.0f}s "
+            f"({counts['order_items'] / max(elapsed, 1e-9):.0f} items/s)."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Throughput and latency under concurrent requests with handlers on an AsyncSession
+(DB_ASYNC=true) versus a sync Session in the Starlette threadpool (DB_ASYNC=false).
+
+Requests go through the real app in process, on one event loop. ``--latency-ms``
+waits before every statement to stand in for the network round trip to a database
+server: on the sync path that wait holds a threadpool slot (40 by default), on the
+async path it yields to the event loop.
+
+Usage:
+    python -m benchmarks.async_concurrency --concurrency 1 50 200 --requests 400 --latency-ms 2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
+from app.core import deps
+from app.core.config import settings
+from app.db.session import async_database_url
+from benchmarks.common import (
+    add_database_argument,
+    make_engine,
+    percentile,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+
+def order_request(product_ids):
+    return "POST", "/api/orders", {"items": [{"product_id": random.choice(product_ids), "quantity": 1}]}
+
+
+SCENARIOS = {
+    "list orders": lambda product_ids: ("GET", "/api/orders?limit=20", None),
+    "create order": order_request,
+}
+
+
+def add_latency(sync_engine, latency_ms: float, is_async: bool) -> None:
+    if latency_ms <= 0:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _round_trip(conn, cursor, statement, parameters, context, executemany):
+        if is_async:
+            # this hook runs in the session's greenlet on the event loop: yield to the
+            # loop like an asyncpg round trip would
+            await_only(asyncio.sleep(latency_ms / 1000))
+        else:
+            time.sleep(latency_ms / 1000)
+
+
+def use_database(url: str, mode: str, pool_size: int, latency_ms: float):
+    """Point deps.get_db_session at ``url`` in the given mode; returns the engine to dispose."""
+    sqlite = url.startswith("sqlite")
+    settings.db_async = mode == "async"
+    if settings.db_async:
+        engine = create_async_engine(
+            async_database_url(url),
+            # aiosqlite defaults to NullPool; pool both paths the same way
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=0,
+            connect_args={"timeout": 30} if sqlite else {},
+        )
+        add_latency(engine.sync_engine, latency_ms, is_async=True)
+        deps.AsyncSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        return engine
+    engine = create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={"timeout": 30, "check_same_thread": False} if sqlite else {},
+        future=True,
+    )
+    add_latency(engine, latency_ms, is_async=False)
+    deps.SessionLocal = session_factory(engine)
+    return engine
+
+
+async def run_level(client, headers, scenario, product_ids, concurrency: int, requests: int):
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            method, path, body = scenario(product_ids)
+            started = time.perf_counter()
+            res = await client.request(method, path, json=body, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            res.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started), latencies
+
+
+async def run_mode(url, mode, args, product_ids):
+    from app.main import app
+
+    engine = use_database(url, mode, args.pool_size, args.latency_ms)
+    deps.clear_auth_cache()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            res = await client.post("/api/auth/login", json={"email": "cashier@bench.dev", "password": "cashierpass"})
+            headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+            for name, scenario in SCENARIOS.items():
+                for concurrency in args.concurrency:
+                    rate, latencies = await run_level(
+                        client, headers, scenario, product_ids, concurrency, args.requests
+                    )
+                    print(
+                        f"{mode:<6}{name:<14}{concurrency:>6}{rate:>10.0f}"
+                        f"{percentile(latencies, 50):>10.1f}ms{percentile(latencies, 99):>10.1f}ms"
+                    )
+    finally:
+        if mode == "async":
+            await engine.dispose()
+        else:
+            engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario and concurrency level")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="simulated round trip per statement")
+    parser.add_argument("--pool-size", type=int, default=50)
+    args = parser.parse_args()
+
+    seed_engine = make_engine(args.database_url)
+    reset_schema(seed_engine)
+    seeded = seed_catalog(session_factory(seed_engine), products=200, stock=1_000_000)
+    seed_orders(seed_engine, seeded, orders=5000, days=30)
+    url = seed_engine.url.render_as_string(hide_password=False)
+    seed_engine.dispose()
+
+    print(f"backend={seed_engine.dialect.name} latency={args.latency_ms}ms/statement pool={args.pool_size}")
+    print(f"{'mode':<6}{'scenario':<14}{'conc':>6}{'req/s':>10}{'p50':>12}{'p99':>12}")
+    for mode in ("sync", "async"):
+        asyncio.run(run_mode(url, mode, args, seeded["product_ids"]))
+
+
+if __name__ == "__main__":
+    main()
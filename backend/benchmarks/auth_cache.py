@@ -0,0 +1,54 @@
+"""
+Authenticated request throughput with and without the token/user cache in
+app.core.deps.
+
+Usage:
+    python -m benchmarks.auth_cache --requests 5000
+"""
+import argparse
+import time
+
+from app.core import deps
+from app.core.config import settings
+from benchmarks.common import (
+    add_database_argument,
+    api_client,
+    auth_headers,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    session_factory,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--path", default="/api/auth/me")
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    seed_catalog(session_factory(engine), products=10, stock=10)
+
+    print(f"backend={engine.dialect.name} requests={args.requests} path={args.path}")
+    with api_client(engine) as client:
+        headers = auth_headers(client, "cashier@bench.dev", "cashierpass")
+        for label, max_entries in (("cache off", 0), ("cache on ", settings.auth_cache_max_entries)):
+            deps.configure_auth_cache(max_entries, settings.auth_cache_ttl_seconds)
+            client.get(args.path, headers=headers).raise_for_status()
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                client.get(args.path, headers=headers).raise_for_status()
+            elapsed = time.perf_counter() - started
+            stats = deps.auth_cache_stats()
+            print(
+                f"{label}: {args.requests / elapsed:8.0f} req/s  "
+                f"user hits/misses={stats['users']['hits']}/{stats['users']['misses']}"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Shared helpers for backend benchmarks.
+
+Benchmarks drop and recreate the schema of the database they are pointed at, so
+only use ``--database-url`` with a scratch database. Without it a temporary
+SQLite file is used.
+"""
+import argparse
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import deps
+from app.core.config import settings
+from app.core.security import hash_password
+from app.db.base import Base
+from app.models import Category, Inventory, Order, OrderItem, Product, User
+
+
+def add_database_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="SQLAlchemy URL of a scratch database (default: temporary SQLite file)",
+    )
+
+
+def make_engine(database_url: str | None, pool_size: int = 5) -> Engine:
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(prefix="pos-bench-"), "bench.db")
+        database_url = f"sqlite+pysqlite:///{path}"
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False, "timeout": 30},
+            future=True,
+        )
+    return create_engine(database_url, pool_size=pool_size, max_overflow=pool_size, future=True)
+
+
+def reset_schema(engine: Engine) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+
+def seed_catalog(SessionFactory: sessionmaker, products: int, stock: int) -> Dict[str, object]:
+    """Create an admin, a cashier, one category and ``products`` stocked products."""
+    with SessionFactory() as db:
+        admin = User(email="admin@bench.dev", role="admin", password_hash=hash_password("adminpass"), is_active=True)
+        cashier = User(
+            email="cashier@bench.dev", role="cashier", password_hash=hash_password("cashierpass"), is_active=True
+        )
+        category = Category(name="Bench", is_active=True)
+        db.add_all([admin, cashier, category])
+        db.flush()
+        catalog = [
+            Product(sku=f"BENCH-{i:06d}", name=f"Bench product {i}", category_id=category.id, price=Decimal("1.99"))
+            for i in range(products)
+        ]
+        db.add_all(catalog)
+        db.flush()
+        db.add_all([Inventory(product_id=p.id, quantity=stock) for p in catalog])
+        db.commit()
+        return {"admin_id": admin.id, "cashier_id": cashier.id, "product_ids": [p.id for p in catalog]}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@contextmanager
+def api_client(engine: Engine) -> Iterator[TestClient]:
+    """In-process client for the real app, with every request on its own session."""
+    from app.main import app
+
+    SessionFactory = session_factory(engine)
+    # startup would build the search index and leaderboard from the configured database, not ``engine``
+    settings.search_index_warm_on_startup = False
+    settings.top_sellers_warm_on_startup = False
+
+    def override_get_db():
+        with SessionFactory() as db:
+            yield db
+
+    app.dependency_overrides[deps.get_db_session] = override_get_db
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides = {}
+
+
+def auth_headers(client: TestClient, email: str, password: str) -> Dict[str, str]:
+    res = client.post("/api/auth/login", json={"email": email, "password": password})
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def seed_orders(
+    engine: Engine,
+    seeded: Dict[str, object],
+    orders: int,
+    days: int,
+    seed: int = 1,
+    chunk_size: int = 20_000,
+) -> int:
+    """Bulk insert ``orders`` synthetic orders spread evenly over the last ``days`` days.
+
+    Bypasses the services (no stock checks, no rollups); rebuild the rollups afterwards
+    if a benchmark reads them. Returns the number of order items inserted.
+    """
+    rng = random.Random(seed)
+    product_ids = seeded["product_ids"]
+    price = Decimal("1.99")
+    end = datetime.now(timezone.utc)
+    span = days * 86400
+    with engine.begin() as conn:
+        next_order_id = (conn.execute(select(func.max(Order.id))).scalar() or 0) + 1
+        next_item_id = (conn.execute(select(func.max(OrderItem.id))).scalar() or 0) + 1
+    items_inserted = 0
+    for offset in range(0, orders, chunk_size):
+        order_rows, item_rows = [], []
+        for order_id in range(next_order_id + offset, next_order_id + min(offset + chunk_size, orders)):
+            created_at = end - timedelta(seconds=rng.randrange(span))
+            total = Decimal("0")
+            for product_id in rng.sample(product_ids, rng.randint(1, 4)):
+                quantity = rng.randint(1, 3)
+                line_total = price * quantity
+                total += line_total
+                item_rows.append(
+                    {
+                        "id": next_item_id + items_inserted + len(item_rows),
+                        "order_id": order_id,
+                        "product_id": product_id,
+                        "unit_price": price,
+                        "quantity": quantity,
+                        "line_total": line_total,
+                    }
+                )
+            order_rows.append(
+                {"id": order_id, "created_by": seeded["cashier_id"], "total_amount": total, "created_at": created_at}
+            )
+        with engine.begin() as conn:
+            conn.execute(Order.__table__.insert(), order_rows)
+            conn.execute(OrderItem.__table__.insert(), item_rows)
+        items_inserted += len(item_rows)
+    return items_inserted
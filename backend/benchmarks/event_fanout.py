@@ -0,0 +1,80 @@
+"""
+Fan-out of the SSE event bus: a publisher thread (like a service call in the threadpool)
+sends events to many subscribers on the event loop, some of which never read. Reports
+publish cost, delivery latency and how many stalled subscribers were dropped.
+
+Usage:
+    python -m benchmarks.event_fanout --subscribers 1000 --events 2000 --stalled 50
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from app.services.event_bus import EventBus
+from benchmarks.common import percentile
+
+
+async def run(subscribers: int, stalled: int, events: int, queue_size: int, rate: float) -> None:
+    bus = EventBus()
+    latencies = []
+
+    async def consume(subscription) -> None:
+        while True:
+            frame = await subscription.queue.get()
+            if frame is None:
+                return
+            latencies.append(time.perf_counter() - float(frame.rsplit(":", 1)[1].rstrip("}\n")))
+
+    readers = [asyncio.create_task(consume(bus.subscribe(queue_size))) for _ in range(subscribers - stalled)]
+    idle = [bus.subscribe(queue_size) for _ in range(stalled)]
+
+    publish_seconds = []
+
+    def publisher() -> None:
+        for _ in range(events):
+            started = time.perf_counter()
+            bus.publish("order.created", {"sent": started})
+            publish_seconds.append(time.perf_counter() - started)
+            time.sleep(1 / rate)
+
+    thread = threading.Thread(target=publisher)
+    started = time.perf_counter()
+    thread.start()
+    while thread.is_alive():
+        await asyncio.sleep(0.01)
+    while len(latencies) < events * len(readers):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    for reader in readers:
+        reader.cancel()
+
+    empty = EventBus()
+    started = time.perf_counter()
+    for _ in range(events):
+        empty.publish("order.created", {"sent": 0.0})
+    no_subscribers_us = (time.perf_counter() - started) / events * 1e6
+
+    print(f"subscribers={subscribers} stalled={stalled} events={events} queue={queue_size} rate={rate:.0f}/s")
+    print(f"publish, no subscribers      {no_subscribers_us:9.2f} us")
+    print(f"publish p50 / p99            {percentile(publish_seconds, 50) * 1e6:9.1f} / "
+          f"{percentile(publish_seconds, 99) * 1e6:.1f} us")
+    print(f"delivery latency p50 / p99   {percentile(latencies, 50) * 1000:9.2f} / "
+          f"{percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"deliveries                   {len(latencies):9d} in {elapsed:.2f} s")
+    print(f"stalled subscribers dropped  {sum(subscription.dropped for subscription in idle):9d} / {stalled}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--stalled", type=int, default=50)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--rate", type=float, default=100.0, help="events published per second")
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.stalled, args.events, args.queue_size, args.rate))
+
+
+if __name__ == "__main__":
+    main()
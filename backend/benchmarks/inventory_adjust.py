@@ -0,0 +1,56 @@
+"""
+Receiving a delivery: one bulk InventoryService.adjust versus one
+upsert_quantity (PATCH /api/inventory/{id}) per delivery line.
+
+Usage:
+    python -m benchmarks.inventory_adjust --lines 300 --rounds 20
+"""
+import argparse
+import time
+
+from app.schemas.inventory import InventoryUpdate
+from app.services.inventory_service import InventoryService
+from benchmarks.common import add_database_argument, make_engine, reset_schema, seed_catalog, session_factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    product_ids = seed_catalog(SessionFactory, products=args.products, stock=100)["product_ids"]
+
+    def delivery(round_: int):
+        start = round_ * args.lines % (len(product_ids) - args.lines)
+        return product_ids[start : start + args.lines]
+
+    started = time.perf_counter()
+    for round_ in range(args.rounds):
+        with SessionFactory() as db:
+            InventoryService(db).adjust({product_id: 24 for product_id in delivery(round_)})
+    bulk = (time.perf_counter() - started) / args.rounds
+
+    started = time.perf_counter()
+    for round_ in range(args.rounds):
+        with SessionFactory() as db:
+            service = InventoryService(db)
+            for product_id in delivery(round_):
+                # the old flow: read the quantity, then set the new absolute value
+                quantity = service.get(product_id).quantity
+                service.upsert_quantity(product_id, InventoryUpdate(quantity=quantity + 24))
+    per_line = (time.perf_counter() - started) / args.rounds
+
+    print(f"backend={engine.dialect.name} lines={args.lines}")
+    print(f"bulk adjust      {bulk * 1000:9.1f} ms per delivery")
+    print(f"upsert per line  {per_line * 1000:9.1f} ms per delivery ({per_line / bulk:.0f}x)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Cost per 1,000 orders of GET /api/orders: ORM objects validated through
+``OrderRead`` and the default JSON encoder, versus the fast path
+(FAST_LIST_RESPONSES=true) of column tuples, plain dicts and orjson.
+
+Reports the service call and the serialization separately, plus the whole
+request through the app (pages of 100).
+
+Usage:
+    python -m benchmarks.list_serialization --orders 20000 --rounds 20
+"""
+import argparse
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.schemas.order import OrderRead
+from app.services.order_service import OrderService
+from benchmarks.common import (
+    add_database_argument,
+    api_client,
+    auth_headers,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+ORDERS = TypeAdapter(list[OrderRead])
+
+
+def default_body(orders) -> bytes:
+    # what FastAPI does with response_model=list[OrderRead]
+    content = ORDERS.dump_python(ORDERS.validate_python(orders), mode="json")
+    return JSONResponse(content).body
+
+
+def timed(func, rounds: int):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    return (time.perf_counter() - started) / rounds * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seeded = seed_catalog(SessionFactory, products=500, stock=100)
+    seed_orders(engine, seeded, orders=args.orders, days=30)
+
+    print(f"backend={engine.dialect.name} orders={args.orders} (ms per 1,000 orders)")
+    print(f"{'path':<10}{'query':>10}{'serialize':>12}{'total':>10}{'http':>10}")
+    bodies = {}
+    with api_client(engine) as client:
+        headers = auth_headers(client, "cashier@bench.dev", "cashierpass")
+        for label, fast in (("default", False), ("fast", True)):
+            with SessionFactory() as db:
+                service = OrderService(db)
+                if fast:
+                    query_ms, orders = timed(lambda: service.list_rows(limit=1000), args.rounds)
+                    serialize_ms, body = timed(lambda: FastJSONResponse(orders).body, args.rounds)
+                else:
+                    query_ms, orders = timed(lambda: service.list(limit=1000), args.rounds)
+                    serialize_ms, body = timed(lambda: default_body(orders), args.rounds)
+            bodies[label] = body
+
+            settings.fast_list_responses = fast
+
+            def pages():
+                for offset in range(0, 1000, 100):
+                    client.get("/api/orders", params={"limit": 100, "offset": offset}, headers=headers)
+
+            http_ms, _ = timed(pages, max(1, args.rounds // 4))
+            print(f"{label:<10}{query_ms:>10.1f}{serialize_ms:>12.1f}{query_ms + serialize_ms:>10.1f}{http_ms:>10.1f}")
+    settings.fast_list_responses = False
+    assert bodies["default"] == bodies["fast"], "fast path changed the response body"
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Shift-change login storm: logins/sec and checkout latency while ``--logins``
+cashiers log in at once, with bcrypt in the Starlette threadpool
+(PASSWORD_HASH_WORKERS=0) versus the password hash process pool.
+
+Handlers run on a sync Session (DB_ASYNC=false), so a checkout needs a threadpool
+slot, just like a login hashing in the threadpool does.
+
+Usage:
+    python -m benchmarks.login_storm --logins 80 --rounds 12 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+import httpx
+
+from app.core import deps, security
+from app.core.config import settings
+from benchmarks.async_concurrency import use_database
+from benchmarks.common import (
+    add_database_argument,
+    make_engine,
+    percentile,
+    reset_schema,
+    seed_catalog,
+    session_factory,
+)
+
+
+async def checkouts(client, headers, product_ids, stop: asyncio.Event, latencies: list) -> None:
+    while not stop.is_set():
+        body = {"items": [{"product_id": random.choice(product_ids), "quantity": 1}]}
+        started = time.perf_counter()
+        res = await client.post("/api/orders", json=body, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        res.raise_for_status()
+
+
+async def run_mode(label, workers, url, args, product_ids):
+    from app.main import app
+
+    settings.password_hash_workers = workers
+    engine = use_database(url, "sync", args.pool_size, latency_ms=0)
+    deps.clear_auth_cache()
+    transport = httpx.ASGITransport(app=app)
+    credentials = {"email": "cashier@bench.dev", "password": "cashierpass"}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+            # also starts the hashing processes, so the storm does not pay for that
+            res = await client.post("/api/auth/login", json=credentials)
+            headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+            for storm in (False, True):
+                latencies: list = []
+                stop = asyncio.Event()
+                tills = [
+                    asyncio.create_task(checkouts(client, headers, product_ids, stop, latencies))
+                    for _ in range(args.tills)
+                ]
+                started = time.perf_counter()
+                if storm:
+                    responses = await asyncio.gather(
+                        *(client.post("/api/auth/login", json=credentials) for _ in range(args.logins))
+                    )
+                    assert all(res.status_code == 200 for res in responses)
+                else:
+                    await asyncio.sleep(args.quiet_seconds)
+                elapsed = time.perf_counter() - started
+                stop.set()
+                await asyncio.gather(*tills)
+                logins = f"{args.logins / elapsed:8.1f}" if storm else f"{'-':>8}"
+                print(
+                    f"{label:<14}{'storm' if storm else 'quiet':<7}{logins}{len(latencies) / elapsed:>12.0f}"
+                    f"{percentile(latencies, 50):>10.1f}ms{percentile(latencies, 99):>10.1f}ms"
+                )
+    finally:
+        security.shutdown_password_hash_pool()
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--logins", type=int, default=80)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+    parser.add_argument("--tills", type=int, default=4, help="concurrent checkout loops")
+    parser.add_argument("--quiet-seconds", type=float, default=2.0, help="checkout baseline without logins")
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.bcrypt_rounds = args.rounds
+    seed_engine = make_engine(args.database_url)
+    reset_schema(seed_engine)
+    seeded = seed_catalog(session_factory(seed_engine), products=200, stock=1_000_000)
+    url = seed_engine.url.render_as_string(hide_password=False)
+    seed_engine.dispose()
+
+    print(f"backend={seed_engine.dialect.name} logins={args.logins} bcrypt_rounds={args.rounds} cpus={os.cpu_count()}")
+    print(f"{'hashing':<14}{'phase':<7}{'logins/s':>8}{'checkouts/s':>12}{'p50':>12}{'p99':>12}")
+    for label, workers in (("threadpool", 0), (f"{args.workers} processes", args.workers)):
+        asyncio.run(run_mode(label, workers, url, args, seeded["product_ids"]))
+
+
+if __name__ == "__main__":
+    main()
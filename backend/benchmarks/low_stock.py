@@ -0,0 +1,78 @@
+"""
+Low-stock listing over a large catalog: one page of GET /api/inventory/low-stock's query
+on the partial index, the same query without the index, and the old way of reading
+every stock level (GET /api/inventory) and filtering it in the client.
+
+Usage:
+    python -m benchmarks.low_stock --products 500000 --low-percent 2
+"""
+import argparse
+import time
+
+from sqlalchemy import case, text, update
+
+from app.models import Inventory
+from app.services.inventory_service import InventoryService
+from benchmarks.common import add_database_argument, make_engine, reset_schema, seed_catalog, session_factory
+
+
+def timed(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--low-percent", type=float, default=2.0, help="share of products below their reorder point")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seed_catalog(SessionFactory, products=args.products, stock=100)
+    # every product reorders at 20; a spread of them has fallen below it
+    low_every = max(1, round(100 / args.low_percent))
+    with SessionFactory() as db:
+        db.execute(
+            update(Inventory).values(
+                reorder_point=20,
+                quantity=case((Inventory.product_id % low_every == 0, Inventory.product_id % 20), else_=100),
+            )
+        )
+        db.commit()
+        db.execute(text("ANALYZE"))
+
+        service = InventoryService(db)
+        low = len(service.list_low_stock(limit=args.products))
+        first_page = timed(lambda: service.list_low_stock(limit=args.limit), args.rounds)
+        cursor = service.list_low_stock(limit=args.limit)[-1]
+        next_page = timed(
+            lambda: service.list_low_stock(limit=args.limit, cursor=(cursor.shortfall, cursor.product_id)),
+            args.rounds,
+        )
+        ascending = timed(lambda: service.list_low_stock(limit=args.limit, descending=False), args.rounds)
+        client_side = timed(
+            lambda: [level for level in service.list_levels() if level.quantity < level.reorder_point],
+            max(1, args.rounds // 10),
+        )
+        db.execute(text("DROP INDEX ix_inventory_low_stock"))
+        db.commit()
+        unindexed = timed(lambda: service.list_low_stock(limit=args.limit), args.rounds)
+
+    print(f"backend={engine.dialect.name} products={args.products} low={low} page={args.limit}")
+    print(f"partial index, first page          {first_page:9.2f} ms")
+    print(f"partial index, next page (cursor)  {next_page:9.2f} ms")
+    print(f"partial index, smallest first      {ascending:9.2f} ms")
+    print(f"no index, first page               {unindexed:9.2f} ms")
+    print(f"all levels, filtered in Python     {client_side:9.2f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cost of the request metrics: MetricsMiddleware per request, measured on a trivial
+route by calling the ASGI app directly, and the SQL cursor hooks per statement.
+
+Usage:
+    python -m benchmarks.metrics_overhead --requests 20000 --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, RequestCost
+
+BUDGET_US = 50.0
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def drive(asgi_app, requests: int) -> float:
+    """Mean seconds per request for ``requests`` sequential in-process calls."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/items/{i}",
+            "raw_path": f"/api/items/{i}".encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "server": ("bench", 80),
+            "client": ("bench", 1),
+        }
+        await asgi_app(scope, receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def sql_cost(statements: int) -> float:
+    """Mean seconds per ``SELECT 1``, in a request context."""
+    engine = create_engine("sqlite://")
+    token = metrics.request_cost.set(RequestCost())
+    try:
+        with engine.connect() as conn:
+            started = time.perf_counter()
+            for _ in range(statements):
+                conn.execute(text("select 1"))
+            return (time.perf_counter() - started) / statements
+    finally:
+        metrics.request_cost.reset(token)
+        engine.dispose()
+
+
+def set_sql_hooks(enabled: bool) -> None:
+    if enabled:
+        metrics.instrument_sql()
+    elif event.contains(Engine, "before_cursor_execute", metrics._before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", metrics._before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", metrics._after_cursor_execute)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--statements", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = make_app()
+    bare.build_middleware_stack()
+    instrumented = make_app()
+    instrumented.add_middleware(MetricsMiddleware, registry=MetricsRegistry())
+
+    # alternate the variants and keep each one's best round to damp scheduler noise
+    without, with_metrics = [], []
+    for _ in range(args.rounds):
+        without.append(asyncio.run(drive(bare, args.requests)))
+        with_metrics.append(asyncio.run(drive(instrumented, args.requests)))
+    base, measured = min(without), min(with_metrics)
+    overhead_us = (measured - base) * 1e6
+    print(f"request  without={base * 1e6:7.1f}us  with={measured * 1e6:7.1f}us  overhead={overhead_us:5.1f}us")
+
+    hooks_off, hooks_on = [], []
+    for _ in range(args.rounds):
+        set_sql_hooks(False)
+        hooks_off.append(sql_cost(args.statements))
+        set_sql_hooks(True)
+        hooks_on.append(sql_cost(args.statements))
+    sql_overhead_us = (min(hooks_on) - min(hooks_off)) * 1e6
+    print(
+        f"statement without={min(hooks_off) * 1e6:7.1f}us  with={min(hooks_on) * 1e6:7.1f}us  "
+        f"overhead={sql_overhead_us:5.1f}us"
+    )
+    verdict = "within" if overhead_us < BUDGET_US else "OVER"
+    print(f"middleware overhead {overhead_us:.1f}us per request: {verdict} the {BUDGET_US:.0f}us budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Offline-sync replay benchmark: N orders through POST /api/orders one by one
+versus POST /api/orders/batch.
+
+Usage:
+    python -m benchmarks.order_batch --orders 1000 --batch-size 500
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import (
+    add_database_argument,
+    api_client,
+    auth_headers,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    session_factory,
+)
+
+
+def build_orders(product_ids, count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        {"items": [{"product_id": pid, "quantity": rng.randint(1, 3)} for pid in rng.sample(product_ids, rng.randint(1, 5))]}
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--products", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    seeded = seed_catalog(session_factory(engine), products=args.products, stock=100 * args.orders)
+    orders = build_orders(seeded["product_ids"], args.orders, seed=7)
+
+    with api_client(engine) as client:
+        headers = auth_headers(client, "cashier@bench.dev", "cashierpass")
+
+        started = time.perf_counter()
+        for order in orders:
+            client.post("/api/orders", json=order, headers=headers).raise_for_status()
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for offset in range(0, len(orders), args.batch_size):
+            res = client.post("/api/orders/batch", json={"orders": orders[offset : offset + args.batch_size]}, headers=headers)
+            res.raise_for_status()
+            assert res.json()["rejected"] == 0
+        batch = time.perf_counter() - started
+
+    print(f"backend={engine.dialect.name} orders={args.orders} batch_size={args.batch_size}")
+    print(f"single endpoint: {single:.2f}s ({args.orders / single:.0f} orders/sec)")
+    print(f"batch endpoint:  {batch:.2f}s ({args.orders / batch:.0f} orders/sec)  speedup={single / batch:.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
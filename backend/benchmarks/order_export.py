@@ -0,0 +1,104 @@
+"""
+Streaming order export versus paging GET /api/orders 100 rows at a time.
+
+Seeds ``--orders`` orders over ``--days`` days, then exports growing date ranges with
+``stream_orders`` on an AsyncSession (aiosqlite/asyncpg) and on a sync Session, as CSV,
+NDJSON and gzipped CSV. Reports orders/s and the peak Python heap while streaming
+(tracemalloc, measured in a separate pass), which should not grow with the range. The
+baseline walks the same range with ``OrderService.list`` and the keyset cursor.
+
+Usage:
+    python -m benchmarks.order_export --orders 300000 --days 30
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.session import async_database_url
+from app.services.order_export import stream_orders
+from app.services.order_service import OrderService
+from benchmarks.common import (
+    add_database_argument,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+
+async def export(db, fmt: str, from_date: datetime, gzip: bool) -> int:
+    size = 0
+    async for chunk in stream_orders(db, fmt, from_date=from_date, gzip=gzip):
+        size += len(chunk)
+    return size
+
+
+def page_through(SessionFactory, from_date: datetime) -> int:
+    orders, cursor = 0, None
+    with SessionFactory() as db:
+        while True:
+            page = OrderService(db).list(from_date=from_date, limit=100, cursor=cursor)
+            orders += len(page)
+            if len(page) < 100:
+                return orders
+            cursor = (page[-1].created_at, page[-1].id)
+            db.expunge_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=300_000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seeded = seed_catalog(SessionFactory, products=args.products, stock=1_000_000)
+    items = seed_orders(engine, seeded, orders=args.orders, days=args.days)
+    print(f"backend={engine.dialect.name} orders={args.orders} items={items} days={args.days}")
+    async_engine = create_async_engine(async_database_url(engine.url.render_as_string(hide_password=False)))
+
+    now = datetime.now(timezone.utc)
+    ranges = [("1 day", now - timedelta(days=1)), ("1/3 range", now - timedelta(days=args.days / 3))]
+    ranges.append(("all", now - timedelta(days=args.days + 1)))
+
+    async def run():
+        for label, from_date in ranges:
+            expected = args.orders * (now - max(from_date, now - timedelta(days=args.days))) / timedelta(days=args.days)
+            print(f"\n{label} (~{expected:,.0f} orders)")
+            for session_kind in ("async", "sync"):
+                for fmt, gzip in (("csv", False), ("ndjson", False), ("csv", True)):
+                    db = AsyncSession(bind=async_engine) if session_kind == "async" else Session(bind=engine)
+                    started = time.perf_counter()
+                    size = await export(db, fmt, from_date, gzip)
+                    elapsed = time.perf_counter() - started
+                    tracemalloc.start()
+                    await export(db, fmt, from_date, gzip)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    name = f"{session_kind} {fmt}{'.gz' if gzip else ''}"
+                    print(
+                        f"  {name:<16}{expected / elapsed:>10,.0f} orders/s  {size / 1e6:8.1f} MB  "
+                        f"peak heap {peak / 1e6:6.2f} MB"
+                    )
+            started = time.perf_counter()
+            paged = page_through(SessionFactory, from_date)
+            elapsed = time.perf_counter() - started
+            print(f"  {'paged list':<16}{paged / elapsed:>10,.0f} orders/s")
+
+    asyncio.run(run())
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
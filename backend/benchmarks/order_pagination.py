@@ -0,0 +1,82 @@
+"""
+Order history paging: page 1 versus page 5,000 with OFFSET paging (with and
+without the composite index) and with keyset cursors.
+
+Usage:
+    python -m benchmarks.order_pagination --orders 200000 --page 5000 --limit 20
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.models import Order
+from app.services.order_service import OrderService
+from benchmarks.common import (
+    add_database_argument,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.page * args.limit > args.orders:
+        parser.error("--orders must cover --page x --limit rows")
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seeded = seed_catalog(SessionFactory, products=500, stock=0)
+    seed_orders(engine, seeded, orders=args.orders, days=365)
+    deep_offset = (args.page - 1) * args.limit
+    print(f"backend={engine.dialect.name} orders={args.orders} limit={args.limit} page={args.page}")
+
+    with SessionFactory() as db:
+        service = OrderService(db)
+        last_seen = (
+            db.query(Order.created_at, Order.id)
+            .order_by(Order.created_at.desc(), Order.id.desc())
+            .offset(deep_offset - 1)
+            .limit(1)
+            .one()
+        )
+
+        def measure(label: str) -> None:
+            page_one = timed(lambda: service.list(limit=args.limit), args.repeat)
+            deep = timed(lambda: service.list(limit=args.limit, offset=deep_offset), args.repeat)
+            keyset = timed(lambda: service.list(limit=args.limit, cursor=tuple(last_seen)), args.repeat)
+            print(
+                f"{label:<22} page 1: {page_one:8.2f} ms   offset page {args.page}: {deep:8.2f} ms   "
+                f"cursor page {args.page}: {keyset:8.2f} ms"
+            )
+            db.expunge_all()
+
+        db.execute(text("DROP INDEX ix_orders_created_at_id"))
+        measure("without index")
+        db.execute(text("CREATE INDEX ix_orders_created_at_id ON orders (created_at, id)"))
+        measure("with (created_at, id)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
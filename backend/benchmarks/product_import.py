@@ -0,0 +1,71 @@
+"""
+Bulk CSV product import versus one ProductService.create plus one
+InventoryService.upsert_quantity per product (what 2 x N API calls cost in the services).
+
+Usage:
+    python -m benchmarks.product_import --products 50000 --baseline 2000
+"""
+import argparse
+import io
+import time
+from decimal import Decimal
+
+from app.models import Category
+from app.schemas.inventory import InventoryUpdate
+from app.schemas.product import ProductCreate
+from app.services.inventory_service import InventoryService
+from app.services.product_import import ProductImportService
+from app.services.product_service import ProductService
+from benchmarks.common import add_database_argument, make_engine, reset_schema, session_factory
+
+
+def catalog_csv(products: int, prefix: str) -> str:
+    lines = ["sku,name,category,price,quantity"]
+    lines += [
+        f"{prefix}-{i:06d},Imported product {i},Category {i % 40},{1 + i % 500}.99,{i % 300}" for i in range(products)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--baseline", type=int, default=2000, help="products created one by one (0 to skip)")
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+
+    for label, prefix in (("import (new SKUs)", "IMP"), ("re-import (all updates)", "IMP")):
+        with SessionFactory() as db:
+            report = ProductImportService(db).import_csv(
+                io.StringIO(catalog_csv(args.products, prefix)), create_categories=True
+            )
+        print(
+            f"{label:<26}{report['rows_per_second']:>10,.0f} rows/s  {report['seconds']:7.2f}s  "
+            f"created={report['created']} updated={report['updated']} failed={report['failed']}"
+        )
+
+    if args.baseline:
+        with SessionFactory() as db:
+            category_id = db.query(Category.id).first()[0]
+            started = time.perf_counter()
+            for i in range(args.baseline):
+                payload = ProductCreate(
+                    sku=f"ONE-{i:06d}", name=f"One by one {i}", category_id=category_id, price=Decimal("1.99")
+                )
+                product = ProductService(db).create(payload)
+                InventoryService(db).upsert_quantity(product.id, InventoryUpdate(quantity=i % 300))
+            elapsed = time.perf_counter() - started
+        rate = args.baseline / elapsed
+        print(
+            f"{'create + upsert per row':<26}{rate:>10,.0f} rows/s  {elapsed:7.2f}s  "
+            f"({args.products / rate:.0f}s for {args.products} products)"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Type-ahead product search: the ILIKE filter of ProductService.list against the
+in-memory index behind ProductService.search (first page of 20).
+
+Usage:
+    python -m benchmarks.product_search --products 200000 --repeat 20
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import insert
+
+from app.models import Category, Product
+from app.services.product_search import product_search_index
+from app.services.product_service import ProductService
+from benchmarks.common import add_database_argument, make_engine, percentile, reset_schema, session_factory
+
+WORDS = (
+    "organic chocolate vanilla almond oat milk coffee espresso green tea lemon orange apple "
+    "mango berry sparkling water cola ginger honey roasted salted peanut cashew butter cracker "
+    "cookie biscuit bagel bread rye wheat rice noodle pasta tomato basil chili garlic onion "
+    "cheddar yogurt cream soda juice smoothie granola bar protein mint cinnamon maple"
+).split()
+SIZES = ("250g", "500g", "1kg", "330ml", "1L", "2L", "6 pack", "12 pack")
+QUERIES = ("c", "ch", "cho", "choc", "chocolate", "chocolate a", "chocolate alm", "sku-0012", "nut", "1kg maple")
+
+
+def seed_products(SessionFactory, products: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with SessionFactory() as db:
+        category = Category(name="Bench", is_active=True)
+        db.add(category)
+        db.flush()
+        rows = [
+            {
+                "sku": f"SKU-{i:07d}",
+                "name": " ".join(rng.sample(WORDS, 3)).title() + " " + rng.choice(SIZES),
+                "category_id": category.id,
+                "price": 1,
+                "is_active": True,
+            }
+            for i in range(products)
+        ]
+        for start in range(0, len(rows), 10000):
+            db.execute(insert(Product), rows[start : start + 10000])
+        db.commit()
+
+
+def timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seed_products(SessionFactory, args.products, args.seed)
+
+    with SessionFactory() as db:
+        started = time.perf_counter()
+        product_search_index.sync(db)
+        print(
+            f"backend={engine.dialect.name} products={args.products} "
+            f"index build={(time.perf_counter() - started):.2f}s"
+        )
+        service = ProductService(db)
+        print(f"{'query':<16}{'matches':>9}{'ilike p50':>12}{'ilike p99':>12}{'index p50':>12}{'index p99':>12}")
+        for query in QUERIES:
+            ilike = timed(lambda: service.list(query=query), args.repeat)
+            indexed = timed(lambda: service.search(query, limit=20), args.repeat)
+            total, _ = service.search(query)
+            print(
+                f"{query!r:<16}{total:>9}{percentile(ilike, 50):>10.2f}ms{percentile(ilike, 99):>10.2f}ms"
+                f"{percentile(indexed, 50):>10.2f}ms{percentile(indexed, 99):>10.2f}ms"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
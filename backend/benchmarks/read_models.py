@@ -0,0 +1,60 @@
+"""
+Memory and latency of the column-projected read models
+(ProductService.list_summaries, InventoryService.list_levels) versus loading
+full ORM entities into the session (ProductService.list, InventoryService.list).
+
+Memory is the tracemalloc peak of one call, with the result still referenced.
+
+Usage:
+    python -m benchmarks.read_models --products 100000 --rounds 5
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from app.services.inventory_service import InventoryService
+from app.services.product_service import ProductService
+from benchmarks.common import add_database_argument, make_engine, reset_schema, seed_catalog, session_factory
+
+CASES = [
+    ("products  ORM entities", lambda db: ProductService(db).list()),
+    ("products  summaries", lambda db: ProductService(db).list_summaries()),
+    ("inventory ORM entities", lambda db: InventoryService(db).list()),
+    ("inventory levels", lambda db: InventoryService(db).list_levels()),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seed_catalog(SessionFactory, products=args.products, stock=100)
+
+    print(f"backend={engine.dialect.name} products={args.products}")
+    print(f"{'read':<24}{'rows':>8}{'median':>11}{'peak memory':>14}")
+    for label, read in CASES:
+        timings = []
+        for _ in range(args.rounds):
+            with SessionFactory() as db:
+                started = time.perf_counter()
+                rows = read(db)
+                timings.append(time.perf_counter() - started)
+        with SessionFactory() as db:
+            tracemalloc.start()
+            rows = read(db)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"{label:<24}{len(rows):>8}{statistics.median(timings) * 1000:>9.0f}ms{peak / 2**20:>11.1f} MiB")
+        del rows
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Range report benchmark: one /api/reports/range call per bucket size versus one
+daily report per day, over a large synthetic order history.
+
+Usage:
+    python -m benchmarks.report_range --orders 1000000 --days 90
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.services.report_service import ReportService
+from app.services.sales_rollup_service import SalesRollupService
+from benchmarks.common import (
+    add_database_argument,
+    api_client,
+    auth_headers,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seeded = seed_catalog(SessionFactory, products=args.products, stock=0)
+
+    started = time.perf_counter()
+    items = seed_orders(engine, seeded, orders=args.orders, days=args.days)
+    print(f"seeded {args.orders} orders / {items} items in {time.perf_counter() - started:.1f}s")
+    with SessionFactory() as db:
+        started = time.perf_counter()
+        SalesRollupService(db).rebuild()
+        print(f"rollup rebuild: {time.perf_counter() - started:.1f}s")
+
+    to_date = datetime.now(timezone.utc).date()
+    from_date = to_date - timedelta(days=args.days - 1)
+    print(f"backend={engine.dialect.name} range={from_date}..{to_date}")
+    with SessionFactory() as db:
+        reports = ReportService(db)
+
+        def per_day():
+            for offset in range(args.days):
+                reports.daily(from_date + timedelta(days=offset))
+
+        print(f"service  {args.days} x daily():           {timed(per_day, args.repeat):9.1f} ms")
+        for bucket in ("day", "week", "month"):
+            ms = timed(lambda: reports.range_report(from_date, to_date, bucket), args.repeat)
+            print(f"service  range_report(bucket={bucket:<5}): {ms:9.1f} ms")
+        week_ago = to_date - timedelta(days=6)
+        ms = timed(lambda: reports.range_report(week_ago, to_date, "hour"), args.repeat)
+        print(f"service  range_report(bucket=hour ): {ms:9.1f} ms  (last 7 days from raw orders)")
+
+    # what the reports page pays: one request per day versus one range request
+    with api_client(engine) as client:
+        headers = auth_headers(client, "admin@bench.dev", "adminpass")
+
+        def per_day_requests():
+            for offset in range(args.days):
+                day = from_date + timedelta(days=offset)
+                client.get("/api/reports/daily", params={"date": day.isoformat()}, headers=headers).raise_for_status()
+
+        def range_request():
+            params = {"from": from_date.isoformat(), "to": to_date.isoformat(), "bucket": "day"}
+            client.get("/api/reports/range", params=params, headers=headers).raise_for_status()
+
+        print(f"http     {args.days} x GET /reports/daily:  {timed(per_day_requests, args.repeat):9.1f} ms")
+        print(f"http     1 x GET /reports/range (day): {timed(range_request, args.repeat):9.1f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Top-5 best sellers of the last day: the rolling in-process leaderboard versus
+GROUP BY over the day's order_items, plus what the leaderboard costs per order.
+
+Usage:
+    python -m benchmarks.top_sellers --orders 200000 --products 5000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func
+
+from app.models import Order, OrderItem
+from app.services.top_sellers import TopSellers
+from benchmarks.common import (
+    add_database_argument,
+    make_engine,
+    reset_schema,
+    seed_catalog,
+    seed_orders,
+    session_factory,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_argument(parser)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url)
+    reset_schema(engine)
+    SessionFactory = session_factory(engine)
+    seeded = seed_catalog(SessionFactory, products=args.products, stock=100)
+    items = seed_orders(engine, seeded, orders=args.orders, days=1)
+
+    leaderboard = TopSellers(capacity=10_000)
+    with SessionFactory() as db:
+        started = time.perf_counter()
+        leaderboard.sync(db)
+        build = time.perf_counter() - started
+
+        since = datetime.now(timezone.utc) - timedelta(days=1)
+        quantity = func.sum(OrderItem.quantity)
+        sql = (
+            db.query(OrderItem.product_id, quantity)
+            .join(Order, Order.id == OrderItem.order_id)
+            .filter(Order.created_at >= since)
+            .group_by(OrderItem.product_id)
+            .order_by(quantity.desc(), OrderItem.product_id)
+            .limit(5)
+        )
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            sql.all()
+        sql_ms = (time.perf_counter() - started) / args.rounds * 1000
+
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            leaderboard.sync(db)
+            leaderboard.top("1d", 5)
+        top_ms = (time.perf_counter() - started) / args.rounds * 1000
+
+    print(f"backend={engine.dialect.name} orders={args.orders} items={items} products={args.products}")
+    print(f"SQL GROUP BY, last day      {sql_ms:9.2f} ms")
+    print(f"leaderboard sync + top(5)   {top_ms:9.2f} ms")
+    print(f"leaderboard build           {build * 1000:9.0f} ms ({build / args.orders * 1e6:.1f} us per order)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,27 @@
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import sessionmaker
 
 from app.api import api_router
 from app.core import deps
+from app.core.config import settings
 from app.core.security import hash_password
 from app.db.base import Base
 from app.models import Category, Inventory, Product, User, Order, OrderItem  # ensure tables are registered
 from app.main import app as fastapi_app
+from app.services.product_search import product_search_index
+from app.services.top_sellers import top_sellers
+
+# tests bind their own engine; the startup warm-up would hit the configured database
+settings.search_index_warm_on_startup = False
+settings.top_sellers_warm_on_startup = False
+# cheap hashes and no hashing processes; test_password_hashing opts back in
+settings.bcrypt_rounds = 4
+settings.password_hash_workers = 0
 
 
 @pytest.fixture(scope="session")
@@ -37,6 +49,9 @@ def db_session(engine):
         for tbl in reversed(Base.metadata.sorted_tables):
             session.execute(tbl.delete())
         session.commit()
+        # every test starts again at catalog version 0, so the index must not carry over
+        product_search_index.clear()
+        top_sellers.clear()
         yield session
     finally:
         session.close()
@@ -83,7 +98,36 @@ def client(db_session):
             pass
 
     fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    # user ids repeat across tests, so cached users must not leak between them
+    deps.clear_auth_cache()
     # routers already included in app
     with TestClient(fastapi_app) as c:
         yield c
     fastapi_app.dependency_overrides = {}
+
+
+@pytest.fixture
+def query_budget(engine):
+    """``with query_budget(3): client.get(...)`` fails if the block runs more than 3 SQL statements.
+
+    The failure lists every statement the block ran, so the extra (often lazy-load) queries
+    are visible. Yields the list of statements for further assertions.
+    """
+
+    @contextmanager
+    def budget(max_statements: int):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        if len(statements) > max_statements:
+            listing = "\n".join(f"  {i}. {' '.join(sql.split())}" for i, sql in enumerate(statements, 1))
+            pytest.fail(f"{len(statements)} SQL statements, budget {max_statements}:\n{listing}", pytrace=False)
+
+    return budget
@@ -3,6 +3,14 @@ from fastapi.testclient import TestClient
 from app.core.security import hash_password
 from app.models import Category, Inventory, Product, User
 
+# SQL statements each endpoint may run in these tests (see the query_budget fixture). They
+# are exact today: raise one only together with the change that needs the extra statement.
+ORDER_CREATE_BUDGET = 9
+BATCH_CREATE_BUDGET = 8
+ORDER_GET_BUDGET = 2
+ORDER_LIST_BUDGET = 2
+RANGE_REPORT_BUDGET = 3
+
 
 def prepare_api_data(db_session):
     admin = User(
@@ -34,29 +42,105 @@ def prepare_api_data(db_session):
     return {"admin": admin, "cashier": cashier, "product": product, "inventory": inventory}
 
 
-def test_login_and_create_order_flow(client: TestClient, db_session):
+def test_login_and_create_order_flow(client: TestClient, db_session, query_budget):
     data = prepare_api_data(db_session)
+    email, product_id = data["cashier"].email, data["product"].id
 
-    res = client.post(
-        "/api/auth/login",
-        json={"email": data["cashier"].email, "password": "cashierpass"},
-    )
+    with query_budget(1):
+        res = client.post("/api/auth/login", json={"email": email, "password": "cashierpass"})
     assert res.status_code == 200
     token = res.json()["access_token"]
 
-    res = client.post(
-        "/api/orders",
-        json={"items": [{"product_id": data["product"].id, "quantity": 2}]},
-        headers={"Authorization": f"Bearer {token}"},
-    )
+    # user, products, stock, rollups, order + items, reload of the order
+    with query_budget(ORDER_CREATE_BUDGET):
+        res = client.post(
+            "/api/orders",
+            json={"items": [{"product_id": product_id, "quantity": 2}]},
+            headers={"Authorization": f"Bearer {token}"},
+        )
     assert res.status_code == 201
     body = res.json()
     assert body["total_amount"] == "7.00"
     assert body["items"][0]["quantity"] == 2
 
     # ensure inventory updated
-    res_inv = client.get("/api/inventory", headers={"Authorization": f"Bearer {token}"})
+    with query_budget(0):  # role is checked on the cached user
+        res_inv = client.get("/api/inventory", headers={"Authorization": f"Bearer {token}"})
     assert res_inv.status_code == 403  # cashier cannot access inventory
 
     db_session.refresh(data["inventory"])
     assert data["inventory"].quantity == 3
+
+
+def test_batch_order_endpoint(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    product_id = data["product"].id
+    with query_budget(BATCH_CREATE_BUDGET):
+        res = client.post(
+            "/api/orders/batch",
+            json={
+                "orders": [
+                    {"items": [{"product_id": product_id, "quantity": 2}], "created_at": "2025-12-30T09:15:00Z"},
+                    {"items": [{"product_id": product_id, "quantity": 9}]},
+                ]
+            },
+            headers=headers,
+        )
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["created"], body["rejected"]) == (1, 1)
+    assert [r["status_code"] for r in body["results"]] == [201, 409]
+
+    with query_budget(ORDER_GET_BUDGET):
+        order = client.get(f"/api/orders/{body['results'][0]['order_id']}", headers=headers).json()
+    assert order["total_amount"] == "7.00"
+    assert order["created_at"].startswith("2025-12-30T09:15:00")
+
+
+def test_range_report_endpoint_validates_range(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    res = client.post("/api/auth/login", json={"email": data["admin"].email, "password": "adminpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    params = {"from": "2026-03-01", "to": "2026-03-31", "bucket": "week"}
+    with query_budget(RANGE_REPORT_BUDGET):
+        res = client.get("/api/reports/range", params=params, headers=headers)
+    assert res.status_code == 200
+    assert [b["start"][:10] for b in res.json()["buckets"]][:2] == ["2026-02-23", "2026-03-02"]
+
+    with query_budget(0):  # rejected before touching the database
+        res = client.get("/api/reports/range", params={"from": "2026-03-31", "to": "2026-03-01"}, headers=headers)
+    assert res.status_code == 422
+    params = {"from": "2026-01-01", "to": "2026-03-01", "bucket": "hour"}
+    res = client.get("/api/reports/range", params=params, headers=headers)
+    assert res.status_code == 422
+
+
+def test_order_listing_pages_by_cursor(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    created = [
+        client.post(
+            "/api/orders", json={"items": [{"product_id": data["product"].id, "quantity": 1}]}, headers=headers
+        ).json()["id"]
+        for _ in range(3)
+    ]
+
+    # one query for the page and one for all of its items, however many orders it holds
+    with query_budget(ORDER_LIST_BUDGET):
+        first = client.get("/api/orders", params={"limit": 2}, headers=headers)
+    assert [o["id"] for o in first.json()] == created[:0:-1]
+    cursor = first.headers["X-Next-Cursor"]
+
+    with query_budget(ORDER_LIST_BUDGET):
+        second = client.get("/api/orders", params={"limit": 2, "cursor": cursor}, headers=headers)
+    assert [o["id"] for o in second.json()] == created[:1]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert client.get("/api/orders", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 422
+    # an empty page has no last row to make a cursor from
+    assert client.get("/api/orders", params={"limit": 0}, headers=headers).status_code == 422
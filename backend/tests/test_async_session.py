@@ -0,0 +1,62 @@
+import threading
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import deps
+from app.db.base import Base
+from app.db.session import async_database_url
+from app.main import app as fastapi_app
+from app.services.async_service import run_in_session
+from tests.test_api_flow import prepare_api_data
+
+
+def test_async_database_url():
+    assert async_database_url("postgresql+psycopg2://u:p@db:5432/pos") == "postgresql+asyncpg://u:p@db:5432/pos"
+    assert async_database_url("sqlite+pysqlite:///./pos.db") == "sqlite+aiosqlite:///./pos.db"
+
+
+async def test_routes_run_on_async_session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/async.db", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    AsyncTestingSession = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async with AsyncTestingSession() as session:
+        data = await session.run_sync(prepare_api_data)
+        # service code runs in a greenlet on the event loop thread, not in the threadpool
+        assert await run_in_session(session, lambda s: threading.get_ident()) == threading.get_ident()
+
+    async def override_get_db():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    deps.clear_auth_cache()
+    try:
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            res = await client.post("/api/auth/login", json={"email": "cashier@test.dev", "password": "cashierpass"})
+            headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+            res = await client.post(
+                "/api/orders",
+                json={"items": [{"product_id": data["product"].id, "quantity": 2}]},
+                headers=headers,
+            )
+            assert res.status_code == 201
+            order = res.json()
+            assert [item["quantity"] for item in order["items"]] == [2]
+
+            res = await client.get(f"/api/orders/{order['id']}", headers=headers)
+            assert res.json()["total_amount"] == order["total_amount"]
+            res = await client.get("/api/orders", headers=headers)
+            assert [o["id"] for o in res.json()] == [order["id"]]
+
+            res = await client.get("/api/products", headers=headers)
+            assert res.headers["ETag"]
+            assert res.json()[0]["name"] == "Coffee"
+    finally:
+        fastapi_app.dependency_overrides = {}
+        await engine.dispose()
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+
+from app.core import deps
+from app.core.cache import TTLCache
+from tests.test_api_flow import prepare_api_data
+
+
+def test_ttl_cache_expires_and_evicts_least_recent():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_current_user_is_cached_until_user_changes(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    before = deps.auth_cache_stats()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    after = deps.auth_cache_stats()
+    assert after["users"]["hits"] == before["users"]["hits"] + 1
+    assert after["tokens"]["hits"] == before["tokens"]["hits"] + 1
+
+    data["cashier"].is_active = False
+    db_session.commit()
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
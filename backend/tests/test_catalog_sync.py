@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+from tests.test_api_flow import prepare_api_data
+
+
+def _headers(client, email, password):
+    res = client.post("/api/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def test_catalog_etag_and_delta_sync(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    admin = _headers(client, data["admin"].email, "adminpass")
+    cashier = _headers(client, data["cashier"].email, "cashierpass")
+
+    res = client.get("/api/products", headers=cashier)
+    etag = res.headers["ETag"]
+    assert client.get("/api/products", headers={**cashier, "If-None-Match": etag}).status_code == 304
+    since = client.get("/api/catalog/changes", headers=cashier).json()["version"]
+
+    category_id = data["product"].category_id
+    new = client.post(
+        "/api/products",
+        json={"sku": "BEV-002", "name": "Tea", "category_id": category_id, "price": "2.75"},
+        headers=admin,
+    ).json()
+    client.post("/api/orders", json={"items": [{"product_id": data["product"].id, "quantity": 1}]}, headers=cashier)
+
+    res = client.get("/api/products", headers={**cashier, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+    changes = client.get("/api/catalog/changes", params={"since": since}, headers=cashier).json()
+    assert changes["version"] > since
+    assert [p["id"] for p in changes["products"]] == [new["id"]]
+    assert changes["categories"] == []
+    assert [(i["product_id"], i["quantity"]) for i in changes["inventory"]] == [(data["product"].id, 4)]
+
+    again = client.get("/api/catalog/changes", params={"since": changes["version"]}, headers=cashier).json()
+    assert (again["products"], again["categories"], again["inventory"]) == ([], [], [])
+
+
+def test_sales_keep_catalog_etags_and_reach_delta_sync(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    cashier = _headers(client, data["cashier"].email, "cashierpass")
+    etags = {path: client.get(path, headers=cashier).headers["ETag"] for path in ("/api/products", "/api/categories")}
+    since = client.get("/api/catalog/changes", headers=cashier).json()["version"]
+
+    order = {"items": [{"product_id": data["product"].id, "quantity": 2}]}
+    assert client.post("/api/orders", json=order, headers=cashier).status_code == 201
+    assert client.post("/api/orders/batch", json={"orders": [order]}, headers=cashier).json()["created"] == 1
+
+    for path, etag in etags.items():
+        assert client.get(path, headers={**cashier, "If-None-Match": etag}).status_code == 304
+    with query_budget(10) as statements:
+        changes = client.get("/api/catalog/changes", params={"since": since}, headers=cashier).json()
+    assert [(i["product_id"], i["quantity"]) for i in changes["inventory"]] == [(data["product"].id, 1)]
+    # the counter, then the pending stock rows in product order, then their one UPDATE
+    stamping = [sql for sql in statements if "catalog_version" in sql or "inventory.version IS NULL" in sql]
+    assert "INSERT INTO catalog_version" in stamping[1]
+    assert "ORDER BY inventory.product_id" in stamping[2]
+    assert statements[statements.index(stamping[2]) + 1].startswith("UPDATE inventory")
+    # nothing pending: no new version
+    assert client.get("/api/catalog/changes", headers=cashier).json()["version"] == changes["version"]
+    # stamping the sold stock for the sync is not a product or category change either
+    for path, etag in etags.items():
+        assert client.get(path, headers={**cashier, "If-None-Match": etag}).status_code == 304
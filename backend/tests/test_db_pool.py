@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import Settings
+from app.db.pool import PoolMetrics, pool_options, pool_stats, watch_pool
+from tests.test_api_flow import prepare_api_data
+
+
+def test_pool_metrics_track_checkouts_and_churn(tmp_path):
+    url = f"sqlite:///{tmp_path}/pool.db"
+    settings = Settings(db_pool_size=1, db_max_overflow=0, db_pool_timeout_seconds=0.05)
+    engine = create_engine(url, **pool_options(url, settings, PoolMetrics("test")))
+    watch_pool(engine)
+
+    conn = engine.connect()
+    conn.execute(text("select 1"))
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    [stats] = pool_stats([engine])
+    assert (stats["size"], stats["in_use"], stats["overflow"], stats["idle"]) == (1, 1, 0, 0)
+    assert (stats["checkouts"], stats["checkout_timeouts"], stats["connections_opened"]) == (1, 1, 1)
+    assert stats["checkout_wait_ms_max"] < 50
+
+    conn.close()
+    engine.dispose()
+    # dispose recreates the pool; the metrics carry over
+    [stats] = pool_stats([engine])
+    assert (stats["in_use"], stats["peak_in_use"], stats["connections_closed"]) == (0, 1, 1)
+    with engine.connect():
+        pass
+    assert pool_stats([engine])[0]["connections_opened"] == 2
+
+
+def test_pool_endpoint_is_admin_only(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    tokens = {}
+    for user, password in ((data["admin"], "adminpass"), (data["cashier"], "cashierpass")):
+        res = client.post("/api/auth/login", json={"email": user.email, "password": password})
+        tokens[user.role] = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    res = client.get("/api/admin/db/pool", headers=tokens["admin"])
+    assert res.status_code == 200
+    assert [pool["name"] for pool in res.json()] == ["sync", "async"]
+    assert client.get("/api/admin/db/pool", headers=tokens["cashier"]).status_code == 403
@@ -0,0 +1,181 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core import deps
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.main import app as fastapi_app
+from app.schemas.inventory import InventoryUpdate
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.event_bus import event_bus, stream_events
+from app.services.inventory_service import InventoryService
+from app.services.order_service import OrderService
+from tests.test_api_flow import prepare_api_data
+
+
+def _events(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        frame = subscription.queue.get_nowait()
+        fields = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def test_committed_orders_and_stock_reach_every_subscriber(db_session):
+    data = prepare_api_data(db_session)
+    product_id = data["product"].id
+    subscriptions = [event_bus.subscribe(), event_bus.subscribe()]
+    try:
+        order = OrderService(db_session).create_order(
+            data["cashier"].id, OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=2)])
+        )
+        with pytest.raises(HTTPException):
+            OrderService(db_session).create_order(
+                data["cashier"].id, OrderCreate(items=[OrderItemCreate(product_id=product_id, quantity=9)])
+            )
+        InventoryService(db_session).upsert_quantity(product_id, InventoryUpdate(quantity=40))
+        InventoryService(db_session).adjust({product_id: -5})
+        await asyncio.sleep(0)
+
+        for subscription in subscriptions:
+            # the rejected order published nothing
+            (kind, created), *stock = _events(subscription)
+            assert (kind, created["id"], created["total_amount"]) == ("order.created", order.id, "7.00")
+            assert created["items"] == [{"product_id": product_id, "quantity": 2}]
+            levels = [[{"product_id": product_id, "quantity": quantity}] for quantity in (3, 40, 35)]
+            assert stock == [("stock.changed", level) for level in levels]
+    finally:
+        for subscription in subscriptions:
+            event_bus.unsubscribe(subscription)
+
+
+async def test_slow_subscriber_is_dropped(monkeypatch):
+    monkeypatch.setattr(settings, "event_queue_size", 2)
+    fast = event_bus.subscribe(maxsize=10)
+    slow = stream_events(keepalive_seconds=60)
+    try:
+        assert await slow.__anext__() == "retry: 1000\n\n"
+        for n in range(5):
+            event_bus.publish("order.created", {"id": n})
+        await asyncio.sleep(0)
+
+        assert [event["id"] for _, event in _events(fast)] == [0, 1, 2, 3, 4]
+        # the stream ends instead of delivering a partial backlog, and unsubscribes
+        with pytest.raises(StopAsyncIteration):
+            await slow.__anext__()
+        assert len(event_bus) == 1
+    finally:
+        event_bus.unsubscribe(fast)
+
+
+def _open_stream(query_string: bytes = b"", headers=()):
+    """GET /api/events on the raw ASGI app: (task, queue of sent messages, event that disconnects)."""
+    messages: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/events",
+        "raw_path": b"/api/events",
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [(b"host", b"test"), *headers],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    return asyncio.create_task(fastapi_app(scope, receive, messages.put)), messages, disconnected
+
+
+async def test_events_endpoint_streams_new_orders(db_session):
+    data = prepare_api_data(db_session)
+
+    def override_get_db():
+        yield db_session
+
+    fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    deps.clear_auth_cache()
+    token, _ = create_access_token(str(data["cashier"].id))
+    stream, messages, disconnected = _open_stream(headers=[(b"authorization", f"Bearer {token}".encode())])
+    try:
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/api/events")).status_code == 401
+
+            start = await asyncio.wait_for(messages.get(), 5)
+            assert start["status"] == 200
+            assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+            assert (await asyncio.wait_for(messages.get(), 5))["body"] == b"retry: 1000\n\n"
+
+            body = {"items": [{"product_id": data["product"].id, "quantity": 1}]}
+            res = await client.post("/api/orders", json=body, headers={"Authorization": f"Bearer {token}"})
+            assert res.status_code == 201
+        frames = [(await asyncio.wait_for(messages.get(), 5))["body"].decode() for _ in range(2)]
+        assert frames[0].startswith("id: ") and "event: order.created\n" in frames[0]
+        assert f'"id":{res.json()["id"]}' in frames[0]
+        assert "event: stock.changed\n" in frames[1] and '"quantity":4' in frames[1]
+
+        disconnected.set()
+        await asyncio.wait_for(stream, 5)
+        assert len(event_bus) == 0
+    finally:
+        disconnected.set()
+        stream.cancel()
+        fastapi_app.dependency_overrides = {}
+
+
+async def test_event_stream_opens_with_a_short_lived_query_token(db_session):
+    data = prepare_api_data(db_session)
+
+    def override_get_db():
+        yield db_session
+
+    fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    deps.clear_auth_cache()
+    access_token, _ = create_access_token(str(data["cashier"].id))
+    headers = {"Authorization": f"Bearer {access_token}"}
+    expired, _ = create_access_token(str(data["cashier"].id), {"scope": deps.EVENTS_SCOPE}, timedelta(seconds=-1))
+    try:
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            res = await client.post("/api/events/token", headers=headers)
+            assert res.status_code == 200
+            token = res.json()["token"]
+            expires_in = datetime.fromisoformat(res.json()["expires_at"]) - datetime.now(timezone.utc)
+            assert expires_in <= timedelta(seconds=settings.event_token_expires_seconds)
+            assert (await client.post("/api/events/token")).status_code == 401
+            # it opens the stream and nothing else; access tokens stay out of URLs
+            assert (await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})).status_code == 401
+            for rejected in (access_token, expired, "not-a-token"):
+                assert (await client.get("/api/events", params={"token": rejected})).status_code == 401
+
+        stream, messages, disconnected = _open_stream(query_string=f"token={token}".encode())
+        try:
+            start = await asyncio.wait_for(messages.get(), 5)
+            assert start["status"] == 200
+            assert (await asyncio.wait_for(messages.get(), 5))["body"] == b"retry: 1000\n\n"
+            disconnected.set()
+            await asyncio.wait_for(stream, 5)
+        finally:
+            disconnected.set()
+            stream.cancel()
+    finally:
+        fastapi_app.dependency_overrides = {}
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.models import Product
+from tests.test_api_flow import prepare_api_data
+
+
+def test_fast_list_responses_match_the_response_models(client: TestClient, db_session, monkeypatch, query_budget):
+    data = prepare_api_data(db_session)
+    category_id = data["product"].category_id
+    db_session.add(Product(sku="BEV-002", name="Tea", category_id=category_id, price="2.05", is_active=True))
+    db_session.commit()
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    for quantity in (1, 2, 1):
+        body = {"items": [{"product_id": data["product"].id, "quantity": quantity}]}
+        assert client.post("/api/orders", json=body, headers=headers).status_code == 201
+
+    requests = [
+        ("/api/orders", {"limit": 2}),
+        ("/api/orders", {"limit": 20}),
+        ("/api/products", {}),
+        ("/api/products", {"category_id": category_id, "query": "te"}),
+    ]
+    for path, params in requests:
+        monkeypatch.setattr(settings, "fast_list_responses", False)
+        expected = client.get(path, params=params, headers=headers)
+        monkeypatch.setattr(settings, "fast_list_responses", True)
+        with query_budget(3):
+            res = client.get(path, params=params, headers=headers)
+        assert res.status_code == 200
+        assert res.content == expected.content
+        for header in ("content-type", "etag", "x-next-cursor"):
+            assert res.headers.get(header) == expected.headers.get(header)
+
+    cursor = client.get("/api/orders", params={"limit": 2}, headers=headers).headers["x-next-cursor"]
+    assert len(client.get("/api/orders", params={"cursor": cursor}, headers=headers).json()) == 1
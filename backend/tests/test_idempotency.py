@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.util import await_only
+
+from app.core import deps
+from app.core.config import settings
+from app.db.base import Base
+from app.main import app as fastapi_app
+from app.models import Inventory, Order
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.idempotency_service import IdempotencyService
+from app.services.order_service import OrderService
+from tests.test_api_flow import prepare_api_data
+
+
+def _headers(client: TestClient, user, password: str, key: str | None = None) -> dict:
+    res = client.post("/api/auth/login", json={"email": user.email, "password": password})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return headers
+
+
+def test_retry_with_same_key_replays_the_order(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    product_id = data["product"].id
+    headers = _headers(client, data["cashier"], "cashierpass", key="till-1-0001")
+    body = {"items": [{"product_id": product_id, "quantity": 2}]}
+
+    first = client.post("/api/orders", json=body, headers=headers)
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+    retry = client.post("/api/orders", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert db_session.query(func.count(Order.id)).scalar() == 1
+    assert db_session.query(Inventory.quantity).scalar() == 3
+
+    # same key, different request
+    res = client.post("/api/orders", json={"items": [{"product_id": product_id, "quantity": 1}]}, headers=headers)
+    assert res.status_code == 422
+    # keys are per user
+    admin = _headers(client, data["admin"], "adminpass", key="till-1-0001")
+    assert "idempotent-replayed" not in client.post("/api/orders", json=body, headers=admin).headers
+
+
+def test_failed_request_releases_its_key(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    headers = _headers(client, data["cashier"], "cashierpass", key="till-1-0002")
+    body = {"items": [{"product_id": data["product"].id, "quantity": 8}]}
+
+    assert client.post("/api/orders", json=body, headers=headers).status_code == 409
+    data["inventory"].quantity = 10
+    db_session.commit()
+    res = client.post("/api/orders", json=body, headers=headers)
+    assert res.status_code == 201
+    assert "idempotent-replayed" not in res.headers
+
+
+def test_abandoned_key_can_be_claimed_after_the_lock_timeout(db_session, monkeypatch):
+    data = prepare_api_data(db_session)
+    user_id = data["cashier"].id
+    service = IdempotencyService(db_session)
+    monkeypatch.setattr(settings, "idempotency_lock_seconds", 30.0)
+    assert service.claim(user_id, "k", "hash")[1] is None
+    assert service.claim(user_id, "k", "hash") == (None, ("hash", None, None))
+
+    # a request that died holding its key: the lock has run out, so a retry takes it over
+    monkeypatch.setattr(settings, "idempotency_lock_seconds", -1.0)
+    assert service.claim(user_id, "abandoned", "hash")[1] is None
+    assert service.claim(user_id, "abandoned", "other")[1] is None
+    assert service.purge_expired() == 1
+
+
+def test_request_that_outlived_its_lock_cannot_complete(db_session, monkeypatch):
+    data = prepare_api_data(db_session)
+    user_id = data["cashier"].id
+    payload = OrderCreate(items=[OrderItemCreate(product_id=data["product"].id, quantity=2)])
+    service = IdempotencyService(db_session)
+    monkeypatch.setattr(settings, "idempotency_lock_seconds", -1.0)
+    slow, _ = service.claim(user_id, "till-3-0001", "hash")
+    # the slow request's lock ran out, so its retry takes the key over
+    retry, _ = service.claim(user_id, "till-3-0001", "hash")
+    assert retry != slow
+
+    body = OrderService(db_session).create_order_once(user_id, payload, "till-3-0001", retry)
+    with pytest.raises(HTTPException) as exc:
+        OrderService(db_session).create_order_once(user_id, payload, "till-3-0001", slow)
+    assert exc.value.status_code == 409
+    # nor can it release the retry's key
+    service.release(user_id, "till-3-0001", slow)
+
+    assert db_session.query(func.count(Order.id)).scalar() == 1
+    assert db_session.query(Inventory.quantity).scalar() == 3
+    _, (_, status_code, stored) = service.claim(user_id, "till-3-0001", "hash")
+    assert (status_code, json.loads(stored)) == (201, body)
+
+
+async def test_concurrent_duplicate_waits_for_the_first(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/idem.db", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionFactory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with SessionFactory() as session:
+        data = await session.run_sync(prepare_api_data)
+        product_id = data["product"].id
+
+    create_order_once = OrderService.create_order_once
+
+    def slow_create_order_once(self, *args, **kwargs):
+        # yield to the event loop from the session's greenlet, so the duplicate runs meanwhile
+        await_only(asyncio.sleep(0.3))
+        return create_order_once(self, *args, **kwargs)
+
+    monkeypatch.setattr(OrderService, "create_order_once", slow_create_order_once)
+
+    async def override_get_db():
+        async with SessionFactory() as db:
+            yield db
+
+    fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    deps.clear_auth_cache()
+    try:
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            res = await client.post("/api/auth/login", json={"email": "cashier@test.dev", "password": "cashierpass"})
+            headers = {"Authorization": f"Bearer {res.json()['access_token']}", "Idempotency-Key": "till-2-0001"}
+            body = {"items": [{"product_id": product_id, "quantity": 1}]}
+            first, second = await asyncio.gather(
+                client.post("/api/orders", json=body, headers=headers),
+                client.post("/api/orders", json=body, headers=headers),
+            )
+        assert (first.status_code, second.status_code) == (201, 201)
+        assert first.json() == second.json()
+        assert sorted(res.headers.get("idempotent-replayed", "") for res in (first, second)) == ["", "true"]
+        async with SessionFactory() as session:
+            assert await session.scalar(func.count(Order.id)) == 1
+    finally:
+        fastapi_app.dependency_overrides = {}
+        await engine.dispose()
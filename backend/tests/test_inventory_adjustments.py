@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import Category, Inventory, Product
+from app.services.inventory_service import InventoryService
+from tests.test_api_flow import prepare_api_data
+
+# catalog version, stock row locks, product check, guarded UPDATE, INSERT of the new stock row
+ADJUST_BUDGET = 5
+
+
+def test_bulk_adjustment_applies_all_or_nothing(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    coffee = data["product"]
+    tea = Product(sku="BEV-002", name="Tea", category_id=coffee.category_id, price=2, is_active=True)
+    juice = Product(sku="BEV-003", name="Juice", category_id=coffee.category_id, price=3, is_active=True)
+    db_session.add_all([tea, juice])
+    db_session.flush()
+    db_session.add(Inventory(product_id=juice.id, quantity=10))
+    db_session.commit()
+    coffee_id, tea_id, juice_id = coffee.id, tea.id, juice.id
+    res = client.post("/api/auth/login", json={"email": data["admin"].email, "password": "adminpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    client.get("/api/inventory", headers=headers)  # caches the user
+    version = client.get("/api/catalog/changes", params={"since": 0}, headers=headers).json()["version"]
+
+    items = [
+        {"product_id": coffee_id, "delta": 3},
+        {"product_id": juice_id, "delta": -4},
+        {"product_id": tea_id, "delta": 6},
+        {"product_id": coffee_id, "delta": 1},
+    ]
+    with query_budget(ADJUST_BUDGET) as statements:
+        res = client.post("/api/inventory/adjustments", json={"items": items}, headers=headers)
+    assert res.status_code == 200
+    # the catalog counter is locked before any stock row, like every other catalog writer
+    assert "catalog_version" in statements[0] and "inventory" not in statements[0]
+    assert [(row["product_id"], row["quantity"]) for row in res.json()] == [(coffee_id, 9), (tea_id, 6), (juice_id, 6)]
+    changes = client.get("/api/catalog/changes", params={"since": version}, headers=headers).json()
+    assert {row["product_id"] for row in changes["inventory"]} == {coffee_id, tea_id, juice_id}
+
+    items = [{"product_id": tea_id, "delta": 5}, {"product_id": juice_id, "delta": -7}]
+    res = client.post("/api/inventory/adjustments", json={"items": items}, headers=headers)
+    assert res.status_code == 409
+    assert res.json()["detail"]["items"] == [{"product_id": juice_id, "delta": -7, "available": 6}]
+    res = client.post("/api/inventory/adjustments", json={"items": [{"product_id": 9999, "delta": 1}]}, headers=headers)
+    assert res.status_code == 404
+    assert res.json()["detail"]["product_ids"] == [9999]
+
+    db_session.expire_all()
+    stock = dict(db_session.query(Inventory.product_id, Inventory.quantity))
+    assert stock == {coffee_id: 9, tea_id: 6, juice_id: 6}
+
+
+def test_concurrent_adjustments_never_go_negative(tmp_path):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'adjust.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    with SessionFactory() as db:
+        cat = Category(name="Snacks", is_active=True)
+        db.add(cat)
+        db.flush()
+        product = Product(sku="HOT-001", name="Hot", category_id=cat.id, price=1, is_active=True)
+        db.add(product)
+        db.flush()
+        db.add(Inventory(product_id=product.id, quantity=10))
+        db.commit()
+        product_id = product.id
+
+    def take_one(_):
+        with SessionFactory() as db:
+            try:
+                InventoryService(db).adjust({product_id: -1})
+                return True
+            except HTTPException as exc:
+                assert exc.status_code == 409
+                return False
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(take_one, range(25)))
+    assert results.count(True) == 10
+    with SessionFactory() as db:
+        assert db.get(Inventory, product_id).quantity == 0
+    engine.dispose()
@@ -0,0 +1,82 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.models import Inventory, Product
+from app.services.inventory_service import InventoryService
+from tests.test_api_flow import prepare_api_data
+
+
+def _stock(db_session, data) -> dict:
+    """Coffee (5 of 20) plus products with the given (quantity, reorder_point); returns sku -> id."""
+    coffee = data["product"]
+    data["inventory"].reorder_point = 20
+    levels = {"TEA-001": (1, 10), "MILK-001": (0, 15), "SODA-001": (9, 24), "JUICE-001": (30, 10), "WATER-001": (3, 0)}
+    products = {sku: Product(sku=sku, name=sku.title(), category_id=coffee.category_id, price=1) for sku in levels}
+    # inactive products are never listed
+    products["OLD-001"] = Product(sku="OLD-001", name="Old", category_id=coffee.category_id, price=1, is_active=False)
+    levels["OLD-001"] = (0, 50)
+    db_session.add_all(products.values())
+    db_session.flush()
+    for sku, (quantity, reorder_point) in levels.items():
+        db_session.add(Inventory(product_id=products[sku].id, quantity=quantity, reorder_point=reorder_point))
+    db_session.commit()
+    return {"BEV-001": coffee.id, **{sku: product.id for sku, product in products.items()}}
+
+
+def test_low_stock_pages_by_shortfall(client: TestClient, db_session, query_budget):
+    data = prepare_api_data(db_session)
+    ids = _stock(db_session, data)
+    res = client.post("/api/auth/login", json={"email": data["admin"].email, "password": "adminpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    # user lookup, then one joined query per page
+    with query_budget(2):
+        first = client.get("/api/inventory/low-stock", params={"limit": 2}, headers=headers)
+    assert first.status_code == 200
+    # ties on shortfall go by product id, in the same direction
+    assert first.json()[0] == {
+        "product_id": ids["SODA-001"],
+        "sku": "SODA-001",
+        "name": "Soda-001",
+        "quantity": 9,
+        "reorder_point": 24,
+        "shortfall": 15,
+    }
+    assert first.json()[1]["sku"] == "MILK-001"
+    params = {"limit": 2, "cursor": first.headers["x-next-cursor"]}
+    second = client.get("/api/inventory/low-stock", params=params, headers=headers)
+    assert [(row["sku"], row["shortfall"]) for row in second.json()] == [("BEV-001", 15), ("TEA-001", 9)]
+    assert "x-next-cursor" not in second.headers
+
+    ascending = client.get("/api/inventory/low-stock", params={"sort": "shortfall"}, headers=headers)
+    assert [row["sku"] for row in ascending.json()] == ["TEA-001", "BEV-001", "MILK-001", "SODA-001"]
+    bad = client.get("/api/inventory/low-stock", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert bad.status_code == 422
+
+    # restocking past the reorder point takes it off the list
+    res = client.patch(f"/api/inventory/{ids['TEA-001']}", json={"quantity": 10}, headers=headers)
+    assert res.json()["reorder_point"] == 10
+    body = {"quantity": 30, "reorder_point": 40}
+    res = client.patch(f"/api/inventory/{ids['JUICE-001']}", json=body, headers=headers)
+    assert res.json()["reorder_point"] == 40
+    listed = client.get("/api/inventory/low-stock", headers=headers).json()
+    assert [row["sku"] for row in listed] == ["SODA-001", "MILK-001", "BEV-001", "JUICE-001"]
+
+
+def test_low_stock_reads_the_partial_index(db_session, engine):
+    data = prepare_api_data(db_session)
+    _stock(db_session, data)
+    plans = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        plans.extend(row[-1] for row in cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+
+    event.listen(engine, "before_cursor_execute", explain)
+    try:
+        for descending in (True, False):
+            InventoryService(db_session).list_low_stock(limit=2, cursor=(15, 1), descending=descending)
+    finally:
+        event.remove(engine, "before_cursor_execute", explain)
+    inventory_scans = [plan for plan in plans if "inventory" in plan]
+    assert len(inventory_scans) == 2
+    assert all("USING INDEX ix_inventory_low_stock" in plan for plan in inventory_scans)
@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import registry
+from tests.test_api_flow import prepare_api_data
+
+
+def _sample(text: str, prefix: str) -> float:
+    [line] = [line for line in text.splitlines() if line.startswith(prefix + " ")]
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_metrics_by_route_template(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    registry.clear()
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    order = client.post(
+        "/api/orders", json={"items": [{"product_id": data["product"].id, "quantity": 1}]}, headers=headers
+    ).json()
+    client.get(f"/api/orders/{order['id']}", headers=headers)
+    client.get("/api/orders/999999", headers=headers)
+    client.get("/no/such/path")
+
+    res = client.get("/api/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = res.text
+
+    route = 'method="GET",route="/api/orders/{order_id}"'
+    assert _sample(text, f"http_request_duration_seconds_count{{{route}}}") == 2
+    assert _sample(text, f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 2
+    assert _sample(text, f'http_responses_total{{{route},status="200"}}') == 1
+    assert _sample(text, f'http_responses_total{{{route},status="404"}}') == 1
+    assert _sample(text, 'http_responses_total{method="GET",route="unmatched",status="404"}') == 1
+
+    create = 'method="POST",route="/api/orders"'
+    assert _sample(text, f'http_responses_total{{{create},status="201"}}') == 1
+    # products, stock reservation, order/items insert and rollups all count
+    assert _sample(text, f"http_request_db_queries_total{{{create}}}") >= 5
+    assert _sample(text, f"http_request_db_seconds_total{{{create}}}") > 0
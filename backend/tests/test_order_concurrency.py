@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models import Category, Inventory, Order, OrderItem, Product, User
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.order_service import OrderService
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    # A file-backed database gives every thread its own connection, unlike the
+    # shared in-memory StaticPool used by the rest of the suite.
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'contention.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        future=True,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_concurrent_orders_never_oversell(file_engine):
+    SessionFactory = sessionmaker(bind=file_engine, autoflush=False, autocommit=False, future=True)
+    stock = 25
+    with SessionFactory() as db:
+        cashier = User(email="cashier@test.dev", role="cashier", password_hash="x", is_active=True)
+        cat = Category(name="Snacks", is_active=True)
+        db.add_all([cashier, cat])
+        db.flush()
+        hot = Product(sku="HOT-001", name="Hot", category_id=cat.id, price=1, is_active=True)
+        side = Product(sku="HOT-002", name="Side", category_id=cat.id, price=1, is_active=True)
+        db.add_all([hot, side])
+        db.flush()
+        db.add_all([Inventory(product_id=hot.id, quantity=stock), Inventory(product_id=side.id, quantity=1000)])
+        db.commit()
+        cashier_id, hot_id, side_id = cashier.id, hot.id, side.id
+
+    def ring_up(attempt: int) -> bool:
+        # alternate line order so baskets overlap in both directions
+        lines = [(hot_id, 1), (side_id, 1)]
+        if attempt % 2:
+            lines.reverse()
+        payload = OrderCreate(items=[OrderItemCreate(product_id=pid, quantity=qty) for pid, qty in lines])
+        with SessionFactory() as db:
+            try:
+                OrderService(db).create_order(created_by=cashier_id, payload=payload)
+            except HTTPException as exc:
+                assert exc.status_code == 409
+                return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        results = list(pool.map(ring_up, range(60)))
+
+    with SessionFactory() as db:
+        assert sum(results) == stock
+        assert db.get(Inventory, hot_id).quantity == 0
+        assert db.get(Inventory, side_id).quantity == 1000 - stock
+        assert db.query(func.count(Order.id)).scalar() == stock
+        sold = db.query(func.sum(OrderItem.quantity)).filter(OrderItem.product_id == hot_id).scalar()
+        assert sold == stock
@@ -0,0 +1,68 @@
+import csv
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.services import order_export
+from tests.test_api_flow import prepare_api_data
+
+
+def _login(client: TestClient, user, password: str) -> dict:
+    res = client.post("/api/auth/login", json={"email": user.email, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def test_export_streams_orders_in_range(client: TestClient, db_session, monkeypatch):
+    data = prepare_api_data(db_session)
+    data["inventory"].quantity = 100
+    db_session.commit()
+    product_id = data["product"].id
+    admin = _login(client, data["admin"], "adminpass")
+    orders = [
+        {"created_at": f"2026-09-{day:02d}T12:00:00Z", "items": [{"product_id": product_id, "quantity": day}]}
+        for day in (1, 15, 30)
+    ] + [{"created_at": "2026-10-01T00:00:00Z", "items": [{"product_id": product_id, "quantity": 1}]}]
+    res = client.post("/api/orders/batch", json={"orders": orders}, headers=admin)
+    assert res.json()["created"] == 4
+    september = {"from": "2026-09-01T00:00:00Z", "to": "2026-10-01T00:00:00Z"}
+    # small batches, so orders straddle batch boundaries
+    monkeypatch.setattr(order_export, "EXPORT_BATCH_SIZE", 2)
+
+    res = client.get("/api/orders/export", params={**september, "format": "ndjson"}, headers=admin)
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+    assert res.headers["content-encoding"] == "gzip"
+    exported = [json.loads(line) for line in res.text.splitlines()]
+    assert [order["items"][0]["quantity"] for order in exported] == [1, 15, 30]
+    # same shape and values as the regular order endpoint
+    assert exported[1] == client.get(f"/api/orders/{exported[1]['id']}", headers=admin).json()
+
+    for refused in ("identity", "gzip;q=0", "br, gzip; q=0.0", "*;q=0"):
+        res = client.get("/api/orders/export", params=september, headers={**admin, "Accept-Encoding": refused})
+        assert "content-encoding" not in res.headers, refused
+    for accepted in ("br;q=1, gzip;q=0.5", "*"):
+        res = client.get("/api/orders/export", params=september, headers={**admin, "Accept-Encoding": accepted})
+        assert res.headers["content-encoding"] == "gzip", accepted
+    res = client.get("/api/orders/export", params=september, headers={**admin, "Accept-Encoding": "identity"})
+    assert res.headers["content-type"] == "text/csv; charset=utf-8"
+    plain = res.text
+    rows = list(csv.DictReader(io.StringIO(plain)))
+    assert [row["item_quantity"] for row in rows] == ["1", "15", "30"]
+    assert rows[0]["order_id"] == str(exported[0]["id"])
+
+    # compressed on the wire, same bytes once decompressed
+    with client.stream("GET", "/api/orders/export", params=september, headers=admin) as res:
+        raw = b"".join(res.iter_raw())
+    assert gzip.decompress(raw).decode() == plain
+
+
+def test_export_is_admin_only_and_validates_format(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    cashier = _login(client, data["cashier"], "cashierpass")
+    admin = _login(client, data["admin"], "adminpass")
+    assert client.get("/api/orders/export", headers=cashier).status_code == 403
+    assert client.get("/api/orders/export", params={"format": "xml"}, headers=admin).status_code == 422
+    res = client.get("/api/orders/export", headers={**admin, "Accept-Encoding": "identity"})
+    assert res.text.strip() == ",".join(order_export.CSV_HEADER)
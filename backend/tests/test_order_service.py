@@ -1,8 +1,9 @@
 import pytest
 from fastapi import HTTPException
 
+from app.models import Inventory, Product
 from app.services.order_service import OrderService
-from app.schemas.order import OrderCreate, OrderItemCreate
+from app.schemas.order import OrderBatchItem, OrderCreate, OrderItemCreate
 
 
 def test_create_order_decrements_inventory_and_totals(db_session, seed_data):
@@ -25,3 +26,50 @@ def test_create_order_fails_on_insufficient_stock(db_session, seed_data):
     with pytest.raises(HTTPException) as exc:
         service.create_order(created_by=seed_data["cashier"].id, payload=payload)
     assert exc.value.status_code == 409
+
+
+def test_create_order_reports_short_items_and_keeps_stock(db_session, seed_data):
+    product = seed_data["product"]
+    other = Product(sku="SNK-002", name="Pretzels", category_id=product.category_id, price=2.5, is_active=True)
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(Inventory(product_id=other.id, quantity=1))
+    db_session.commit()
+
+    service = OrderService(db_session)
+    payload = OrderCreate(
+        items=[
+            OrderItemCreate(product_id=product.id, quantity=3),
+            OrderItemCreate(product_id=other.id, quantity=1),
+            OrderItemCreate(product_id=other.id, quantity=1),
+        ]
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        service.create_order(created_by=seed_data["cashier"].id, payload=payload)
+    assert exc.value.status_code == 409
+    assert exc.value.detail["items"] == [{"product_id": other.id, "requested": 2, "available": 1}]
+
+    db_session.refresh(seed_data["inventory"])
+    assert seed_data["inventory"].quantity == 10
+
+
+def test_create_orders_batch_reports_per_order_results(db_session, seed_data):
+    product_id = seed_data["product"].id
+    service = OrderService(db_session)
+    orders = [
+        OrderBatchItem(items=[OrderItemCreate(product_id=product_id, quantity=4)]),
+        OrderBatchItem(items=[OrderItemCreate(product_id=999, quantity=1)]),
+        OrderBatchItem(items=[OrderItemCreate(product_id=product_id, quantity=7)]),
+        OrderBatchItem(items=[OrderItemCreate(product_id=product_id, quantity=6)]),
+    ]
+
+    results = service.create_orders_batch(created_by=seed_data["cashier"].id, orders=orders, chunk_size=2)
+
+    assert [r["status_code"] for r in results] == [201, 404, 409, 201]
+    assert results[2]["detail"]["items"] == [{"product_id": product_id, "requested": 7, "available": 6}]
+    assert float(results[0]["total_amount"]) == pytest.approx(7.96)
+    db_session.refresh(seed_data["inventory"])
+    assert seed_data["inventory"].quantity == 0
+    created = service.get(results[3]["order_id"])
+    assert [item.quantity for item in created.items] == [6]
@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.config import Settings, settings
+from app.core.security import hash_password, hash_rounds, verify_password_async
+from app.models import User
+from tests.test_api_flow import prepare_api_data
+
+
+def test_login_rehashes_passwords_of_another_cost(client: TestClient, db_session, monkeypatch):
+    data = prepare_api_data(db_session)
+    cashier = data["cashier"]
+    assert hash_rounds(cashier.password_hash) == 4
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    credentials = {"email": cashier.email, "password": "cashierpass"}
+
+    assert client.post("/api/auth/login", json={**credentials, "password": "wrong"}).status_code == 401
+    db_session.expire_all()
+    assert hash_rounds(db_session.get(User, cashier.id).password_hash) == 4
+
+    assert client.post("/api/auth/login", json=credentials).status_code == 200
+    db_session.expire_all()
+    rehashed = db_session.get(User, cashier.id).password_hash
+    assert hash_rounds(rehashed) == 5
+    assert client.post("/api/auth/login", json=credentials).status_code == 200
+    db_session.expire_all()
+    assert db_session.get(User, cashier.id).password_hash == rehashed
+
+
+async def test_hashing_runs_in_the_process_pool(monkeypatch):
+    monkeypatch.setattr(settings, "password_hash_workers", 1)
+    hashed = hash_password("secret", rounds=4)
+    try:
+        assert await verify_password_async("secret", hashed) == (True, None)
+        assert await verify_password_async("nope", hashed) == (False, None)
+        assert security._hash_pool is not None
+        monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+        verified, new_hash = await verify_password_async("secret", hashed)
+        assert verified and hash_rounds(new_hash) == 5
+    finally:
+        security.shutdown_password_hash_pool()
+    assert security._hash_pool is None
+
+
+def test_empty_hash_workers_setting_means_one_per_cpu(monkeypatch):
+    # as written in .env.example
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "")
+    assert Settings().password_hash_workers is None
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "0")
+    assert Settings().password_hash_workers == 0
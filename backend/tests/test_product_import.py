@@ -0,0 +1,132 @@
+import threading
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import deps
+from app.core.security import create_access_token
+from app.db import session as db_session_module
+from app.db.base import Base
+from app.main import app as fastapi_app
+from app.models import Category, Inventory, Product
+from app.services import product_import
+from tests.test_api_flow import prepare_api_data
+
+CSV = """SKU,Name,Category,Price,Quantity
+BEV-001,Coffee (large),Beverages,4.25,40
+BEV-100,Green Tea,beverages,2.10,7
+BEV-101,Mate,Beverages,abc,1
+SNK-001,Chips,Snacks,1.99,3
+BEV-100,Green Tea again,Beverages,2.20,1
+BEV-102,,Beverages,1.00,
+BEV-103,Cocoa,Beverages,3.00,
+BEV-104,Chai,Beverages,3.333,2
+"""
+
+
+def _admin(client: TestClient, data) -> dict:
+    res = client.post("/api/auth/login", json={"email": data["admin"].email, "password": "adminpass"})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def _upload(client: TestClient, headers: dict, body: str, **params):
+    files = {"file": ("catalog.csv", body.encode(), "text/csv")}
+    return client.post("/api/products/import", files=files, params=params, headers=headers)
+
+
+def test_import_upserts_in_chunks_and_reports_bad_rows(client: TestClient, db_session, monkeypatch):
+    data = prepare_api_data(db_session)
+    headers = _admin(client, data)
+    monkeypatch.setattr(product_import, "IMPORT_CHUNK_SIZE", 2)
+    version_before = client.get("/api/catalog/changes", params={"since": 0}, headers=headers).json()["version"]
+
+    res = _upload(client, headers, CSV)
+    assert res.status_code == 200
+    report = res.json()
+    assert (report["rows"], report["created"], report["updated"], report["failed"]) == (8, 2, 1, 5)
+    assert [(error["line"], error["sku"]) for error in report["errors"]] == [
+        (4, "BEV-101"),
+        (5, "SNK-001"),
+        (6, "BEV-100"),
+        (7, "BEV-102"),
+        (9, "BEV-104"),
+    ]
+    assert "unknown category" in report["errors"][1]["message"]
+    assert "line 3" in report["errors"][2]["message"]
+    assert report["rows_per_second"] > 0
+
+    db_session.expire_all()
+    products = {p.sku: p for p in db_session.query(Product)}
+    assert set(products) == {"BEV-001", "BEV-100", "BEV-103"}
+    assert (products["BEV-001"].name, str(products["BEV-001"].price)) == ("Coffee (large)", "4.25")
+    stock = dict(db_session.query(Inventory.product_id, Inventory.quantity))
+    assert stock == {products["BEV-001"].id: 40, products["BEV-100"].id: 7}
+    # imported rows reach terminals through the catalog delta
+    changes = client.get("/api/catalog/changes", params={"since": version_before}, headers=headers).json()
+    assert {p["sku"] for p in changes["products"]} == {"BEV-001", "BEV-100", "BEV-103"}
+
+    res = _upload(client, headers, "sku,name,category,price\nSNK-001,Chips,Snacks,1.99\n", create_categories=True)
+    assert (res.json()["created"], res.json()["failed"]) == (1, 0)
+    assert db_session.query(Category).filter(Category.name == "Snacks").count() == 1
+
+
+def test_import_rejects_missing_columns_and_non_admins(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    headers = _admin(client, data)
+    res = _upload(client, headers, "sku,name,price\nX-1,Thing,1.00\n")
+    assert res.status_code == 422
+    assert "category" in res.json()["detail"]
+
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    cashier = {"Authorization": f"Bearer {res.json()['access_token']}"}
+    assert _upload(client, cashier, CSV).status_code == 403
+
+
+async def test_import_runs_off_the_event_loop_on_an_async_session(tmp_path, monkeypatch):
+    url = f"{tmp_path}/import.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{url}", poolclass=NullPool)
+    sync_engine = create_engine(f"sqlite:///{url}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionFactory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with SessionFactory() as session:
+        admin_id = (await session.run_sync(prepare_api_data))["admin"].id
+    # the import gets a sync session of the primary engine, here the same SQLite file
+    monkeypatch.setattr(db_session_module, "SessionLocal", sessionmaker(bind=sync_engine))
+
+    import_csv = product_import.ProductImportService.import_csv
+    threads = []
+
+    def recording_import_csv(self, *args, **kwargs):
+        threads.append(threading.current_thread())
+        return import_csv(self, *args, **kwargs)
+
+    monkeypatch.setattr(product_import.ProductImportService, "import_csv", recording_import_csv)
+
+    async def override_get_db():
+        async with SessionFactory() as db:
+            yield db
+
+    fastapi_app.dependency_overrides[deps.get_db_session] = override_get_db
+    deps.clear_auth_cache()
+    try:
+        transport = httpx.ASGITransport(app=fastapi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            token, _ = create_access_token(str(admin_id))
+            files = {"file": ("catalog.csv", CSV.encode(), "text/csv")}
+            res = await client.post(
+                "/api/products/import", files=files, headers={"Authorization": f"Bearer {token}"}
+            )
+        assert res.status_code == 200
+        assert res.json()["created"] == 2
+        assert threads and threads[0] is not threading.current_thread()
+        async with SessionFactory() as session:
+            assert await session.scalar(select(func.count(Product.id))) == 3
+    finally:
+        fastapi_app.dependency_overrides = {}
+        await engine.dispose()
+        sync_engine.dispose()
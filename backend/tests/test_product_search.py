@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.models import Category, Product
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.product_search import product_search_index
+from app.services.product_service import ProductService
+from tests.test_api_flow import prepare_api_data
+
+
+def _headers(client, email, password):
+    res = client.post("/api/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def test_search_ranks_and_follows_catalog_writes(db_session):
+    cat = Category(name="Drinks", is_active=True)
+    db_session.add(cat)
+    db_session.commit()
+    service = ProductService(db_session)
+    names = [("DRK-100", "Sparkling Water"), ("DRK-101", "Still Water 1L"), ("WTR-1", "Watermelon Juice")]
+    for sku, name in names:
+        service.create(ProductCreate(sku=sku, name=name, category_id=cat.id, price=Decimal("1.00")))
+
+    total, items = service.search("water")
+    assert total == 3
+    assert items[0].sku == "WTR-1"  # names that start with the query rank first
+
+    total, items = service.search("drk-101")
+    assert (total, items[0].name) == (1, "Still Water 1L")
+    assert service.search("wt")[0] == 1  # short tokens match word prefixes (the SKU "wtr")
+    assert service.search("ater")[0] == 3
+    assert service.search("sparkling juice")[0] == 0
+
+    still = items[0]
+    service.update(still.id, ProductUpdate(name="Mineral Water"))
+    assert [p.id for p in service.search("mineral")[1]] == [still.id]
+    assert service.search("still")[0] == 0
+
+    service.soft_delete(still.id)
+    assert service.search("mineral")[0] == 0
+    assert service.search("water", limit=1, offset=1)[0] == 2
+
+
+def test_search_rebuilds_after_direct_inserts(db_session):
+    cat = Category(name="Snacks", is_active=True)
+    db_session.add(cat)
+    db_session.flush()
+    db_session.add_all(
+        [Product(sku=f"SNK-{i:03}", name=f"Cracker {i}", category_id=cat.id, price=1, is_active=True) for i in range(30)]
+    )
+    db_session.commit()
+
+    total, items = ProductService(db_session).search("cracker", limit=5, offset=25)
+    assert total == 30
+    assert len(items) == 5
+    assert len(product_search_index) == 30
+
+
+def test_search_endpoint(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    cashier = _headers(client, data["cashier"].email, "cashierpass")
+
+    res = client.get("/api/products/search", params={"q": "bev 001"}, headers=cashier)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["total"] == 1
+    assert body["items"][0]["name"] == "Coffee"
+
+    assert client.get("/api/products/search", params={"q": ""}, headers=cashier).status_code == 422
+    assert client.get("/api/products/search", params={"q": "x"}).status_code == 401
@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.models import Product
+from app.services.inventory_service import InventoryService
+from app.services.product_service import ProductService, ProductSummary
+from tests.test_api_flow import prepare_api_data
+
+
+def test_read_models_project_columns_without_tracking_entities(db_session):
+    data = prepare_api_data(db_session)
+    coffee = data["product"]
+    db_session.add(Product(sku="OLD-001", name="Retired", category_id=coffee.category_id, price=1, is_active=False))
+    db_session.commit()
+    coffee_id = coffee.id
+    db_session.expunge_all()
+
+    summaries = ProductService(db_session).list_summaries()
+    assert summaries == [ProductSummary(coffee_id, "BEV-001", "Coffee", Decimal("3.50"))]
+    levels = InventoryService(db_session).list_levels()
+    assert [(level.product_id, level.quantity) for level in levels] == [(coffee_id, 5)]
+    assert len(db_session.identity_map) == 0
+
+
+def test_summary_endpoint(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    res = client.post("/api/auth/login", json={"email": data["cashier"].email, "password": "cashierpass"})
+    headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    res = client.get("/api/products/summary", headers=headers)
+    assert res.status_code == 200
+    assert res.json() == [{"id": data["product"].id, "sku": "BEV-001", "name": "Coffee", "price": "3.50"}]
+    res = client.get("/api/products/summary", headers={**headers, "If-None-Match": res.headers["etag"]})
+    assert res.status_code == 304
@@ -0,0 +1,91 @@
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import ReplicaSet, RoutingSession
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.async_service import AsyncService
+from app.services.order_service import OrderService
+from app.services.report_service import ReportService
+from tests.test_api_flow import prepare_api_data
+
+
+def _database(path: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        data = prepare_api_data(db)
+        ids = {"cashier": data["cashier"].id, "product": data["product"].id}
+    return engine, ids
+
+
+def _order(ids: dict) -> OrderCreate:
+    return OrderCreate(items=[OrderItemCreate(product_id=ids["product"], quantity=1)])
+
+
+def test_read_only_methods_go_to_the_replica(tmp_path):
+    # the replica has the catalog but has not caught up with the primary's order yet
+    primary, ids = _database(tmp_path / "primary.db")
+    replica, _ = _database(tmp_path / "replica.db")
+    Session = sessionmaker(bind=primary, class_=RoutingSession, replicas=ReplicaSet([replica], 30))
+    with Session() as db:
+        order_id = OrderService(db).create_order(ids["cashier"], _order(ids)).id
+
+    today = datetime.now(timezone.utc).date()
+    with Session() as db:
+        assert OrderService(db).list() == []
+        assert ReportService(db).daily(today).order_count == 0
+        # not read_only: served by the primary
+        assert OrderService(db).get(order_id) is not None
+
+    # read-your-writes: once the session has written, its reads stay on the primary
+    with Session() as db:
+        OrderService(db).create_order(ids["cashier"], _order(ids))
+        assert len(OrderService(db).list()) == 2
+        assert ReportService(db).daily(today).order_count == 2
+
+
+def test_failed_replica_falls_back_to_the_primary(tmp_path):
+    primary, ids = _database(tmp_path / "primary.db")
+    with sessionmaker(bind=primary)() as db:
+        OrderService(db).create_order(ids["cashier"], _order(ids))
+    # its directory does not exist yet, so every connection attempt fails
+    path = tmp_path / "later" / "replica.db"
+    replicas = ReplicaSet([create_engine(f"sqlite:///{path}")], 30)
+    Session = sessionmaker(bind=primary, class_=RoutingSession, replicas=replicas)
+
+    with Session() as db:
+        assert len(OrderService(db).list()) == 1
+    [replica] = replicas.replicas
+    assert not replica.healthy and replicas.pick() is None
+    with Session() as db:
+        assert len(OrderService(db).list()) == 1
+
+
+async def test_async_sessions_route_and_health_check(tmp_path):
+    primary, ids = _database(tmp_path / "primary.db")
+    with sessionmaker(bind=primary)() as db:
+        OrderService(db).create_order(ids["cashier"], _order(ids))
+    replica_path = tmp_path / "later" / "replica.db"
+    replicas = ReplicaSet([create_async_engine(f"sqlite+aiosqlite:///{replica_path}")], 30)
+    primary_async = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    Session = async_sessionmaker(bind=primary_async, sync_session_class=RoutingSession, replicas=replicas)
+
+    await replicas.check()
+    assert replicas.pick() is None
+    async with Session() as db:
+        assert len(await AsyncService(OrderService, db).list()) == 1
+
+    # the replica comes up, empty; the next health check puts it back in rotation
+    os.mkdir(replica_path.parent)
+    _database(replica_path)
+    await replicas.check()
+    assert replicas.pick() is not None
+    async with Session() as db:
+        assert await AsyncService(OrderService, db).list() == []
+    await primary_async.dispose()
+    await replicas.replicas[0].engine.dispose()
@@ -0,0 +1,45 @@
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models import DailySales, Order, OrderItem, Product
+from app.utils.seed import generate, seed
+
+END = date(2026, 10, 1)
+
+
+def _orders(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(Order.id, Order.total_amount, Order.created_at).order_by(Order.id)).all()
+
+
+def test_generate_is_deterministic_skewed_and_rolled_up(engine, db_session, tmp_path):
+    seed(db_session)
+    counts = generate(engine, products=300, orders=3000, days=14, seed=3, end=END)
+    assert counts["orders"] == 3000
+    assert db_session.query(func.count(Product.id)).filter(Product.sku.like("GEN-%")).scalar() == 300
+    assert db_session.query(func.count(OrderItem.id)).scalar() == counts["order_items"]
+    assert db_session.query(func.sum(DailySales.order_count)).scalar() == 3000
+
+    units = Counter(
+        dict(db_session.query(OrderItem.product_id, func.sum(OrderItem.quantity)).group_by(OrderItem.product_id))
+    )
+    top_tenth = sum(quantity for _, quantity in units.most_common(30))
+    assert top_tenth > 0.5 * sum(units.values())
+
+    orders = _orders(engine)
+    hours = Counter(created_at.hour for _, _, created_at in orders)
+    assert hours[12] > 5 * hours[3] and hours[18] > 5 * hours[3]
+    assert min(created_at.date() for _, _, created_at in orders) == date(2026, 9, 17)
+    assert max(created_at.date() for _, _, created_at in orders) == date(2026, 9, 30)
+
+    other = create_engine(f"sqlite+pysqlite:///{tmp_path}/other.db", future=True)
+    Base.metadata.create_all(bind=other)
+    with Session(other) as db:
+        seed(db)
+    generate(other, products=300, orders=3000, days=14, seed=3, end=END)
+    assert _orders(other) == orders
+    other.dispose()
@@ -0,0 +1,158 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.models import Order, OrderItem, Product
+from app.services.top_sellers import SLICE_SECONDS, SYNC_GAP_SECONDS, WINDOWS, TopSellers
+from tests.test_api_flow import prepare_api_data
+
+NOW = datetime(2026, 10, 18, 12, 30, 20, tzinfo=timezone.utc)
+
+
+def _sell(db, product_ids, orders: int, start: datetime, end: datetime, rng: random.Random, weights=None) -> None:
+    next_id = (db.query(func.max(Order.id)).scalar() or 0) + 1
+    order_rows, item_rows = [], []
+    span = (end - start).total_seconds()
+    for order_id in range(next_id, next_id + orders):
+        created_at = (start + timedelta(seconds=rng.random() * span)).replace(tzinfo=None)
+        for product_id in set(rng.choices(product_ids, weights=weights, k=rng.randint(1, 3))):
+            quantity = rng.randint(1, 4)
+            item_rows.append(
+                {"order_id": order_id, "product_id": product_id, "unit_price": 1, "quantity": quantity, "line_total": 1}
+            )
+        order_rows.append({"id": order_id, "created_by": 1, "total_amount": 1, "created_at": created_at})
+    db.execute(Order.__table__.insert(), order_rows)
+    db.execute(OrderItem.__table__.insert(), item_rows)
+    db.commit()
+
+
+def _sql_top(db, window: str, now: datetime, k: int):
+    # the window starts at the first slice it still covers
+    length = SLICE_SECONDS[window]
+    first = int(now.timestamp() // length) - WINDOWS[window] // length + 1
+    start = datetime.fromtimestamp(first * length, timezone.utc)
+    quantity = func.sum(OrderItem.quantity)
+    rows = (
+        db.query(OrderItem.product_id, quantity)
+        .join(Order, Order.id == OrderItem.order_id)
+        .filter(Order.created_at >= start.replace(tzinfo=None), Order.created_at <= now.replace(tzinfo=None))
+        .group_by(OrderItem.product_id)
+        .order_by(quantity.desc(), OrderItem.product_id)
+        .limit(k)
+    )
+    return [tuple(row) for row in rows]
+
+
+def _catalog(db, products: int):
+    data = prepare_api_data(db)
+    category_id = data["product"].category_id
+    catalog = [Product(sku=f"TS-{i:03d}", name=f"P{i}", category_id=category_id, price=1) for i in range(products)]
+    db.add_all(catalog)
+    db.commit()
+    return [product.id for product in catalog]
+
+
+def test_windows_match_sql_as_time_moves(db_session):
+    rng = random.Random(7)
+    product_ids = _catalog(db_session, 40)
+    _sell(db_session, product_ids, 3000, NOW - timedelta(days=2), NOW, rng)
+    clock = [NOW]
+    leaderboard = TopSellers(capacity=10000, clock=lambda: clock[0].timestamp())
+    leaderboard.sync(db_session)
+
+    for minutes in (0, 7, 45, 200):
+        now = clock[0] = NOW + timedelta(minutes=minutes)
+        # new sales, and slices expiring out of every window
+        if minutes:
+            _sell(db_session, product_ids, 40, now - timedelta(minutes=3), now, rng)
+            leaderboard.sync(db_session)
+        for window in WINDOWS:
+            assert leaderboard.top(window, 10) == _sql_top(db_session, window, now, 10), (minutes, window)
+
+
+def test_bounded_capacity_keeps_the_heavy_hitters(db_session):
+    rng = random.Random(3)
+    product_ids = _catalog(db_session, 200)
+    weights = [1 / rank**1.2 for rank in range(1, len(product_ids) + 1)]
+    _sell(db_session, product_ids, 4000, NOW - timedelta(hours=20), NOW, rng, weights=weights)
+    leaderboard = TopSellers(capacity=40, clock=NOW.timestamp)
+    leaderboard.sync(db_session)
+
+    expected = _sql_top(db_session, "1d", NOW, 5)
+    assert [product_id for product_id, _ in leaderboard.top("1d", 5)] == [product_id for product_id, _ in expected]
+    # Space-Saving only ever over-counts
+    for (_, estimate), (_, actual) in zip(leaderboard.top("1d", 5), expected):
+        assert estimate >= actual
+
+
+def test_orders_committed_out_of_id_order_are_counted(db_session):
+    product_ids = _catalog(db_session, 3)
+
+    def commit(*order_ids: int) -> None:
+        created_at = NOW.replace(tzinfo=None)
+        orders = [{"id": i, "created_by": 1, "total_amount": 1, "created_at": created_at} for i in order_ids]
+        items = [
+            {"order_id": i, "product_id": product_ids[i % 3], "unit_price": 1, "quantity": 1, "line_total": 1}
+            for i in order_ids
+        ]
+        db_session.execute(Order.__table__.insert(), orders)
+        db_session.execute(OrderItem.__table__.insert(), items)
+        db_session.commit()
+
+    clock = [NOW]
+    leaderboard = TopSellers(capacity=100, clock=lambda: clock[0].timestamp())
+    commit(1, 2, 3)
+    leaderboard.sync(db_session)
+    commit(*range(301, 501))
+    leaderboard.sync(db_session)
+    # a batch chunk and a slow checkout, far below ids other workers already committed
+    commit(*range(101, 301), 4)
+    leaderboard.sync(db_session)
+    # recorded by the worker that committed it, below the ids synced; the next sync skips it
+    commit(5)
+    leaderboard.record(5, NOW, [(product_ids[5 % 3], 1)])
+    leaderboard.sync(db_session)
+    assert leaderboard.top("15m", 3) == _sql_top(db_session, "15m", NOW, 3)
+
+    # ids that never commit are given up on
+    clock[0] = NOW + timedelta(seconds=SYNC_GAP_SECONDS + 1)
+    leaderboard.sync(db_session)
+    assert not leaderboard._gaps
+
+
+def test_slices_hold_at_most_capacity_products(db_session):
+    clock = [NOW]
+    leaderboard = TopSellers(capacity=3, clock=lambda: clock[0].timestamp())
+    leaderboard.sync(db_session)
+    # a day of minutes, each selling product 1 twice and five others once
+    for minute in range(24 * 60):
+        now = clock[0] = NOW + timedelta(minutes=minute)
+        lines = [(1, 2)] + [(product_id, 1) for product_id in range(minute % 50 + 2, minute % 50 + 7)]
+        leaderboard.record(minute + 1, now, lines)
+
+    slices = [counts for by_slice in leaderboard._slices.values() for counts in by_slice.values()]
+    assert len(slices) == 60 + 24
+    assert max(len(counts) for counts in slices) == 3
+    # the product first into every slice is counted there exactly, whatever came after
+    assert all(counts[1] == 2 for counts in leaderboard._slices[SLICE_SECONDS["15m"]].values())
+    assert all(len(leaderboard.top(window, 10)) == 3 for window in WINDOWS)
+
+
+def test_top_sellers_endpoint_counts_new_orders(client: TestClient, db_session):
+    data = prepare_api_data(db_session)
+    tokens = {}
+    for user, password in ((data["admin"], "adminpass"), (data["cashier"], "cashierpass")):
+        res = client.post("/api/auth/login", json={"email": user.email, "password": password})
+        tokens[user.role] = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    res = client.get("/api/reports/top-sellers", params={"window": "15m"}, headers=tokens["admin"])
+    assert res.json() == {"window": "15m", "products": []}
+    body = {"items": [{"product_id": data["product"].id, "quantity": 2}]}
+    assert client.post("/api/orders", json=body, headers=tokens["cashier"]).status_code == 201
+
+    res = client.get("/api/reports/top-sellers", params={"window": "15m"}, headers=tokens["admin"])
+    assert res.json()["products"] == [{"product_id": data["product"].id, "name": "Coffee", "quantity": 2}]
+    assert client.get("/api/reports/top-sellers", headers=tokens["cashier"]).status_code == 403
+    assert client.get("/api/reports/top-sellers", params={"window": "2h"}, headers=tokens["admin"]).status_code == 422
@@ -33,6 +33,7 @@ export type Product = {
 export type Inventory = {
   product_id: number;
   quantity: number;
+  reorder_point: number;
   updated_at: string;
 };
 